@@ -0,0 +1,113 @@
+"""
+Builds a synthetic attendance database for benchmarking.
+
+    python -m benchmarks.generate out_dir --students 400 --sessions 45
+
+writes out_dir/db/allstudents/<level>.csv and out_dir/db/attendance/<level>.csv laid out
+the way the app writes them: a short "Surname,Firstname,Matric NO" header, DATE and
+ACTIVITY rows, then one row per student. Like real files they are messy on purpose:
+session columns are out of order, dates mix dd/mm/yy and dd/mm/YYYY, the header and blank
+rows are not padded, students who joined late have blanks (or nothing) for earlier
+sessions, and the student lists hold a few names not yet copied to the attendance sheet.
+"""
+import argparse
+import csv
+import os
+import random
+from datetime import date, timedelta
+
+from internal.maintain.prepare import PROGRAM_ORDER
+
+DEFAULT_LEVELS = ("100level", "200level", "300level", "400level", "500level")
+
+SURNAMES = ["Adeyemi", "Okafor", "Balogun", "Eze", "Ibrahim", "Adebayo", "Okonkwo", "Olawale",
+            "Nwosu", "Bello", "Ogunleye", "Afolabi", "Chukwu", "Abubakar", "Oyelaran", "Akande"]
+FIRSTNAMES = ["Tolu", "Chinedu", "Aisha", "Emeka", "Funmi", "Ibukun", "Ngozi", "Segun",
+              "Amaka", "Tunde", "Zainab", "Femi", "Kemi", "Uche", "Bisi", "Dayo"]
+
+
+def make_students(level: str, count: int, rng: random.Random) -> list[list[str]]:
+    prefix = level[0]
+    return [[rng.choice(SURNAMES), rng.choice(FIRSTNAMES), f"2{prefix}{i:05d}"] for i in range(count)]
+
+
+def make_sessions(count: int, start: date, rng: random.Random) -> list[tuple[str, str]]:
+    """
+    Returns count (date_str, activity) pairs spread over a semester, several per day,
+    in the shuffled order columns end up in when sessions are entered late.
+    """
+    sessions = []
+    day = start
+    while len(sessions) < count:
+        per_day = rng.randint(1, 3)
+        for activity in sorted(rng.sample(PROGRAM_ORDER, per_day), key=PROGRAM_ORDER.index):
+            fmt = "%d/%m/%y" if rng.random() < 0.7 else "%d/%m/%Y"
+            sessions.append((day.strftime(fmt), activity))
+        day += timedelta(days=rng.randint(1, 3))
+    sessions = sessions[:count]
+    # Mostly in order, with a few sessions recorded after later ones
+    for _ in range(max(1, count // 10)):
+        i, j = rng.randrange(count), rng.randrange(count)
+        sessions[i], sessions[j] = sessions[j], sessions[i]
+    return sessions
+
+
+def write_level(db_dir: str, level: str, students_per_level: int, sessions: list, rng: random.Random,
+                late_joiners: float = 0.05, pending: float = 0.02):
+    students = make_students(level, students_per_level, rng)
+    n_pending = int(len(students) * pending)
+    on_sheet = students[:len(students) - n_pending]
+
+    with open(os.path.join(db_dir, "allstudents", f"{level}.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Surname", "Firstname", "Matric NO"])
+        writer.writerows(students)
+
+    rows = [["Surname", "Firstname", "Matric NO"], [],
+            ["DATE", "", ""] + [d for d, _ in sessions],
+            ["ACTIVITY", "", ""] + [a for _, a in sessions],
+            []]
+    n_late = int(len(on_sheet) * late_joiners)
+    for i, student in enumerate(on_sheet):
+        marks = ["✓" if rng.random() < 0.7 else "✗" for _ in sessions]
+        if i >= len(on_sheet) - n_late:
+            # Joined after some sessions: blanks for those, or no marks at all yet
+            joined = rng.randint(1, len(sessions)) if sessions else 0
+            marks = [""] * joined + marks[joined:] if joined < len(sessions) else []
+        rows.append(student + marks)
+
+    with open(os.path.join(db_dir, "attendance", f"{level}.csv"), "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+
+
+def generate_db(root: str, levels=DEFAULT_LEVELS, students_per_level: int = 400, sessions: int = 45,
+                start: date = date(2026, 1, 12), seed: int = 0) -> str:
+    """
+    Writes the synthetic db under root and returns the path of root/db.
+    The same seed always produces the same files.
+    """
+    rng = random.Random(seed)
+    db_dir = os.path.join(root, "db")
+    os.makedirs(os.path.join(db_dir, "allstudents"), exist_ok=True)
+    os.makedirs(os.path.join(db_dir, "attendance"), exist_ok=True)
+    session_list = make_sessions(sessions, start, rng)
+    for level in levels:
+        write_level(db_dir, level, students_per_level, session_list, rng)
+    return db_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic attendance database.")
+    parser.add_argument("root", help="Folder to create the db/ tree in")
+    parser.add_argument("--levels", nargs="+", default=list(DEFAULT_LEVELS))
+    parser.add_argument("--students", type=int, default=400, help="Students per level")
+    parser.add_argument("--sessions", type=int, default=45, help="Sessions in the semester")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    db_dir = generate_db(args.root, args.levels, args.students, args.sessions, seed=args.seed)
+    print(f"Generated {len(args.levels)} levels x {args.students} students x {args.sessions} sessions in {db_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Times the functions that read and rewrite attendance files against a synthetic database.
+
+    python -m benchmarks.run --students 400 --sessions 45 --repeat 5
+    python -m benchmarks.run --compare benchmarks/results/previous.json
+
+Every run gets a fresh copy of the generated db (the copy is not timed) and an empty
+file cache, and the app's own prints are silenced. Peak memory comes from one extra run
+under tracemalloc. Results are written as JSON so two
+runs can be compared with --compare.
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+
+import pandas as pd
+
+from benchmarks.generate import DEFAULT_LEVELS, generate_db
+from internal.attendance.create import create_func
+from internal.frequency.freq_func import calculate_frequency, calculate_frequency_all
+from internal.history.history_func import MatricIndex, history_cards
+from internal.maintain import prepare
+from internal.records.records_func import build_session_index, extract_records, load_attendance_matrix
+from internal.utils.csv_handler import read_csv_robust
+from internal.utils.excel_styler import apply_excel_styling
+from internal.utils.file_cache import file_cache
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+PRESENT_MARKS = ['P', 'Present', '✓', 'p']
+SEMESTER = (date(2000, 1, 1), date(2100, 1, 1))
+
+
+def _attendance_files(levels):
+    return [os.path.join("db", "attendance", f"{level}.csv") for level in levels]
+
+
+# --- Benchmarks. Each runs with cwd set to a fresh copy of the db. ---
+
+def bench_update_attendance_sheet(levels):
+    """Adds one session to every level, with about 70% of students present."""
+    for path in _attendance_files(levels):
+        with open(path, encoding="utf-8") as f:
+            matrics = [line.split(",")[2] for line in f.readlines()[5:] if line.count(",") >= 2]
+        create_func.update_attendance_sheet(os.path.basename(path), "BIBLE STUDY", "30/06/26", "",
+                                            matrics[: len(matrics) * 7 // 10])
+
+
+def bench_prepare_attendance_files(levels):
+    """maintain.prepare version, which also sorts every file first."""
+    prepare.prepare_attendance_files()
+
+
+def bench_prepare_attendance_files_create(levels):
+    create_func.prepare_attendance_files()
+
+
+def bench_sort_attendance_files(levels):
+    prepare.sort_attendance_files()
+
+
+def bench_calculate_frequency(levels):
+    for path in _attendance_files(levels):
+        calculate_frequency(path, *SEMESTER, PRESENT_MARKS)
+
+
+def bench_calculate_frequency_all(levels):
+    """All-levels report, as the frequency window runs it, then again with the levels cached."""
+    for _ in range(2):
+        calculate_frequency_all(_attendance_files(levels), *SEMESTER, PRESENT_MARKS)
+
+
+def bench_extract_records(levels):
+    """Attendees of every session of every level, as the records window does for a full range."""
+    for path in _attendance_files(levels):
+        matrix = load_attendance_matrix(path)
+        for sessions in build_session_index(path).values():
+            for session in sessions:
+                extract_records(path, session['col_index'], PRESENT_MARKS, matrix=matrix)
+
+
+def bench_history_cards(levels):
+    """History cards of every student of every level, as one batch export from the history window."""
+    index = MatricIndex(os.path.join("db", "attendance"))
+    matrics = [m for path in _attendance_files(levels) for m in load_attendance_matrix(path).matrics]
+    history_cards(matrics, index=index)
+
+
+def bench_read_csv_robust(levels):
+    for path in _attendance_files(levels):
+        read_csv_robust(path)
+
+
+def bench_excel_export(levels):
+    """Frequency report of the first level written to .xlsx and styled, as the frequency window exports it."""
+    path = _attendance_files(levels)[0]
+    df = pd.DataFrame(calculate_frequency(path, *SEMESTER, PRESENT_MARKS))
+    df.rename(columns={'Count': "NO Attended"}, inplace=True)
+    df.to_excel("export.xlsx", index=False)
+    apply_excel_styling("export.xlsx")
+
+
+def bench_reference(levels):
+    """
+    No app code: reads every level file with the csv module and writes it back. What the
+    engines cost relative to this is about the same on any machine.
+    """
+    for path in _attendance_files(levels):
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.reader(f))
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            csv.writer(f).writerows(rows)
+
+
+BENCHMARKS = {
+    "update_attendance_sheet": bench_update_attendance_sheet,
+    "prepare_attendance_files": bench_prepare_attendance_files,
+    "prepare_attendance_files_create": bench_prepare_attendance_files_create,
+    "sort_attendance_files": bench_sort_attendance_files,
+    "calculate_frequency": bench_calculate_frequency,
+    "calculate_frequency_all": bench_calculate_frequency_all,
+    "extract_records": bench_extract_records,
+    "history_cards": bench_history_cards,
+    "read_csv_robust": bench_read_csv_robust,
+    "excel_export": bench_excel_export,
+    "reference": bench_reference,
+}
+
+
+@contextlib.contextmanager
+def fresh_db(template_dir):
+    """Runs the block with cwd set to a throwaway copy of template_dir/db, an empty file cache and prints silenced."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        shutil.copytree(os.path.join(template_dir, "db"), os.path.join(work_dir, "db"))
+        file_cache.invalidate()
+        os.chdir(work_dir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                yield work_dir
+        finally:
+            os.chdir(cwd)
+
+
+def time_benchmark(func, template_dir, levels, repeat):
+    """Returns the wall times in seconds of repeat runs of func, each on a fresh copy of template_dir."""
+    times = []
+    for _ in range(repeat):
+        with fresh_db(template_dir):
+            start = time.perf_counter()
+            func(levels)
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def peak_memory(func, template_dir, levels):
+    """Returns the peak traced memory in KiB of one run of func. Separate from the timed runs, tracing slows them down."""
+    with fresh_db(template_dir):
+        tracemalloc.start()
+        try:
+            func(levels)
+            return tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_benchmarks(names=None, levels=DEFAULT_LEVELS, students=400, sessions=45, repeat=5, seed=0) -> dict:
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "levels": list(levels),
+            "students_per_level": students,
+            "sessions": sessions,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "benchmarks": {},
+    }
+    with tempfile.TemporaryDirectory() as template_dir:
+        generate_db(template_dir, levels, students, sessions, seed=seed)
+        for name in names or BENCHMARKS:
+            times = time_benchmark(BENCHMARKS[name], template_dir, levels, repeat)
+            peak_kb = peak_memory(BENCHMARKS[name], template_dir, levels)
+            results["benchmarks"][name] = {
+                "min": min(times),
+                "median": statistics.median(times),
+                "mean": statistics.mean(times),
+                "runs": times,
+                "peak_kb": peak_kb,
+            }
+            print(f"{name:<34}{statistics.median(times) * 1000:>10.1f} ms  (min {min(times) * 1000:.1f})"
+                  f"{peak_kb:>10.0f} KiB peak")
+    return results
+
+
+def compare(previous: dict, current: dict):
+    """Prints the median of each benchmark next to the previous run's."""
+    print(f"\n{'benchmark':<34}{'before':>10}{'after':>10}{'change':>9}")
+    for name, result in current["benchmarks"].items():
+        before = previous.get("benchmarks", {}).get(name)
+        after_ms = result["median"] * 1000
+        if before is None:
+            print(f"{name:<34}{'-':>10}{after_ms:>8.1f}ms{'new':>9}")
+            continue
+        before_ms = before["median"] * 1000
+        change = (after_ms - before_ms) / before_ms * 100 if before_ms else 0.0
+        print(f"{name:<34}{before_ms:>8.1f}ms{after_ms:>8.1f}ms{change:>+8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark attendance file processing.")
+    parser.add_argument("names", nargs="*", help=f"Benchmarks to run (default: all): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--levels", nargs="+", default=list(DEFAULT_LEVELS))
+    parser.add_argument("--students", type=int, default=400, help="Students per level")
+    parser.add_argument("--sessions", type=int, default=45, help="Sessions in the semester")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file for the results (default: benchmarks/results/<time>.json)")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    results = run_benchmarks(args.names, args.levels, args.students, args.sessions, args.repeat, args.seed)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
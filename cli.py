@@ -0,0 +1,319 @@
+"""
+Batch operations without the GUI. Never imports Tk, so it starts fast.
+
+    python -m cli prepare
+    python -m cli import 100level --activity "BIBLE STUDY" --date 14/03/26 --csv scans.csv
+    python -m cli frequency --all --from 01/03/26 --to 31/03/26 --format csv --output march.csv
+    python -m cli absentees 200level --from 09/03/26 --to 13/03/26
+    python -m cli streaks --min 4 --current
+    python -m cli rank --top 20 --per-level
+    python -m cli rank --below 60 --from 12/01/26
+    python -m cli card 2200005
+    python -m cli card --csv matrics.csv --format csv --output cards.csv
+    python -m cli query --from 01/03/26 --to 31/03/26 --present "SUNDAY SERVICE" --absent-all "BIBLE STUDY"
+    python -m cli backup
+    python -m cli restore 14-03-2026 --yes
+
+Results go to stdout (or --output) as JSON or CSV; the app's own messages go to stderr.
+Run it from the folder that holds db/, like the app.
+"""
+import argparse
+import contextlib
+import csv
+import json
+import sys
+from datetime import date
+
+from internal.attendance.create.create_func import ATTENDANCE_DIR, _get_external_matrics, update_attendance_sheet
+from internal.frequency.freq_func import ABSENT_MARKS, PRESENT_MARKS, calculate_frequency_all
+from internal.history.history_func import history_cards
+from internal.maintain import prepare
+from internal.maintain.maintain import get_backup_root, list_backups, perform_daily_backup, restore_backup
+from internal.ranking.ranking_func import ranking_report
+from internal.records.records_func import (ABSENTEE_MARKS, ATTENDEE_MARKS, extract_records, get_attendance_matrix,
+                                           get_bitmap_index, get_session_index, parse_session_date,
+                                           sessions_in_range)
+from internal.streaks.streaks_func import streak_report
+
+
+class CLIError(Exception):
+    pass
+
+
+def _date_arg(value):
+    parsed = parse_session_date(value)
+    if parsed is None:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a dd/mm/yy or dd/mm/YYYY date")
+    return parsed
+
+
+def resolve_levels(levels, all_levels=False):
+    """Attendance file paths for level names like '100level' (or '100level.csv'); every file with all_levels."""
+    if all_levels or not levels:
+        paths = sorted(ATTENDANCE_DIR.glob("*.csv"))
+        if not paths:
+            raise CLIError(f"No attendance files in {ATTENDANCE_DIR}")
+        return paths
+    paths = []
+    for level in levels:
+        path = ATTENDANCE_DIR / (level if level.endswith(".csv") else f"{level}.csv")
+        if not path.exists():
+            raise CLIError(f"No attendance file for {level} ({path})")
+        paths.append(path)
+    return paths
+
+
+def emit(rows, fmt="json", output=None):
+    """Writes rows (a list of dicts, or one dict) as JSON or CSV to output, or stdout."""
+    out = open(output, "w", newline="", encoding="utf-8") if output else sys.stdout
+    try:
+        if fmt == "csv":
+            rows = [rows] if isinstance(rows, dict) else rows
+            fields = list(dict.fromkeys(key for row in rows for key in row))
+            writer = csv.DictWriter(out, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump(rows, out, indent=2, ensure_ascii=False, default=str)
+            out.write("\n")
+    finally:
+        if output:
+            out.close()
+
+
+# --- Commands. Each returns what gets printed. ---
+
+def cmd_import(args):
+    path = resolve_levels([args.level])[0]
+    if not args.csv and not args.matric:
+        raise CLIError("Give the attendance list with --csv or --matric")
+    before = sum(len(s) for s in get_session_index(path).values())
+    update_attendance_sheet(path.name, args.activity, args.date, args.csv or "", args.matric)
+    if sum(len(s) for s in get_session_index(path).values()) <= before:
+        raise CLIError(f"Could not add the session to {path.name}")
+    return {"level": path.stem, "date": args.date, "activity": args.activity}
+
+
+def cmd_prepare(args):
+    prepare.prepare_attendance_files()
+    return [{"level": p.stem} for p in resolve_levels(None, True)]
+
+
+def cmd_sort(args):
+    prepare.sort_attendance_files()
+    return [{"level": p.stem} for p in resolve_levels(None, True)]
+
+
+def cmd_frequency(args):
+    marks = ABSENT_MARKS if args.absent else PRESENT_MARKS
+    column = "NO Missed" if args.absent else "NO Attended"
+    rows = calculate_frequency_all(resolve_levels(args.levels, args.all), args.start, args.end, marks)
+    for row in rows:
+        row[column] = row.pop('Count')
+    return rows
+
+
+def cmd_records(args):
+    marks = ABSENTEE_MARKS if args.command == "absentees" else ATTENDEE_MARKS
+    rows = []
+    for path in resolve_levels(args.levels, args.all):
+        matrix = get_attendance_matrix(str(path))
+        for _, session in sessions_in_range(get_session_index(str(path)), args.start, args.end):
+            if args.activity and session['activity'].upper() != args.activity.upper():
+                continue
+            for record in extract_records(str(path), session['col_index'], marks, matrix=matrix) or []:
+                rows.append({"Level": path.stem, "Date": session['date_str'], "Activity": session['activity'],
+                             **record})
+    return rows
+
+
+QUERY_FILTERS = (("present", "present", False), ("present_all", "present", True),
+                 ("absent", "absent", False), ("absent_all", "absent", True))
+
+
+def cmd_query(args):
+    filters = [(kind, every, activity) for option, kind, every in QUERY_FILTERS
+               for activity in getattr(args, option) or []]
+    if not filters:
+        raise CLIError("Give at least one of --present, --present-all, --absent, --absent-all")
+    rows = []
+    for path in resolve_levels(args.levels, args.all):
+        index = get_bitmap_index(str(path))
+        if index is None:
+            continue
+        found = index.everyone()
+        for kind, every, activity in filters:
+            lookup = index.present if kind == "present" else index.absent
+            found &= lookup(args.start, args.end, None if activity == "*" else activity, every=every)
+        rows.extend({"Level": path.stem, **student} for student in index.roster(found))
+    return rows
+
+
+def cmd_streaks(args):
+    rows = []
+    for path in resolve_levels(args.levels, args.all):
+        for row in streak_report(get_attendance_matrix(str(path)), args.start, args.end, args.activity,
+                                 min_streak=args.min, current_only=args.current):
+            rows.append({"Level": path.stem, **row})
+    return rows
+
+
+def cmd_rank(args):
+    if (args.top is None) == (args.below is None):
+        raise CLIError("Give exactly one of --top and --below")
+    return ranking_report(resolve_levels(args.levels, args.all), args.start, args.end, top=args.top, below=args.below,
+                          metric=args.metric, per_level=args.per_level, min_eligible=args.min_sessions)
+
+
+def cmd_card(args):
+    matrics = list(args.matrics) + (_get_external_matrics(args.csv) if args.csv else [])
+    if not matrics:
+        raise CLIError("Give matric numbers, or a list of them with --csv")
+    cards, missing = history_cards(matrics, args.start, args.end, args.activity)
+    for matric in missing:
+        print(f"No student with matric {matric}")
+    if not cards:
+        raise CLIError("None of the matric numbers were found")
+    if args.format == "csv":
+        return [{k: v for k, v in card.items() if k != "History"} for card in cards]
+    return cards
+
+
+def cmd_backup(args):
+    backup = perform_daily_backup(force=args.force)
+    if backup is not None:
+        return {"backup": str(backup), "created": True}
+    today = get_backup_root() / date.today().strftime("%d-%m-%Y")
+    if not today.exists():
+        raise CLIError("Backup failed")
+    return {"backup": str(today), "created": False}
+
+
+def cmd_backups(args):
+    return [{"name": b.name, "path": str(b)} for b in list_backups()]
+
+
+def cmd_restore(args):
+    backup = get_backup_root() / args.name
+    if not backup.is_dir():
+        raise CLIError(f"No backup named {args.name} in {get_backup_root()}")
+    if not args.yes:
+        raise CLIError("Restoring overwrites db/ completely, pass --yes to confirm")
+    try:
+        restore_backup(backup)
+    except FileNotFoundError as e:
+        raise CLIError(str(e))
+    return {"restored": str(backup)}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Attendance batch operations.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_output(p):
+        p.add_argument("--format", choices=["json", "csv"], default="json")
+        p.add_argument("--output", help="Write to this file instead of stdout")
+
+    def add_range(p):
+        p.add_argument("levels", nargs="*", help="Levels such as 100level (default: all)")
+        p.add_argument("--all", action="store_true", help="Every attendance file")
+        p.add_argument("--from", dest="start", type=_date_arg, default=date.min)
+        p.add_argument("--to", dest="end", type=_date_arg, default=date.max)
+
+    p = sub.add_parser("import", help="Add a session to a level from a list of present students")
+    p.add_argument("level")
+    p.add_argument("--activity", required=True)
+    p.add_argument("--date", default=date.today().strftime('%d/%m/%y'), help="dd/mm/yy (default: today)")
+    p.add_argument("--csv", help="CSV with the matric numbers of the students present")
+    p.add_argument("--matric", nargs="+", help="Matric numbers of the students present")
+    add_output(p)
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("prepare", help="Sort every file and copy new students from db/allstudents")
+    add_output(p)
+    p.set_defaults(func=cmd_prepare)
+
+    p = sub.add_parser("sort", help="Sort session columns by date and program")
+    add_output(p)
+    p.set_defaults(func=cmd_sort)
+
+    p = sub.add_parser("frequency", help="Sessions attended (or missed with --absent) per student")
+    add_range(p)
+    p.add_argument("--absent", action="store_true")
+    add_output(p)
+    p.set_defaults(func=cmd_frequency)
+
+    for name in ("attendees", "absentees"):
+        p = sub.add_parser(name, help=f"{name.capitalize()} of every session in the range")
+        add_range(p)
+        p.add_argument("--activity", help="Only this activity")
+        add_output(p)
+        p.set_defaults(func=cmd_records)
+
+    p = sub.add_parser("streaks", help="Students absent from at least --min sessions in a row")
+    add_range(p)
+    p.add_argument("--activity", help="Only this activity")
+    p.add_argument("--min", type=int, default=3, help="Sessions in a row (default 3)")
+    p.add_argument("--current", action="store_true", help="Only streaks still running")
+    add_output(p)
+    p.set_defaults(func=cmd_streaks)
+
+    p = sub.add_parser("rank", help="Top attendees, or everyone under a percentage of their sessions")
+    add_range(p)
+    p.add_argument("--top", type=int, metavar="K", help="The K best attendees")
+    p.add_argument("--below", type=float, metavar="PERCENT", help="Everyone attending under PERCENT")
+    p.add_argument("--metric", choices=["percent", "count"], default="percent")
+    p.add_argument("--per-level", action="store_true", help="Rank each level separately")
+    p.add_argument("--min-sessions", type=int, default=1, help="Leave out students with fewer eligible sessions")
+    add_output(p)
+    p.set_defaults(func=cmd_rank)
+
+    p = sub.add_parser("card", help="History card (absences and the dates missed) of one or more students")
+    p.add_argument("matrics", nargs="*", help="Matric numbers")
+    p.add_argument("--csv", help="CSV with the matric numbers")
+    p.add_argument("--from", dest="start", type=_date_arg, default=date.min)
+    p.add_argument("--to", dest="end", type=_date_arg, default=date.max)
+    p.add_argument("--activity", help="Only this activity")
+    add_output(p)
+    p.set_defaults(func=cmd_card)
+
+    p = sub.add_parser("query", help="Students matching every given condition over the range")
+    add_range(p)
+    for option, kind, every in QUERY_FILTERS:
+        p.add_argument("--" + option.replace("_", "-"), action="append", metavar="ACTIVITY",
+                       help=f"{kind.capitalize()} at {'every' if every else 'any'} ACTIVITY session ('*' for any activity)")
+    add_output(p)
+    p.set_defaults(func=cmd_query)
+
+    p = sub.add_parser("backup", help="Back up db/ for today")
+    p.add_argument("--force", action="store_true", help="Replace today's backup")
+    add_output(p)
+    p.set_defaults(func=cmd_backup)
+
+    p = sub.add_parser("backups", help="List backups, newest first")
+    add_output(p)
+    p.set_defaults(func=cmd_backups)
+
+    p = sub.add_parser("restore", help="Replace db/ with a backup")
+    p.add_argument("name", help="Backup folder name, e.g. 14-03-2026")
+    p.add_argument("--yes", action="store_true")
+    add_output(p)
+    p.set_defaults(func=cmd_restore)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        # The functions print progress; keep stdout for the results
+        with contextlib.redirect_stdout(sys.stderr):
+            result = args.func(args)
+    except CLIError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    emit(result, args.format, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,9 @@ import csv
 import glob
 import os
 from pathlib import Path
-from tkinter import filedialog
 import pandas as pd
 from internal.utils.general import _get_documents_folder
+from internal.utils import events, tracing
 
 # Constants for folder structure
 DB_DIR = Path("db")
@@ -20,6 +20,7 @@ def normalize_matric(val: any) -> str:
         return s[:-2]
     return s
 
+@tracing.traced("prepare_attendance_files (create)")
 def prepare_attendance_files():
     """
     Reads student lists and creates/updates attendance sheets.
@@ -60,10 +61,12 @@ def prepare_attendance_files():
                     # Write all students
                     writer.writerows(source_students.values())
                 print(f"Created new sheet: {file_name}")
+                events.publish(events.FILE_REWRITTEN, dest_path)
                 continue
 
             # 3. If it exists, append new students only
-            with open(dest_path, mode='r', newline='', encoding='utf-8-sig') as infile:
+            with open(dest_path, mode='r', newline='', encoding='utf-8-sig') as infile, \
+                    tracing.span("read_sheet", file=dest_path, bytes=lambda: tracing.file_size(dest_path)):
                 lines = list(csv.reader(infile))
 
             # Analyze existing file
@@ -101,12 +104,14 @@ def prepare_attendance_files():
                     valid_old_rows = [row for row in lines if len(row) >= 3 and row[0] not in ["DATE", "ACTIVITY", "Surname"]]
                     writer.writerows(valid_old_rows)
                     writer.writerows(new_students)
+                events.publish(events.FILE_REWRITTEN, dest_path)
             
             elif new_students:
                 with open(dest_path, mode='a', newline='', encoding='utf-8-sig') as append_file:
                     writer = csv.writer(append_file)
                     writer.writerows(new_students)
                 print(f"Appended {len(new_students)} new students to {file_name}")
+                events.publish(events.ROSTER_CHANGED, dest_path, added=new_students)
             else:
                 print(f"No changes needed for {file_name}")
 
@@ -121,6 +126,8 @@ def get_attendance_files() -> list[str]:
 
 def load_csv_file() -> tuple:
     """Opens a file picker dialog."""
+    # Imported here so the batch CLI can use this module without Tk
+    from tkinter import filedialog
     documents_path =_get_documents_folder()
     target_dir = documents_path / "ATTENDANCE"
     return filedialog.askopenfilenames(
@@ -157,6 +164,7 @@ def _get_external_matrics(external_csv_path: str) -> list[str]:
         print(f"Error reading external CSV: {e}")
         return []
 
+@tracing.traced()
 def update_attendance_sheet(attendance_file_name: str, program_type: str, date: str, 
                             external_csv_path: str, matric_numbers_list: list[str] | None = None):
     """
@@ -170,7 +178,8 @@ def update_attendance_sheet(attendance_file_name: str, program_type: str, date:
 
     try:
         # Load entire sheet
-        with open(file_path, 'r', newline='', encoding='utf-8-sig') as f:
+        with open(file_path, 'r', newline='', encoding='utf-8-sig') as f, \
+                tracing.span("read_sheet", file=file_path, bytes=lambda: tracing.file_size(file_path)):
             lines = list(csv.reader(f))
 
         # --- Step 1: locate key rows ---
@@ -183,6 +192,7 @@ def update_attendance_sheet(attendance_file_name: str, program_type: str, date:
         
         # --- Step 2: Repair file structure if broken ---
         # (If DATE or ACTIVITY rows are missing, insert them)
+        repaired = date_idx is None or activity_idx is None
         if date_idx is None:
             lines.insert(2, ['DATE'])
             date_idx = 2
@@ -222,22 +232,32 @@ def update_attendance_sheet(attendance_file_name: str, program_type: str, date:
         lines[activity_idx].append(program_type)
 
         # Mark Students
+        marked = []
         for i in range(student_start_idx, len(lines)):
             row = lines[i]
             if len(row) >= 3: # Must have matric col
                 matric = normalize_matric(row[2])
                 mark = '✓' if matric in present_matrics else '✗'
                 row.append(mark)
+                marked.append((row[0], row[1], matric, mark))
             else:
                 row.append('')
 
         # --- Step 5: Save ---
-        with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
+        with open(file_path, 'w', newline='', encoding='utf-8-sig') as f, \
+                tracing.span("write_sheet", file=file_path, rows=len(lines)):
             writer = csv.writer(f)
             writer.writerows(lines)
             
         print(f"Success: Updated {attendance_file_name} for {date}")
 
+        # Let open windows add the new column instead of re-reading the file
+        if repaired:
+            events.publish(events.FILE_REWRITTEN, file_path)
+        else:
+            events.publish(events.SESSION_ADDED, file_path, date=date, activity=program_type,
+                           field=len(lines[date_idx]) - 1, rows=marked)
+
     except Exception as e:
         print(f"Failed to update attendance: {e}")
 
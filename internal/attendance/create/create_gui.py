@@ -2,11 +2,14 @@ import customtkinter as ctk
 from tkinter import messagebox
 import os
 from datetime import date, datetime
-from internal.attendance.create.create_func import get_attendance_files, load_csv_file, update_attendance_sheet
+from internal.attendance.create.create_func import ATTENDANCE_DIR, get_attendance_files, load_csv_file, update_attendance_sheet
+from internal.records.records_func import get_session_index
 from internal.calender import CalendarDialog
 from internal.attendance.create.selcol_gui import SelectColumnWindow
+from internal.windowcache import ReusableWindow
+from internal.utils import tracing
 
-class AddAttendanceWindow(ctk.CTkToplevel):
+class AddAttendanceWindow(ctk.CTkToplevel, ReusableWindow):
     """
     Window to create a new attendance record (column) in the attendance sheet.
     """
@@ -70,10 +73,33 @@ class AddAttendanceWindow(ctk.CTkToplevel):
 
         # 5. Back
         ctk.CTkButton(self, text="Back to Menu", command=self.close_window).grid(row=6, column=0, pady=20)
+        self.protocol("WM_DELETE_WINDOW", self.close_window)
+
+    def refresh(self):
+        """
+        Called when the cached window is shown again from the menu.
+        Picks up new attendance sheets and starts from a clean form, like a new window would.
+        """
+        files = get_attendance_files()
+        current = self.file_dropdown.get()
+        self.file_dropdown.configure(values=files if files else ["No files found"], state="normal" if files else "disabled")
+        self.file_dropdown.set(current if current in files else (files[0] if files else "No files found"))
+
+        self.selected_date = date.today().strftime('%d/%m/%y')
+        self.date_entry.delete(0, 'end')
+        self.date_entry.insert(0, self.selected_date)
+
+        self.loaded_csv_path = None
+        self.extracted_matric_numbers = []
+        self.btn_add.configure(state="disabled")
+        self.lbl_loaded.configure(text="No external file loaded.")
 
     def open_calendar(self):
-        cal = CalendarDialog(self, self.selected_date)
-        self.wait_window(cal)
+        # Shade the days that already have a session in the chosen sheet
+        sheet_path = ATTENDANCE_DIR / self.file_dropdown.get()
+        session_index = get_session_index(sheet_path) if sheet_path.is_file() else None
+        cal = CalendarDialog.open(self, self.selected_date, session_index=session_index)
+        cal.wait()
         if cal.selected_date:
             self.selected_date = cal.selected_date.strftime('%d/%m/%y')
             self.date_entry.delete(0, 'end')
@@ -105,6 +131,7 @@ class AddAttendanceWindow(ctk.CTkToplevel):
         else:
             self.lbl_loaded.configure(text="No data loaded.")
 
+    @tracing.traced("add_attendance")
     def add_attendance(self):
         sheet = self.file_dropdown.get()
         program = self.prog_dropdown.get()
@@ -119,4 +146,4 @@ class AddAttendanceWindow(ctk.CTkToplevel):
 
     def close_window(self):
         self.parent.deiconify()
-        self.destroy()
\ No newline at end of file
+        self.close()
\ No newline at end of file
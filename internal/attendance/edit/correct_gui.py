@@ -0,0 +1,177 @@
+import customtkinter as ctk
+from tkinter import messagebox
+from internal.attendance.create.create_func import get_attendance_files
+from internal.attendance.edit.edit_func import get_attendance_index, update_mark
+from internal.utils.search_index import PrefixIndex
+from internal.windowcache import ReusableWindow
+
+
+class CorrectMarkWindow(ctk.CTkToplevel, ReusableWindow):
+    """
+    Small dialog to fix one student's mark for one session.
+    Uses update_mark, so only that cell is written instead of the whole file.
+    """
+    MARKS = ["✓", "✗"]
+    MAX_SUGGESTIONS = 6
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.index = None
+        self.student_index = PrefixIndex()
+        self.session_labels = {}   # "dd/mm/yy - ACTIVITY" -> (date_str, activity)
+
+        self.title("Correct a Mark")
+        self.geometry("450x560")
+        self.resizable(False, False)
+        self.grid_columnconfigure(0, weight=1)
+
+        ctk.CTkLabel(self, text="Correct a Mark", font=("Arial", 20, "bold")).grid(row=0, column=0, pady=(20, 10))
+
+        # 1. Level
+        files = get_attendance_files()
+        self.level_dropdown = ctk.CTkOptionMenu(self, values=files if files else ["No files found"], width=300,
+                                                command=self.load_level)
+        self.level_dropdown.grid(row=1, column=0, pady=5)
+
+        # 2. Matric with typeahead
+        self.matric_entry = ctk.CTkEntry(self, width=300, placeholder_text="Matric NO or name...")
+        self.matric_entry.grid(row=2, column=0, pady=(10, 0))
+        self.matric_entry.bind("<KeyRelease>", self.on_matric_typed)
+
+        self.suggestion_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.suggestion_frame.grid(row=3, column=0, pady=(0, 5))
+        # Fixed set of buttons, reconfigured on every keystroke instead of recreated
+        self.suggestion_buttons = []
+        for _ in range(self.MAX_SUGGESTIONS):
+            btn = ctk.CTkButton(self.suggestion_frame, text="", width=300, height=24, anchor="w",
+                                fg_color="transparent", border_width=1, text_color=("gray10", "gray90"))
+            self.suggestion_buttons.append(btn)
+
+        # 3. Session
+        self.session_dropdown = ctk.CTkOptionMenu(self, values=["No sessions"], width=300,
+                                                  command=lambda _: self.show_current_mark())
+        self.session_dropdown.grid(row=4, column=0, pady=10)
+
+        self.lbl_current = ctk.CTkLabel(self, text="Current mark: -", font=("Arial", 14))
+        self.lbl_current.grid(row=5, column=0, pady=5)
+
+        # 4. New mark
+        self.mark_var = ctk.StringVar(value=self.MARKS[0])
+        ctk.CTkSegmentedButton(self, values=self.MARKS, variable=self.mark_var).grid(row=6, column=0, pady=10)
+
+        ctk.CTkButton(self, text="Apply Correction", command=self.apply_correction).grid(row=7, column=0, pady=10)
+        ctk.CTkButton(self, text="Back to Menu", command=self.close_window).grid(row=8, column=0, pady=(10, 20))
+
+        self.protocol("WM_DELETE_WINDOW", self.close_window)
+
+        if files:
+            self.load_level(files[0])
+
+    def refresh(self):
+        """Reloads the level list and the current level when the cached window is shown again."""
+        files = get_attendance_files()
+        self.level_dropdown.configure(values=files if files else ["No files found"])
+        current = self.level_dropdown.get()
+        if files:
+            self.level_dropdown.set(current if current in files else files[0])
+            self.load_level(self.level_dropdown.get())
+        self.matric_entry.delete(0, "end")
+        self.hide_suggestions()
+        self.show_current_mark()
+
+    def load_level(self, file_name):
+        """Builds the typeahead and session list for the chosen level."""
+        try:
+            self.index = get_attendance_index(file_name)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not read {file_name}:\n{e}")
+            return
+
+        self.student_index = PrefixIndex()
+        for matric, (surname, firstname) in self.index.students.items():
+            self.student_index.add(matric, f"{matric} {surname} {firstname}")
+
+        # Latest sessions first, that is what usually needs fixing
+        self.session_labels = {}
+        for d_str, activity, _ in reversed(self.index.sessions):
+            self.session_labels[f"{d_str} - {activity}"] = (d_str, activity)
+        labels = list(self.session_labels) or ["No sessions"]
+        self.session_dropdown.configure(values=labels)
+        self.session_dropdown.set(labels[0])
+
+        self.hide_suggestions()
+        self.show_current_mark()
+
+    def on_matric_typed(self, event=None):
+        words = self.matric_entry.get().split()
+        if not words:
+            self.hide_suggestions()
+            return
+        found = sorted(self.student_index.search_all(words))[:self.MAX_SUGGESTIONS]
+        for i, btn in enumerate(self.suggestion_buttons):
+            if i < len(found):
+                matric = found[i]
+                surname, firstname = self.index.students[matric]
+                btn.configure(text=f"{matric}  {surname} {firstname}", command=lambda m=matric: self.pick_student(m))
+                btn.pack(pady=1)
+            else:
+                btn.pack_forget()
+        self.show_current_mark()
+
+    def hide_suggestions(self):
+        for btn in self.suggestion_buttons:
+            btn.pack_forget()
+
+    def pick_student(self, matric):
+        self.matric_entry.delete(0, "end")
+        self.matric_entry.insert(0, matric)
+        self.hide_suggestions()
+        self.show_current_mark()
+
+    def _selected_session(self):
+        return self.session_labels.get(self.session_dropdown.get())
+
+    def show_current_mark(self):
+        session = self._selected_session()
+        matric = self.matric_entry.get().strip()
+        if not self.index or not session:
+            self.lbl_current.configure(text="Current mark: -")
+            return
+        try:
+            # The file may have changed since the level was loaded (sorting, another window)
+            self.index = get_attendance_index(self.level_dropdown.get())
+            if matric not in self.index.students:
+                self.lbl_current.configure(text="Current mark: -")
+                return
+            surname, firstname = self.index.students[matric]
+            mark = self.index.read_mark(matric, *session)
+        except (OSError, ValueError) as e:
+            self.lbl_current.configure(text=f"Current mark: could not read ({e})")
+            return
+        self.lbl_current.configure(text=f"{surname} {firstname}: '{mark or 'blank'}'")
+
+    def apply_correction(self):
+        session = self._selected_session()
+        matric = self.matric_entry.get().strip()
+        if not self.index or not session or not matric:
+            messagebox.showwarning("Missing Information", "Choose a level, a student and a session.")
+            return
+
+        d_str, activity = session
+        mark = self.mark_var.get()
+        try:
+            old_mark = update_mark(self.level_dropdown.get(), matric, d_str, activity, mark)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to update mark:\n{e}")
+            return
+
+        self.show_current_mark()
+        messagebox.showinfo("Success", f"{matric} on {d_str} ({activity}): '{old_mark}' -> '{mark}'")
+
+    def close_window(self):
+        self.parent.deiconify()
+        self.close()
@@ -0,0 +1,251 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from internal.utils.csv_index import CSVLineIndex, patch_cells
+from internal.attendance.create.create_func import ATTENDANCE_DIR, normalize_matric
+from internal.records.records_func import parse_session_date
+from internal.utils import events
+
+# Every point-update is appended here so it can be undone later
+CHANGE_LOG = Path("db") / "changelog.jsonl"
+
+
+def log_changes(file_path, changes: dict, old_values: dict, source: str = "editor", undo_of: str | None = None) -> str:
+    """
+    Appends one change set to the change log.
+    Each cell is stored as [line, field, old value, new value].
+    Returns the id of the entry.
+    """
+    entry_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
+    entry = {
+        "id": entry_id,
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "file": os.path.basename(str(file_path)),
+        "source": source,
+        "cells": [[line, field, old_values.get((line, field), ""), "" if value is None else str(value)]
+                  for (line, field), value in changes.items()],
+    }
+    if undo_of:
+        entry["undo_of"] = undo_of
+    try:
+        CHANGE_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with open(CHANGE_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except Exception as e:
+        print(f"Error writing change log: {e}")
+    return entry_id
+
+
+def publish_mark_changes(file_path, changes: dict, old_values: dict, index: CSVLineIndex):
+    """Tells open windows which cells changed. The student on each row is included for convenience."""
+    if not changes:
+        return
+    lines = sorted({line for line, _ in changes})
+    rows = index.read_rows(lines)
+    cells = []
+    for (line, field), value in changes.items():
+        row = rows.get(line, [])
+        cells.append({
+            "line": line, "field": field,
+            "old": old_values.get((line, field), ""), "new": "" if value is None else str(value),
+            "matric": normalize_matric(row[2]) if len(row) > 2 else "",
+            "surname": row[0] if row else "", "firstname": row[1] if len(row) > 1 else "",
+        })
+    events.publish(events.MARK_CHANGED, file_path, cells=cells)
+
+
+def save_cell_changes(file_path, changes: dict, index: CSVLineIndex | None = None, source: str = "editor") -> dict:
+    """
+    Persists {(line, field): value} changes with a point-update and logs them for undo.
+    Returns the previous values.
+    """
+    if index is None:
+        index = CSVLineIndex(file_path)
+    old_values = patch_cells(file_path, changes, index=index)
+    log_changes(file_path, changes, old_values, source=source)
+    publish_mark_changes(file_path, changes, old_values, index)
+    return old_values
+
+
+def moved_cells(file_path, expected: dict, index: CSVLineIndex | None = None) -> list:
+    """
+    The cells of {(line, field): text} that no longer hold that text, e.g. because the file was
+    sorted or rewritten since its line numbers were taken. Check a row's matric and a column's
+    DATE/ACTIVITY before a point-update. Texts are compared trimmed and without Excel's '.0'.
+    """
+    if index is None:
+        index = CSVLineIndex(file_path)
+    else:
+        index.refresh()
+    rows = index.read_rows(sorted({line for line, _ in expected if line < len(index)}))
+    moved = []
+    for (line, field), text in expected.items():
+        row = rows.get(line)
+        if row is None or normalize_matric(row[field] if field < len(row) else "") != normalize_matric(text):
+            moved.append((line, field))
+    return moved
+
+
+def _read_change_log() -> list[dict]:
+    if not CHANGE_LOG.exists():
+        return []
+    entries = []
+    with open(CHANGE_LOG, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+def undo_last_change(file_path, index: CSVLineIndex | None = None) -> int:
+    """
+    Reverts the most recent change set logged for this file.
+    A cell is only reverted if it still holds the value that change wrote
+    (the file may have been sorted or edited since). Returns the number of cells reverted.
+    """
+    file_name = os.path.basename(str(file_path))
+    entries = [e for e in _read_change_log() if e.get("file") == file_name]
+    undone = {e["undo_of"] for e in entries if e.get("undo_of")}
+    candidates = [e for e in entries if not e.get("undo_of") and e["id"] not in undone]
+    if not candidates:
+        return 0
+
+    entry = candidates[-1]
+    if index is None:
+        index = CSVLineIndex(file_path)
+    else:
+        index.refresh()
+
+    lines = sorted({line for line, _, _, _ in entry["cells"] if line < len(index)})
+    current = index.read_rows(lines)
+    revert = {}
+    for line, field, old, new in entry["cells"]:
+        row = current.get(line)
+        if row is None:
+            continue
+        value = row[field] if field < len(row) else ""
+        if value == new:
+            revert[(line, field)] = old
+
+    old_values = patch_cells(file_path, revert, index=index) if revert else {}
+    log_changes(file_path, revert, old_values, source="undo", undo_of=entry["id"])
+    publish_mark_changes(file_path, revert, old_values, index)
+    return len(revert)
+
+
+# ==============================================================
+# Point-update API for single marks
+
+class AttendanceFileIndex:
+    """
+    Row-offset and column-position index for one attendance file.
+    matric -> line number, (date, ACTIVITY) -> field number, on top of the byte offsets
+    in CSVLineIndex. Built with one pass over the file and reused until the file changes.
+    """
+    def __init__(self, file_path):
+        self.file_path = str(file_path)
+        self.lines = CSVLineIndex(file_path)
+        self._build_keys()
+
+    def _build_keys(self):
+        self.student_lines: dict[str, int] = {}
+        self.students: dict[str, tuple] = {}          # matric -> (surname, firstname)
+        self.session_fields: dict[tuple, list[int]] = {}
+        self.sessions: list[tuple] = []               # (date_str, activity, field) in file order
+        rows = self.lines.read_rows(range(len(self.lines)))
+        date_row, activity_row = None, None
+        for line_no, row in rows.items():
+            if not row or not row[0].strip():
+                continue
+            first = row[0].strip().upper()
+            if first == "DATE":
+                date_row = row
+            elif first == "ACTIVITY":
+                activity_row = row
+            elif first != "SURNAME" and len(row) >= 3:
+                matric = normalize_matric(row[2])
+                if matric:
+                    self.student_lines[matric] = line_no
+                    self.students[matric] = (row[0], row[1])
+
+        if date_row and activity_row:
+            for field in range(3, min(len(date_row), len(activity_row))):
+                d_str, act = date_row[field].strip(), activity_row[field].strip()
+                d_obj = parse_session_date(d_str)
+                if d_obj and act:
+                    self.session_fields.setdefault((d_obj, act.upper()), []).append(field)
+                    self.sessions.append((d_str, act, field))
+
+    def refresh(self):
+        """Rebuilds if another writer touched the file since the index was built."""
+        if not self.lines.is_fresh():
+            self.lines.build()
+            self._build_keys()
+
+    def locate(self, matric, date, activity) -> tuple[int, int]:
+        """Returns (line, field) of one student's mark for one session."""
+        matric = normalize_matric(matric)
+        line_no = self.student_lines.get(matric)
+        if line_no is None:
+            raise ValueError(f"Matric number {matric} not found in {os.path.basename(self.file_path)}")
+
+        d_obj = parse_session_date(date)
+        fields = self.session_fields.get((d_obj, str(activity).strip().upper()))
+        if not fields:
+            raise ValueError(f"No {activity} session recorded on {date}")
+        # If a session was recorded twice, the latest column is the one that counts
+        return line_no, fields[-1]
+
+    def read_mark(self, matric, date, activity) -> str:
+        line_no, field = self.locate(matric, date, activity)
+        row = self.lines.read_row(line_no)
+        return row[field] if field < len(row) else ""
+
+
+_file_indexes: dict[str, AttendanceFileIndex] = {}
+
+
+def attendance_file_path(level) -> Path:
+    """Accepts '100', '100level' or '100level.csv' and returns the attendance file path."""
+    name = str(level).strip()
+    if not name.endswith(".csv"):
+        name = name if name.lower().endswith("level") else f"{name}level"
+        name += ".csv"
+    return ATTENDANCE_DIR / name
+
+
+def get_attendance_index(level) -> AttendanceFileIndex:
+    """Returns the cached index for a level, rebuilding it only when the file changed."""
+    path = attendance_file_path(level)
+    key = str(path.resolve())
+    index = _file_indexes.get(key)
+    if index is None:
+        index = AttendanceFileIndex(path)
+        _file_indexes[key] = index
+    else:
+        index.refresh()
+    return index
+
+
+def update_mark(level, matric, date, activity, mark: str) -> str:
+    """
+    Changes one student's mark for one session without rewriting the file.
+    Returns the previous mark. Raises ValueError if the student or session doesn't exist.
+    """
+    path = attendance_file_path(level)
+    if not path.exists():
+        raise ValueError(f"{path} not found")
+
+    index = get_attendance_index(level)
+    line_no, field = index.locate(matric, date, activity)
+    old_values = save_cell_changes(path, {(line_no, field): mark}, index=index.lines, source="update_mark")
+    old_mark = old_values.get((line_no, field), "")
+    print(f"Success: {normalize_matric(matric)} {date} {activity}: '{old_mark}' -> '{mark}'")
+    return old_mark
@@ -1,6 +1,7 @@
 from internal.choosecsv import ChooseCSVWindow
 import os
 from internal.attendance.excel import ExcelWindow
+from internal.utils.csv_handler import read_csv_cached
 
 
 
@@ -8,6 +9,8 @@ class ChooseEditorFileWindow(ChooseCSVWindow):
     """
     Wrapper for ChooseCSVWindow to select attendance files and open the absentee report.
     """
+    prefetch_loaders = (read_csv_cached,)
+
     def __init__(self, master):
         attendance_dir = os.path.join(os.path.dirname(__file__), "..", "..","..", "db", "attendance")
         super().__init__(master, 
@@ -19,4 +22,5 @@ class ChooseEditorFileWindow(ChooseCSVWindow):
         """
         Callback function to open the PrintAbsenteesWindow.
         """
-        ExcelWindow(self.master, file_path, editable=True)
\ No newline at end of file
+        self.show_window(f"edit:{os.path.abspath(file_path)}",
+                         lambda: ExcelWindow(self.master, file_path, editable=True))
\ No newline at end of file
@@ -2,22 +2,101 @@ import os
 import customtkinter as ctk
 import pandas as pd
 from tkinter import messagebox, filedialog
+from tkinter import font as tkfont
 from tksheet import Sheet
 from typing import Optional, List, Tuple, Any
 
-from internal.utils.csv_handler import read_csv_robust, save_csv
+from internal.utils.csv_handler import read_csv_cached, save_csv
 from internal.utils.general import get_target_dir
 from internal.utils.excel_styler import apply_excel_styling
+from internal.utils import tracing
+from internal.utils.search_index import PrefixIndex, cells_containing, lowered_cells
+from internal.utils.csv_index import CSVLineIndex
+from internal.attendance.create.create_func import normalize_matric
+from internal.attendance.edit.edit_func import moved_cells, save_cell_changes, undo_last_change
+from internal.utils import events
+from internal.windowcache import ReusableWindow
+
+
+# --- Mapping file fields to dataframe columns ---
+
+def field_offset(df: pd.DataFrame) -> int:
+    """
+    Fields in front of the first column. pandas turns the leading fields into the
+    index when the header is shorter than the rows, as in the attendance files.
+    """
+    return 0 if isinstance(df.index, pd.RangeIndex) else df.index.nlevels
+
+
+def field_value(df: pd.DataFrame, r: int, field: int) -> str:
+    """Text of a file field of dataframe row r, whether it sits in the index or a column."""
+    offset = field_offset(df)
+    if field < offset:
+        value = df.index[r] if offset == 1 else df.index[r][field]
+    elif field - offset < len(df.columns):
+        value = df.iat[r, field - offset]
+    else:
+        value = ""
+    return "" if pd.isna(value) else str(value)
+
+
+def session_column(df: pd.DataFrame, payload) -> Tuple[int, list]:
+    """(column, one value per row) of a SESSION_ADDED delta: the date, the activity and every student's mark."""
+    marks = {normalize_matric(m): mark for _, _, m, mark in payload["rows"]}
+    values = []
+    for r in range(len(df)):
+        first = field_value(df, r, 0).strip().upper()
+        if first == "DATE":
+            values.append(payload["date"])
+        elif first == "ACTIVITY":
+            values.append(payload["activity"])
+        else:
+            values.append(marks.get(normalize_matric(field_value(df, r, 2)), ""))
+    return payload["field"] - field_offset(df), values
+
+
+def mark_cells(df: pd.DataFrame, row_of_line: dict, cells: list) -> dict:
+    """{(row, col): new mark} of a MARK_CHANGED delta, for the cells on rows and columns of df."""
+    offset = field_offset(df)
+    changed = {}
+    for cell in cells:
+        r = row_of_line.get(cell["line"])
+        if r is not None and cell["field"] >= offset:
+            changed[(r, cell["field"] - offset)] = cell["new"]
+    return changed
+
+
+def roster_rows(df: pd.DataFrame, rows: list) -> pd.DataFrame:
+    """File rows (lists of fields) as a frame shaped like df, leading fields in the index as pandas reads them."""
+    offset = field_offset(df)
+    width = offset + len(df.columns)
+    rows = [(list(row) + [""] * width)[:width] for row in rows]
+    data = [row[offset:] for row in rows]
+    if offset == 0:
+        index = pd.RangeIndex(len(df), len(df) + len(rows))
+    elif offset == 1:
+        index = pd.Index([row[0] for row in rows], name=df.index.name)
+    else:
+        index = pd.MultiIndex.from_tuples([tuple(row[:offset]) for row in rows], names=df.index.names)
+    return pd.DataFrame(data, columns=df.columns, index=index)
+
 
 class DataTable(ctk.CTkFrame):
     """
     A wrapper around tksheet for displaying Pandas DataFrames with Excel-like features.
     Includes editing capabilities, search functionality, and status updates.
-    
+
+    Large frames are fed to the sheet in pages: the first page is painted straight away
+    and the rest is appended between event-loop ticks, so opening a big file is quick.
     """
-    
-    
-    
+    PAGE_SIZE = 200       # Rows pushed into the sheet per event-loop tick
+    WIDTH_SAMPLE = 100    # Rows measured when sizing the columns
+    MIN_COL_WIDTH = 60
+    MAX_COL_WIDTH = 320
+    # Headers of the columns that go into the search index (names and matric numbers)
+    SEARCH_HEADERS = ("surname", "firstname", "name", "matric")
+    SEARCH_DELAY_MS = 200  # Typing pause before the search runs
+
     def __init__(self, parent: Any, dataframe: pd.DataFrame, editable: bool = True, **kwargs):
         super().__init__(parent, **kwargs)
         self.editable = editable
@@ -25,6 +104,16 @@ class DataTable(ctk.CTkFrame):
         self.search_matches: List[Tuple[int, int]] = []
         self.current_match_index: int = -1
         self.last_query: str = ""
+        self.search_index = PrefixIndex()
+        self.search_columns: List[int] = []
+        self._index_stale: bool = False
+        self._lowered = None              # (dataframe, lowercased cell texts) for substring searches
+        self._search_job = None
+        # Edits since the last save, so saving only writes what changed
+        self.dirty_cells: set = set()
+        self.structure_changed: bool = False
+        self._loaded_rows: int = 0
+        self._page_job = None
 
         # UI Components
         self._create_toolbar()
@@ -56,6 +145,7 @@ class DataTable(ctk.CTkFrame):
             ]
 
         self.sheet.enable_bindings(tuple(bindings))
+        self.sheet.bind("<<SheetModified>>", self._on_sheet_modified)
 
     def _create_statusbar(self):
         """Creates the status bar for displaying info and search results."""
@@ -103,6 +193,8 @@ class DataTable(ctk.CTkFrame):
         self.search_entry = ctk.CTkEntry(search_frame, width=150, placeholder_text="Search...")
         self.search_entry.pack(side="left", padx=5)
         self.search_entry.bind("<Return>", lambda e: self.perform_search())
+        # Type-as-you-go: every keystroke narrows the previous result set
+        self.search_entry.bind("<KeyRelease>", self._on_search_typed)
         
         ctk.CTkButton(
             search_frame, text="Find", width=50, height=24, command=self.perform_search
@@ -120,16 +212,7 @@ class DataTable(ctk.CTkFrame):
 
         # Reset search if query changed
         if query != self.last_query:
-            self.search_matches = []
-            self.current_match_index = -1
-            self.last_query = query
-            
-            # Scan data for all matches
-            data = self.sheet.get_sheet_data()
-            for r_idx, row in enumerate(data):
-                for c_idx, cell in enumerate(row):
-                    if query in str(cell).lower():
-                        self.search_matches.append((r_idx, c_idx))
+            self._run_search(query)
 
         if not self.search_matches:
             self.status_label.configure(text=f"No matches found for '{query}'")
@@ -140,6 +223,7 @@ class DataTable(ctk.CTkFrame):
         r, c = self.search_matches[self.current_match_index]
         
         # Select and scroll to match
+        self._load_through(r)
         self.sheet.deselect("all")
         self.sheet.create_selection_box(r, c, r, c, "cells")
         self.sheet.see(r, c)
@@ -148,16 +232,163 @@ class DataTable(ctk.CTkFrame):
             text=f"Match {self.current_match_index + 1} of {len(self.search_matches)} for '{query}'"
         )
 
+    def show_row(self, row: int):
+        """Selects a whole row and scrolls it into view."""
+        self._load_through(row)
+        self.sheet.deselect("all")
+        self.sheet.select_row(row)
+        self.sheet.see(row, 0)
+        self.status_label.configure(text=f"Row {row + 1} of {self.sheet.get_total_rows()}")
+
+    def _on_search_typed(self, event=None):
+        """
+        Jumps to the first match once typing pauses. Return/Find keep cycling as before.
+        """
+        if event is not None and event.keysym in ("Return", "KP_Enter"):
+            return
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(self.SEARCH_DELAY_MS, self._search_typed_now)
+
+    def _search_typed_now(self):
+        self._search_job = None
+        if not self.winfo_exists():
+            return
+        query = self.search_entry.get().lower()
+        if not query:
+            self.search_matches = []
+            self.current_match_index = -1
+            self.last_query = ""
+            self.update_status()
+            return
+        if query != self.last_query:
+            self.perform_search()
+
+    def _run_search(self, query: str):
+        """
+        Finds the matches for query. Name and matric cells come from the prefix index (cells with
+        a word starting with the query; several words may spread over the row, e.g. 'ade grace'
+        across Surname and Firstname). Every other cell matches if it contains the query.
+        If the query extends the previous one, only the previous matches are re-checked: edits
+        and deltas reset last_query, so those are still valid.
+        """
+        words = query.split()
+        if self.last_query and query.startswith(self.last_query):
+            found = {cell for cell in self.search_matches if self._cell_matches(cell, query, words)}
+        else:
+            found = self._scan_cells(query)
+            if words:
+                found |= self.search_index.search_all(words, group=lambda cell: cell[0])
+
+        self.search_matches = sorted(found)
+        self.current_match_index = -1
+        self.last_query = query
+
+    def _lowered_cells(self):
+        """
+        Lowercased cell texts the search reads. From the dataframe, so rows that are not paged
+        in yet are found without loading them, unless rows or columns were moved in the sheet.
+        """
+        if self.structure_changed:
+            self.finish_loading()
+            if self._index_stale:
+                self._build_search_index()
+            return lowered_cells(self.sheet.get_sheet_data())
+        if self._lowered is None or self._lowered[0] is not self.df:
+            self._lowered = (self.df, lowered_cells(self.df))
+        return self._lowered[1]
+
+    def _scan_cells(self, query: str) -> set:
+        """Cells outside the indexed columns containing query. Unsaved edits are read from the sheet."""
+        lowered = self._lowered_cells()
+        others = [c for c in range(lowered.shape[1]) if c not in self.search_columns]
+        found = {(r, others[i]) for r, i in cells_containing(lowered[:, others], query)}
+        if not self.structure_changed:
+            for (r, c) in self.dirty_cells:
+                if c in self.search_columns:
+                    continue
+                if query in str(self.sheet.get_cell_data(r, c)).lower():
+                    found.add((r, c))
+                else:
+                    found.discard((r, c))
+        return found
+
+    def _cell_matches(self, cell: Tuple[int, int], query: str, words: List[str]) -> bool:
+        """Re-checks one earlier match against a longer query."""
+        r, c = cell
+        if c in self.search_columns:
+            return bool(words) and self.search_index.key_matches(cell, words[0]) and all(
+                any(self.search_index.key_matches((r, col), word) for col in self.search_columns)
+                for word in words[1:]
+            )
+        if self.structure_changed or (r, c) in self.dirty_cells:
+            return query in str(self.sheet.get_cell_data(r, c)).lower()
+        return query in self._lowered_cells()[r, c]
+
+    def _reset_search(self):
+        """Matches may have changed, start afresh on the next search."""
+        self.last_query = ""
+        self.search_matches = []
+
+    def _detect_search_columns(self, headers: list) -> List[int]:
+        """Picks the name and matric columns by header, falling back to the first three."""
+        columns = [
+            i for i, h in enumerate(headers)
+            if any(key in str(h).lower() for key in self.SEARCH_HEADERS)
+        ]
+        return columns or list(range(min(3, len(headers))))
+
+    def _build_search_index(self):
+        """Builds the prefix index once per loaded sheet (or after rows/columns were moved)."""
+        self.search_index = PrefixIndex()
+        if self._index_stale:
+            # Structure changed in the sheet, so the dataframe no longer lines up
+            headers = list(self.sheet.headers())
+            self.search_columns = self._detect_search_columns(headers)
+            data = self.sheet.get_sheet_data()
+            for r, row in enumerate(data):
+                for c in self.search_columns:
+                    if c < len(row):
+                        self.search_index.add((r, c), row[c])
+        else:
+            self.search_columns = self._detect_search_columns(list(self.df.columns))
+            for c in self.search_columns:
+                for r, value in enumerate(self.df.iloc[:, c].tolist()):
+                    self.search_index.add((r, c), value)
+        self._index_stale = False
+
+    def _on_sheet_modified(self, event):
+        """Tracks dirty cells for saving and keeps the search index in line with edits."""
+        structural = any([
+            event.added.rows, event.added.columns,
+            event.deleted.rows, event.deleted.columns,
+            event.moved.rows, event.moved.columns,
+            event.cells.header,
+        ])
+        if structural:
+            # Row/column positions shifted, a cell-by-cell save is no longer possible
+            self.structure_changed = True
+            self._index_stale = True
+        else:
+            self.dirty_cells.update(event.cells.table.keys())
+            if not self._index_stale:
+                for (r, c) in event.cells.table:
+                    if c in self.search_columns:
+                        self.search_index.update((r, c), self.sheet.get_cell_data(r, c))
+        self._reset_search()
+
     def sheet_action(self, event_name: str):
         """Triggers a tksheet virtual event."""
         self.sheet.focus_set()
         self.sheet.event_generate(event_name)
 
     def add_row(self):
+        self.finish_loading()
         self.sheet.insert_row()
         self.update_status()
 
     def delete_row(self):
+        self.finish_loading()
         selected = sorted(list(self.sheet.get_selected_rows()), reverse=True)
         if selected:
             for idx in selected:
@@ -167,10 +398,12 @@ class DataTable(ctk.CTkFrame):
             messagebox.showinfo("Info", "No rows selected to delete.")
 
     def add_col(self):
+        self.finish_loading()
         self.sheet.insert_column()
         self.update_status()
 
     def delete_col(self):
+        self.finish_loading()
         selected = sorted(list(self.sheet.get_selected_columns()), reverse=True)
         if selected:
             for idx in selected:
@@ -180,18 +413,173 @@ class DataTable(ctk.CTkFrame):
             messagebox.showinfo("Info", "No columns selected to delete.")
 
     def load_dataframe(self, df: pd.DataFrame):
-        """Loads a new dataframe into the sheet."""
+        """
+        Loads a new dataframe into the sheet.
+        Only the first page is converted up front; the rest is paged in by _load_next_page.
+        """
+        self._cancel_paging()
         self.df = df
         headers = list(df.columns)
-        # Convert all data to string to ensure consistency in display, 
-        # handling NaN usually handled by tksheet or pandas, but safe casting helps.
-        data = df.fillna("").values.tolist()
-        
-        self.sheet.headers(headers)
-        self.sheet.set_sheet_data(data)
-        self.sheet.set_all_column_widths()
+
+        first_page = self._get_rows(0, self.PAGE_SIZE)
+        self._loaded_rows = len(first_page)
+
+        self.sheet.headers(headers, redraw=False)
+        self.sheet.set_sheet_data(first_page, redraw=False)
+        # Measuring every cell is the slowest part of opening a big file, so size from a sample
+        self.sheet.set_column_widths(self._sample_column_widths(headers))
+        self.sheet.redraw()
+        self.update_status()
+
+        self._index_stale = False
+        self._build_search_index()
+        self._reset_search()
+        self.clear_changes()
+
+        self._schedule_next_page()
+
+    def finish_loading(self):
+        """Pushes any rows that have not been paged in yet. Call before reading the whole sheet."""
+        if self._loaded_rows >= len(self.df):
+            return
+        self._cancel_paging()
+        rows = self._get_rows(self._loaded_rows, len(self.df))
+        self._append_rows(rows)
+
+    def _load_through(self, row: int):
+        """Pages in rows up to and including row now, leaving the rest to the pager."""
+        if row < self._loaded_rows:
+            return
+        self._cancel_paging()
+        self._append_rows(self._get_rows(self._loaded_rows, row + 1))
+        self._schedule_next_page()
+
+    def _get_rows(self, start: int, stop: int) -> list:
+        """Converts a slice of the dataframe to the list-of-lists format tksheet wants."""
+        return self.df.iloc[start:stop].fillna("").values.tolist()
+
+    def _append_rows(self, rows: list):
+        self.sheet.insert_rows(
+            rows, idx="end", undo=False, emit_event=False, create_selections=False
+        )
+        self._loaded_rows += len(rows)
         self.update_status()
 
+    def _schedule_next_page(self):
+        if self._loaded_rows < len(self.df):
+            self._page_job = self.after(1, self._load_next_page)
+        else:
+            self._page_job = None
+
+    def _load_next_page(self):
+        self._page_job = None
+        if not self.winfo_exists():
+            return
+        rows = self._get_rows(self._loaded_rows, self._loaded_rows + self.PAGE_SIZE)
+        self._append_rows(rows)
+        self._schedule_next_page()
+
+    def _cancel_paging(self):
+        if self._page_job is not None:
+            try:
+                self.after_cancel(self._page_job)
+            except Exception:
+                pass
+            self._page_job = None
+
+    def _sample_column_widths(self, headers: list) -> List[int]:
+        """
+        Estimates column widths from the header and the first WIDTH_SAMPLE rows
+        instead of measuring every cell, so the cost does not grow with the file.
+        """
+        family, size, _ = self.sheet.font()
+        measure_font = tkfont.Font(family=family, size=size)
+        sample = self.df.head(self.WIDTH_SAMPLE).fillna("")
+
+        widths = []
+        for col_idx, header in enumerate(headers):
+            longest = str(header)
+            for value in sample.iloc[:, col_idx]:
+                text = str(value)
+                if len(text) > len(longest):
+                    longest = text
+            width = measure_font.measure(longest) + 20
+            widths.append(max(self.MIN_COL_WIDTH, min(self.MAX_COL_WIDTH, width)))
+        return widths
+
+    # --- Deltas from other writers (see ExcelWindow._on_file_event) ---
+
+    def _ensure_columns(self, df: pd.DataFrame, count: int) -> pd.DataFrame:
+        """Pads df with empty columns until it has count columns."""
+        for i in range(len(df.columns), count):
+            name = f"Column {i + 1}"
+            while name in df.columns:
+                name += "_"
+            df[name] = ""
+        return df
+
+    def apply_column(self, col: int, values: list):
+        """
+        Writes a whole column (one value per dataframe row), e.g. a newly added session.
+        Works on a copy of the dataframe, which may be shared through the file cache.
+        """
+        df = self._ensure_columns(self.df.copy(), col + 1)
+        df.iloc[:, col] = values
+        self.df = df
+
+        total = self.sheet.get_total_columns()
+        for c in range(total, col + 1):
+            header = str(df.columns[c])
+            column = df.iloc[:self._loaded_rows, c].fillna("").tolist()
+            self.sheet.insert_column([header] + column, idx="end", header=True,
+                                     undo=False, emit_event=False, redraw=False)
+        if col < total:
+            for r in range(self._loaded_rows):
+                if (r, col) not in self.dirty_cells:
+                    self.sheet.set_cell_data(r, col, values[r], redraw=False)
+        self.sheet.redraw()
+        self._reset_search()
+        self.update_status()
+
+    def apply_cells(self, cells: dict):
+        """Writes {(row, col): value} from another writer, leaving cells with unsaved edits alone."""
+        cells = {key: value for key, value in cells.items() if key not in self.dirty_cells}
+        if not cells:
+            return
+        df = self._ensure_columns(self.df.copy(), max(c for _, c in cells) + 1)
+        for (r, c), value in cells.items():
+            df.iat[r, c] = value
+            if r < self._loaded_rows:
+                self.sheet.set_cell_data(r, c, value, redraw=False)
+            if c in self.search_columns and not self._index_stale:
+                self.search_index.update((r, c), value)
+        self.df = df
+        self.sheet.redraw()
+        self._reset_search()
+
+    def append_dataframe_rows(self, new_rows: pd.DataFrame):
+        """Adds rows (from roster_rows) at the bottom, e.g. newly registered students."""
+        rows = new_rows.fillna("").values.tolist()
+        start = len(self.df)
+        # The index holds the leading fields of the attendance files, so it is kept
+        self.df = pd.concat([self.df, new_rows])
+        if not self._index_stale:
+            for i, row in enumerate(rows):
+                for c in self.search_columns:
+                    self.search_index.add((start + i, c), row[c])
+        self._reset_search()
+        # Rows past the paging cursor are picked up by the pager
+        if self._loaded_rows >= start:
+            self._append_rows(rows)
+
+    def get_changes(self) -> dict:
+        """Returns {(row, col): value} for every cell edited since the last save."""
+        return {(r, c): self.sheet.get_cell_data(r, c) for (r, c) in sorted(self.dirty_cells)}
+
+    def clear_changes(self):
+        self.dirty_cells = set()
+        self.structure_changed = False
+
     def update_status(self):
         """Updates the status bar with current dimensions."""
         rows = self.sheet.get_total_rows()
@@ -200,12 +588,13 @@ class DataTable(ctk.CTkFrame):
 
     def get_dataframe(self) -> pd.DataFrame:
         """Returns the current sheet data as a DataFrame."""
+        self.finish_loading()
         data = self.sheet.get_sheet_data()
         headers = self.sheet.headers()
         return pd.DataFrame(data, columns=headers)
     
 
-class ExcelWindow(ctk.CTkToplevel):
+class ExcelWindow(ctk.CTkToplevel, ReusableWindow):
     """
     Top-level window for viewing or editing CSV files via DataTable.
     """
@@ -222,14 +611,44 @@ class ExcelWindow(ctk.CTkToplevel):
         self.lift()
         self.focus_force()
 
-        # Load Data
-        self.df = read_csv_robust(file_path)
+        # Load Data (usually already parsed in the background by the file chooser)
+        self.df = read_csv_cached(file_path)
         if self.df.empty:
             messagebox.showwarning("Warning", "File is empty or could not be read properly.")
             self.df = pd.DataFrame(columns=["Info"], data=[["No Data"]])
+        self._build_line_index()
+        self._saved_signature = None
+        self._reload_pending = False    # The file changed elsewhere while edits were unsaved
 
         self._setup_ui()
 
+        # Follow writes made elsewhere (Add Attendance, Correct a Mark, new students)
+        self._event_handlers = {
+            events.SESSION_ADDED: self._on_session_added,
+            events.MARK_CHANGED: self._on_mark_changed,
+            events.ROSTER_CHANGED: self._on_roster_changed,
+            events.FILE_REWRITTEN: self._on_file_rewritten,
+        }
+        events.subscribe_all(self._event_handlers)
+        self.bind("<Destroy>", self._on_destroy, add="+")
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def _build_line_index(self):
+        """
+        Maps sheet rows to lines in the file so single edits can be written in place.
+        If the mapping can't be trusted, row_lines is None and saving rewrites the file.
+        """
+        self.line_index = None
+        self.row_lines = None
+        try:
+            self.line_index = CSVLineIndex(self.file_path)
+            # The first non-blank line is the header, the rest line up with the dataframe rows
+            row_lines = self.line_index.nonblank_lines()[1:]
+            if len(row_lines) == len(self.df):
+                self.row_lines = row_lines
+        except OSError as e:
+            print(f"Could not index {self.file_path}: {e}")
+
     def _setup_ui(self):
         """Sets up the window layout."""
         # Table 
@@ -249,20 +668,126 @@ class ExcelWindow(ctk.CTkToplevel):
             ctk.CTkButton(
                 btn_frame, text="Save Changes", command=self.save_changes
             ).pack(side="right", padx=5)
+            ctk.CTkButton(
+                btn_frame, text="Undo Last Save", command=self.undo_last_save, fg_color="gray"
+            ).pack(side="right", padx=5)
         else:
             ctk.CTkButton(
                 btn_frame, text="Export as Excel", command=self.export_file
             ).pack(side="right", padx=5)
 
     def save_changes(self):
-        """Saves the current table data back to the CSV file."""
+        """
+        Saves the edits back to the CSV file.
+        Cell edits are written as point-updates (only the touched lines change, and columns
+        added by Add Attendance in the meantime are kept). Structural edits such as
+        adding or deleting rows/columns still rewrite the whole file.
+        """
+        if self.table.structure_changed or self.row_lines is None:
+            self._save_whole_file()
+            return
+
+        changes = self.table.get_changes()
+        if not changes:
+            messagebox.showinfo("Info", "No changes to save.")
+            return
+
+        # Rows and columns were mapped to lines and fields when the window opened. If the file
+        # was sorted or rewritten since, the edits would land on other students or sessions.
+        try:
+            moved = moved_cells(self.file_path, self._save_anchors(changes), index=self.line_index)
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to read {os.path.basename(self.file_path)}.\n{e}")
+            return
+        if moved:
+            if messagebox.askyesno(
+                    "File Changed",
+                    "Rows or sessions in this file were moved since it was opened, so the edits can't be "
+                    "placed cell by cell.\n\nReplace the whole file with this table? "
+                    "(No keeps your edits unsaved.)"):
+                self._save_whole_file()
+            return
+
+        offset = field_offset(self.table.df)
+        file_changes = {(self.row_lines[r], c + offset): value for (r, c), value in changes.items()}
+        try:
+            save_cell_changes(self.file_path, file_changes, index=self.line_index)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save file.\n{e}")
+            return
+        self._remember_own_write()
+
+        self.table.clear_changes()
+        messagebox.showinfo("Success", f"Saved {len(changes)} change(s).")
+        if self._reload_pending:
+            self.reload_from_disk()
+
+    def _save_anchors(self, changes: dict) -> dict:
+        """
+        {(line, field): text} the file must still hold for changes to be saved in place:
+        the surname and matric of every edited row, as loaded, and the DATE and ACTIVITY
+        (or, without those rows, the header) of every edited column.
+        """
+        df = self.table.df
+        offset = field_offset(df)
+
+        def loaded(r, field):
+            return field_value(df, r, field)
+
+        anchors = {}
+        for r, _ in changes:
+            for field in (0, 2):
+                anchors[(self.row_lines[r], field)] = loaded(r, field)
+
+        first = [loaded(r, 0).strip().upper() for r in range(len(df))]
+        header_rows = [r for r, text in enumerate(first) if text in ("DATE", "ACTIVITY")]
+        header_line = self.line_index.nonblank_lines()[0] if len(self.line_index) else None
+        for c in {c for _, c in changes}:
+            if header_rows:
+                for r in header_rows:
+                    anchors[(self.row_lines[r], c + offset)] = loaded(r, c + offset)
+            elif header_line is not None and c < len(df.columns) and not str(df.columns[c]).startswith(("Unnamed", "Column ")):
+                # Header names line up with the first fields, not the data under them
+                anchors[(header_line, c)] = str(df.columns[c]).lstrip("\ufeff")
+        return anchors
+
+    def _save_whole_file(self):
         new_df = self.table.get_dataframe()
         if save_csv(self.file_path, new_df):
+            self.df = new_df
+            self.table.df = new_df
+            self.table.clear_changes()
+            self._build_line_index()
+            self._remember_own_write()
+            events.publish(events.FILE_REWRITTEN, self.file_path)
             messagebox.showinfo("Success", "File saved successfully.")
-            self.df = new_df 
+            if self._reload_pending:
+                self.reload_from_disk()
         else:
             messagebox.showerror("Error", "Failed to save file.")
 
+    def undo_last_save(self):
+        """Reverts the last saved change set for this file and reloads the table."""
+        if self.table.dirty_cells or self.table.structure_changed:
+            if not messagebox.askyesno("Unsaved Changes", "Discard unsaved edits and undo the last save?"):
+                return
+        try:
+            reverted = undo_last_change(self.file_path, index=self.line_index)
+        except Exception as e:
+            messagebox.showerror("Error", f"Undo failed:\n{e}")
+            return
+
+        if not reverted:
+            messagebox.showinfo("Info", "Nothing to undo.")
+            return
+
+        self.df = read_csv_cached(self.file_path)
+        self._build_line_index()
+        self._remember_own_write()
+        self._reload_pending = False
+        self.table.load_dataframe(self.df)
+        messagebox.showinfo("Success", f"Reverted {reverted} cell(s).")
+
     def export_file(self):
         """Exports the current data to an Excel file."""
         level_name = os.path.splitext(os.path.basename(self.file_path))[0].upper()
@@ -279,12 +804,15 @@ class ExcelWindow(ctk.CTkToplevel):
         
         if filepath:
             try:
-                df = self.table.get_dataframe()
-                # Default to openpyxl for xlsx
-                df.to_excel(filepath, index=False) 
+                with tracing.span("export_sheet", file=filepath) as s:
+                    df = self.table.get_dataframe()
+                    s.set(rows=len(df))
+                    # Default to openpyxl for xlsx
+                    df.to_excel(filepath, index=False) 
                 
-                # Apply styling
-                if apply_excel_styling(filepath):
+                    # Apply styling
+                    styled = apply_excel_styling(filepath)
+                if styled:
                     messagebox.showinfo("Export Successful", f"Saved and styled:\n{filepath}")
                 else:
                     messagebox.showinfo("Export Successful", f"Saved (styling failed):\n{filepath}")
@@ -292,10 +820,112 @@ class ExcelWindow(ctk.CTkToplevel):
             except Exception as e:
                 messagebox.showerror("Export Error", f"An error occurred while exporting:\n{e}")
 
+    # --- Change notifications ---
+
+    def _is_mine(self, payload) -> bool:
+        """
+        True if the event is about this file and doesn't come from this window's own save.
+        """
+        if not self.winfo_exists():
+            return False
+        if payload["file"] is not None and payload["file"] != events.event_file(self.file_path):
+            return False
+        own_write = (self.line_index is not None and self.line_index.is_fresh()
+                     and self.line_index.signature == self._saved_signature)
+        return not own_write
+
+    def _remember_own_write(self):
+        """Records the file version this window wrote, so the echo of its own event is ignored."""
+        self._saved_signature = self.line_index.signature if self.line_index else None
+
+    def show_line(self, line_no: int) -> bool:
+        """Selects the row read from line_no of the file. False if that line is not a row of the sheet."""
+        row = self._row_of_line().get(line_no)
+        if row is None:
+            return False
+        self.table.show_row(row)
+        return True
+
+    def _row_of_line(self) -> dict:
+        return {line: r for r, line in enumerate(self.row_lines or [])}
+
+    def _remap_or_reload(self, expected_rows: int) -> bool:
+        """
+        Re-indexes the file after a write. Returns True if the rows still line up with the
+        dataframe (plus expected_rows new ones); otherwise reloads the file and returns False.
+        """
+        try:
+            self.line_index = CSVLineIndex(self.file_path)
+            row_lines = self.line_index.nonblank_lines()[1:]
+        except OSError:
+            row_lines = []
+        if len(row_lines) == len(self.table.df) + expected_rows:
+            self.row_lines = row_lines
+            return True
+        self.reload_from_disk()
+        return False
+
+    def _has_unsaved_edits(self) -> bool:
+        return bool(self.table.dirty_cells or self.table.structure_changed)
+
+    def reload_from_disk(self):
+        """Full re-read, used when a write can't be applied as a delta."""
+        if self._has_unsaved_edits():
+            # Don't throw away the operator's edits; the reload happens once they are saved or discarded
+            self._reload_pending = True
+            self.table.status_label.configure(
+                text="This file was changed elsewhere. It reloads once your edits are saved or discarded.")
+            return
+        self._reload_pending = False
+        self.df = read_csv_cached(self.file_path)
+        self._build_line_index()
+        self.table.load_dataframe(self.df)
+
+    def _on_session_added(self, payload):
+        if not self._is_mine(payload) or not self._remap_or_reload(0):
+            return
+        self.table.apply_column(*session_column(self.table.df, payload))
+
+    def _on_mark_changed(self, payload):
+        if not self._is_mine(payload) or not self._remap_or_reload(0):
+            return
+        self.table.apply_cells(mark_cells(self.table.df, self._row_of_line(), payload["cells"]))
+
+    def _on_roster_changed(self, payload):
+        if not self._is_mine(payload) or not self._remap_or_reload(len(payload["added"])):
+            return
+        self.table.append_dataframe_rows(roster_rows(self.table.df, payload["added"]))
+
+    def _on_file_rewritten(self, payload):
+        if self._is_mine(payload):
+            self.reload_from_disk()
+
+    def _on_destroy(self, event):
+        if event.widget is self:
+            events.unsubscribe_all(self._event_handlers)
+
+    def refresh(self):
+        """Reloads, when the cached window is shown again, if the file changed without an event."""
+        if self.line_index is None or not self.line_index.is_fresh():
+            self.reload_from_disk()
+
     def on_close(self):
-        """Handles window closing event."""
+        """
+        Handles window closing event. Unsaved edits are saved or discarded first: a discarded
+        window is destroyed rather than hidden, so reopening the file starts from disk.
+        """
+        if self._has_unsaved_edits():
+            answer = messagebox.askyesnocancel("Unsaved Changes", "Save your changes before closing?", parent=self)
+            if answer is None:
+                return
+            if answer:
+                self.save_changes()
+                if self._has_unsaved_edits():
+                    return
+            else:
+                self.keep_alive = False
         self.parent.deiconify()
-        self.destroy()
+        self.close()
 
 
 
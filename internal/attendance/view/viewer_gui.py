@@ -1,11 +1,14 @@
 from internal.choosecsv import ChooseCSVWindow
 from internal.attendance.excel import ExcelWindow
+from internal.utils.csv_handler import read_csv_cached
 import os
 
 class ChooseViewerFileWindow(ChooseCSVWindow):
     """
     Wrapper for ChooseCSVWindow to select attendance files and open the absentee report.
     """
+    prefetch_loaders = (read_csv_cached,)
+
     def __init__(self, master):
         attendance_dir = os.path.join(os.path.dirname(__file__), "..", "..","..", "db", "attendance")
         super().__init__(master, 
@@ -17,5 +20,6 @@ class ChooseViewerFileWindow(ChooseCSVWindow):
         """
         Callback function to open the PrintAbsenteesWindow.
         """
-        ExcelWindow(self.master, file_path, editable=False)
+        self.show_window(f"view:{os.path.abspath(file_path)}",
+                         lambda: ExcelWindow(self.master, file_path, editable=False))
 
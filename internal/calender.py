@@ -1,17 +1,49 @@
 import customtkinter as ctk
+import tkinter as tk
+from collections import Counter
 from datetime import date, datetime, timedelta
 import calendar
 
+
+class _Tooltip:
+    """One small borderless window reused for every hover, instead of one per button."""
+    def __init__(self, master):
+        self.master = master
+        self.window = None
+        self.label = None
+
+    def show(self, x, y, text):
+        if self.window is None:
+            self.window = tk.Toplevel(self.master)
+            self.window.overrideredirect(True)
+            self.label = tk.Label(self.window, justify="left", background="#2b2b2b", foreground="white",
+                                  relief="solid", borderwidth=1, font=("Arial", 10), padx=6, pady=3)
+            self.label.pack()
+        self.label.configure(text=text)
+        self.window.geometry(f"+{x}+{y}")
+        self.window.deiconify()
+        self.window.lift()
+
+    def hide(self):
+        if self.window is not None:
+            self.window.withdraw()
+
+
 class CalendarDialog(ctk.CTkToplevel):
-    def __init__(self, parent, initial_date=None, selection_mode="single"):
+    def __init__(self, parent, initial_date=None, selection_mode="single", session_index=None, reusable=False):
+        """
+        session_index is an optional {date: [sessions]} map (see records_func.get_session_index).
+        Days in it are shaded and show their activities on hover. Looking a day up is a dict
+        lookup, so paging through months never touches the attendance file.
+
+        A reusable dialog is hidden instead of destroyed when closed; use CalendarDialog.open().
+        """
         super().__init__(parent)
 
         self.parent = parent
-        self.selection_mode = selection_mode  # "single" or "range"
-        
-        self.selected_date = None      # For single mode
-        self.start_date = None         # For range mode
-        self.end_date = None           # For range mode
+        self.reusable = reusable
+        self._button_dates = [None] * 42   # Date shown on each grid button
+        self._closed = ctk.BooleanVar(self, value=False)
         
         # --- Colors ---
         self.colors = {
@@ -19,10 +51,44 @@ class CalendarDialog(ctk.CTkToplevel):
             "range": "#1f6aa5",        # Range fill color
             "hover": "#144870",        # Hover color
             "today": "#2cc985",        # Today color
+            "session": "#3b4a5e",      # Days with recorded sessions
             "text": "white",            # Text color
             "text_disabled": "gray50"
         }
 
+        # --- Window Config ---
+        self.geometry("340x450") # Slightly taller for instructions/status
+        self.resizable(False, False)
+        self.protocol("WM_DELETE_WINDOW", self._close)
+        self.bind("<Destroy>", self._on_destroy, add="+")
+        
+        # --- Build UI ---
+        self._create_widgets()
+        self.reset(initial_date, selection_mode, session_index)
+
+    @classmethod
+    def open(cls, parent, initial_date=None, selection_mode="single", session_index=None):
+        """
+        Shows the parent's calendar, building it the first time and reusing it afterwards.
+        Call wait() on the result, then get_selection().
+        """
+        dialog = getattr(parent, "_calendar_dialog", None)
+        if dialog is None or not dialog.winfo_exists():
+            dialog = cls(parent, initial_date, selection_mode, session_index, reusable=True)
+            parent._calendar_dialog = dialog
+        else:
+            dialog.reset(initial_date, selection_mode, session_index)
+        return dialog
+
+    def reset(self, initial_date=None, selection_mode="single", session_index=None):
+        """Clears the selection and shows the dialog again with new settings."""
+        self.selection_mode = selection_mode  # "single" or "range"
+        self.session_index = session_index or {}
+        
+        self.selected_date = None      # For single mode
+        self.start_date = None         # For range mode
+        self.end_date = None           # For range mode
+
         # --- Data Setup ---
         self._view_date = date.today().replace(day=1) # Current month being viewed
 
@@ -37,23 +103,40 @@ class CalendarDialog(ctk.CTkToplevel):
             except ValueError:
                 pass 
 
-        # --- Window Config ---
         title = "Select Date" if selection_mode == "single" else "Select Date Range"
         self.title(title)
-        self.geometry("340x450") # Slightly taller for instructions/status
-        self.resizable(False, False)
-        
+        self._update_grid()
+        self._closed.set(False)
+
+        self.deiconify()
         # Make Modal
-        self.transient(parent)
+        self.transient(self.parent)
         self.grab_set()
         
-        # --- Build UI ---
-        self._create_widgets()
-        self._update_grid()
-        
         # Center the window
         self.after(10, self._center_window)
 
+    def wait(self):
+        """Blocks (while still processing events) until the dialog is closed."""
+        if self.reusable:
+            self.wait_variable(self._closed)
+        else:
+            self.wait_window(self)
+
+    def _close(self):
+        if not self.reusable:
+            self.destroy()
+            return
+        self._tooltip.hide()
+        self.grab_release()
+        self.withdraw()
+        self._closed.set(True)
+
+    def _on_destroy(self, event):
+        # Don't leave wait() hanging if the parent window is closed underneath us
+        if event.widget is self:
+            self._closed.set(True)
+
     def get_selection(self):
         """Returns the result based on mode."""
         if self.selection_mode == "single":
@@ -102,7 +185,10 @@ class CalendarDialog(ctk.CTkToplevel):
                     command=lambda i=(r*7)+c: self._on_click(i)
                 )
                 btn.grid(row=r, column=c, padx=2, pady=2)
+                btn.bind("<Enter>", lambda e, i=(r*7)+c: self._on_hover(e, i), add="+")
+                btn.bind("<Leave>", lambda e: self._tooltip.hide(), add="+")
                 self.buttons.append(btn)
+        self._tooltip = _Tooltip(self)
         
         # 4. Info Label (For Range Mode)
         self.lbl_info = ctk.CTkLabel(self, text="", font=("Arial", 12))
@@ -116,7 +202,7 @@ class CalendarDialog(ctk.CTkToplevel):
                       text_color="gray90", command=self._goto_today).pack(side="left", padx=5)
         
         ctk.CTkButton(footer, text="Cancel", fg_color="transparent", text_color="#ff5555", 
-                      width=60, hover_color="#330000", command=self.destroy).pack(side="right")
+                      width=60, hover_color="#330000", command=self._close).pack(side="right")
         
         ctk.CTkButton(footer, text="OK", width=80, fg_color="green", 
                       command=self._confirm).pack(side="right", padx=5)
@@ -142,6 +228,7 @@ class CalendarDialog(ctk.CTkToplevel):
             if i < len(flat_days) and flat_days[i] != 0:
                 d_val = flat_days[i]
                 current_date = date(year, month, d_val)
+                self._button_dates[i] = current_date
                 
                 btn.configure(text=str(d_val), state="normal")
                 
@@ -174,10 +261,30 @@ class CalendarDialog(ctk.CTkToplevel):
                     fg = self.colors["today"]
                     hover = "#26ad73"
 
+                # Shade days that already have sessions recorded
+                if current_date in self.session_index and fg == "transparent":
+                    fg = self.colors["session"]
+
                 btn.configure(fg_color=fg, hover_color=hover, text_color=text_col)
             else:
+                self._button_dates[i] = None
                 btn.configure(text="", fg_color="transparent", state="disabled")
 
+    def _on_hover(self, event, index):
+        """Shows the activities recorded on the hovered day."""
+        sessions = self.session_index.get(self._button_dates[index])
+        if not sessions:
+            self._tooltip.hide()
+            return
+        counts = Counter(s['activity'] if isinstance(s, dict) else str(s) for s in sessions)
+        lines = [f"{act} x{n}" if n > 1 else act for act, n in counts.items()]
+        text = f"{len(sessions)} session(s)\n" + "\n".join(lines)
+        self._tooltip.show(event.x_root + 12, event.y_root + 12, text)
+
+    def destroy(self):
+        self._tooltip.hide()
+        super().destroy()
+
     def _on_click(self, index):
         btn = self.buttons[index]
         day_text = btn.cget("text")
@@ -226,12 +333,12 @@ class CalendarDialog(ctk.CTkToplevel):
     def _confirm(self):
         if self.selection_mode == "single":
             if self.selected_date:
-                self.destroy()
+                self._close()
         else:
             if self.start_date and self.end_date:
-                self.destroy()
+                self._close()
             else:
                 # Allow single day range? Sure, start=end
                 if self.start_date:
                     self.end_date = self.start_date
-                    self.destroy()
\ No newline at end of file
+                    self._close()
\ No newline at end of file
@@ -1,11 +1,18 @@
 import customtkinter as ctk
 import os
 import glob
+from internal.windowcache import ReusableWindow
+from internal.utils.file_cache import prefetch
 
-class ChooseCSVWindow(ctk.CTkToplevel):
+class ChooseCSVWindow(ctk.CTkToplevel, ReusableWindow):
     """
     A window that allows the user to choose a CSV file from a specified directory.
+    The highlighted file is parsed in the background with prefetch_loaders once the window
+    is on screen, so the window opened after "Select File" starts from cached data.
     """
+    # Cached getters the next window will call, e.g. (get_session_index, get_attendance_frame)
+    prefetch_loaders = ()
+
     def __init__(self, master, target_dir, callback, title="Choose CSV File"):
         super().__init__(master)
         self.master = master
@@ -26,26 +33,64 @@ class ChooseCSVWindow(ctk.CTkToplevel):
         self.title_label.grid(row=1, column=0, padx=20, pady=10)
 
         # --- 2. File Selection Dropdown ---
-        self.csv_files = self._get_csv_files()
-        
-        if not self.csv_files:
-            ctk.CTkLabel(self, text=f"No CSV files found in:\n{self.target_dir}").grid(row=2, column=0, padx=20, pady=10)
-            self.select_button = ctk.CTkButton(self, text="Close", command=self.destroy)
-            self.select_button.grid(row=3, column=0, padx=20, pady=10)
-            return
-
-        self.selected_file_var = ctk.StringVar(value=self.csv_files[0]) # Set initial value
-        self.file_optionmenu = ctk.CTkOptionMenu(self, values=self.csv_files,
-                                                 variable=self.selected_file_var)
-        self.file_optionmenu.grid(row=2, column=0, padx=20, pady=10, sticky="ew")
+        self.lbl_no_files = ctk.CTkLabel(self, text="")
+        self.selected_file_var = ctk.StringVar(value="")
+        self.file_optionmenu = ctk.CTkOptionMenu(self, values=[""],
+                                                 variable=self.selected_file_var,
+                                                 command=self._prefetch)
 
         # --- 3. Select Button ---
         self.select_button = ctk.CTkButton(self, text="Select File", command=self._on_select_file)
         self.select_button.grid(row=3, column=0, padx=20, pady=10)
         
+        self.refresh()
+
+        # Prefetch only when shown; prebuilt pickers stay hidden at startup while the
+        # menu's own background work runs
+        self.bind("<Map>", self._on_map, add="+")
+
         # Handle window close event
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
 
+    def refresh(self):
+        """
+        Rescans the target directory. Also called each time a cached window is shown again,
+        so files added in the meantime appear.
+        """
+        self.csv_files = self._get_csv_files()
+        
+        if not self.csv_files:
+            self.file_optionmenu.grid_forget()
+            self.lbl_no_files.configure(text=f"No CSV files found in:\n{self.target_dir}")
+            self.lbl_no_files.grid(row=2, column=0, padx=20, pady=10)
+            self.select_button.configure(text="Close", command=self._on_closing)
+            return
+
+        self.lbl_no_files.grid_forget()
+        self.file_optionmenu.configure(values=self.csv_files)
+        if self.selected_file_var.get() not in self.csv_files:
+            self.selected_file_var.set(self.csv_files[0]) # Set initial value
+        self.file_optionmenu.grid(row=2, column=0, padx=20, pady=10, sticky="ew")
+        self.select_button.configure(text="Select File", command=self._on_select_file)
+
+    def _on_map(self, event):
+        if event.widget is self and self.csv_files:
+            self._prefetch(self.selected_file_var.get())
+
+    def _prefetch(self, filename):
+        """Starts parsing the highlighted file in the background."""
+        if self.prefetch_loaders and filename:
+            prefetch(os.path.join(self.target_dir, filename), self.prefetch_loaders)
+
+    def reshow(self):
+        super().reshow()
+        self.grab_set()
+
+    def show_window(self, key, factory):
+        """Opens the window for the chosen file through the main menu's window cache, if there is one."""
+        windows = getattr(self.master, "windows", None)
+        return windows.show(key, factory) if windows is not None else factory()
+
     def _get_csv_files(self):
         """
         Scans the target directory for CSV files.
@@ -65,7 +110,7 @@ class ChooseCSVWindow(ctk.CTkToplevel):
         selected_filename = self.selected_file_var.get()
         if selected_filename:
             full_file_path = os.path.join(self.target_dir, selected_filename)
-            self.destroy() # Close this window
+            self.close() # Close this window
             
             if self.callback:
                 self.callback(full_file_path)
@@ -75,4 +120,4 @@ class ChooseCSVWindow(ctk.CTkToplevel):
         Handles the window closing event. Re-enables the master window.
         """
         self.master.deiconify() # Show the main window again
-        self.destroy()
+        self.close()
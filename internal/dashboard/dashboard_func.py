@@ -0,0 +1,192 @@
+import atexit
+import json
+import threading
+from pathlib import Path
+
+from internal.attendance.create.create_func import ATTENDANCE_DIR
+from internal.records.records_func import get_attendance_matrix, parse_session_date
+from internal.utils import events, tracing
+from internal.utils.attendance_matrix import ABSENT, LATE, PRESENT, UNKNOWN, mark_code
+from internal.utils.file_cache import file_signature
+
+# Turnout of every session, kept next to the attendance files so the dashboard opens without reading them
+SUMMARY_FILE = Path("db") / "session_summary.json"
+# Updates from writes are saved this long after the first one, so a burst of corrections is one save
+SAVE_DELAY_S = 2.0
+
+
+def _tally(codes) -> dict:
+    """present (late included), absent and total marked out of a session's mark codes."""
+    codes = list(codes)
+    present = sum(1 for c in codes if c in (PRESENT, LATE))
+    absent = sum(1 for c in codes if c == ABSENT)
+    return {'present': present, 'absent': absent, 'total': sum(1 for c in codes if c != UNKNOWN)}
+
+
+def summarize_matrix(matrix) -> list[dict]:
+    """One {'date', 'activity', 'field', 'present', 'absent', 'total'} per session, in file order."""
+    return [dict(_tally(matrix.marks[:, j]), date=str(matrix.session_date_strs[j]),
+                 activity=str(matrix.session_activities[j]), field=int(matrix.session_cols[j]))
+            for j in range(matrix.marks.shape[1])]
+
+
+class SessionSummaryStore:
+    """
+    Per-session turnout for every attendance file, saved in SUMMARY_FILE.
+
+    Levels are recounted from their matrix only when the file changed since the summary was
+    written. The app's own writes keep them current through the event bus: a new session adds
+    a row, a corrected mark moves one count. Those updates are saved with save_later().
+    """
+    def __init__(self, path=SUMMARY_FILE):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._levels = None      # Absolute file path -> {'signature', 'sessions'}
+        self._save_timer = None
+
+    def _loaded(self) -> dict:
+        if self._levels is None:
+            self._levels = {}
+            try:
+                if self.path.exists():
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._levels = json.load(f)
+            except Exception as e:
+                print(f"Error reading session summary: {e}")
+        return self._levels
+
+    def save(self, path=None):
+        path = Path(path or self.path)
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(self._loaded(), f, ensure_ascii=False)
+            except Exception as e:
+                print(f"Error saving session summary: {e}")
+
+    def save_later(self):
+        """Saves SAVE_DELAY_S from now, unless a save is already waiting."""
+        with self._lock:
+            if self._save_timer is None:
+                # Where the summary is now; path is relative to the working directory
+                self._save_timer = threading.Timer(SAVE_DELAY_S, self.save, args=(self.path.absolute(),))
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self):
+        """Saves now if a save is waiting."""
+        with self._lock:
+            if self._save_timer is not None:
+                self.save(*self._save_timer.args)
+
+    def get(self, file_path, load_matrix=get_attendance_matrix) -> list[dict]:
+        """The file's session summaries, recounted if the file changed since they were saved."""
+        path = events.event_file(file_path)
+        signature = file_signature(path)
+        with self._lock:
+            level = self._loaded().get(path)
+            if level is not None and signature is not None and tuple(level['signature'] or ()) == signature:
+                return level['sessions']
+        with tracing.span("summarize_sessions", file=file_path) as s:
+            matrix = load_matrix(file_path)
+            sessions = summarize_matrix(matrix) if matrix is not None else []
+            s.set(sessions=len(sessions))
+        with self._lock:
+            if signature is not None:
+                self._loaded()[path] = {'signature': signature, 'sessions': sessions}
+                self.save()
+        return sessions
+
+    def all_levels(self, attendance_dir=ATTENDANCE_DIR) -> dict:
+        """{level name: sessions} for every attendance file."""
+        return {path.stem: self.get(path) for path in sorted(Path(attendance_dir).glob("*.csv"))}
+
+    def invalidate(self, file_path=None):
+        with self._lock:
+            if file_path is None:
+                self._levels = {}
+            else:
+                self._loaded().pop(events.event_file(file_path), None)
+            self.save_later()
+
+    # --- Change notifications ---
+
+    def _apply(self, payload, update):
+        with self._lock:
+            level = self._loaded().get(payload['file'])
+            if level is None:
+                return
+            if update(level['sessions']):
+                level['signature'] = file_signature(payload['file'])
+            else:
+                del self._levels[payload['file']]
+            self.save_later()
+
+    def on_session_added(self, payload):
+        def add(sessions):
+            codes = [mark_code(mark) for surname, _, _, mark in payload['rows'] if str(surname).strip()]
+            sessions.append(dict(_tally(codes), date=payload['date'], activity=payload['activity'],
+                                 field=payload['field']))
+            return True
+        self._apply(payload, add)
+
+    def on_mark_changed(self, payload):
+        def change(sessions):
+            by_field = {s['field']: s for s in sessions}
+            for cell in payload['cells']:
+                session = by_field.get(cell['field'])
+                if session is None:
+                    continue     # A name or matric
+                old, new = mark_code(cell['old']), mark_code(cell['new'])
+                if (old == UNKNOWN and cell['old'].strip()) or (new == UNKNOWN and cell['new'].strip()):
+                    return False     # Not a mark, e.g. a date or activity was corrected
+                for code, step in ((old, -1), (new, 1)):
+                    if code in (PRESENT, LATE):
+                        session['present'] += step
+                    elif code == ABSENT:
+                        session['absent'] += step
+                    if code != UNKNOWN:
+                        session['total'] += step
+            return True
+        self._apply(payload, change)
+
+    def on_roster_changed(self, payload):
+        # New students have no marks yet, only the file signature moves
+        self._apply(payload, lambda sessions: True)
+
+    def on_file_rewritten(self, payload):
+        self.invalidate(payload['file'])
+
+
+def turnout_series(summaries: dict, level: str | None = None, activity: str | None = None) -> dict:
+    """
+    {activity: [(date, present, total), ...]} oldest first, over one level or all of them.
+    Sessions of the same activity on the same day in different levels are added together.
+    """
+    series = {}
+    for level_name, sessions in summaries.items():
+        if level and level_name != level:
+            continue
+        for s in sessions:
+            if activity and s['activity'].upper() != activity.upper():
+                continue
+            day = parse_session_date(s['date'])
+            if day is None:
+                continue
+            points = series.setdefault(s['activity'].upper(), {})
+            present, total = points.get(day, (0, 0))
+            points[day] = (present + s['present'], total + s['total'])
+    return {act: [(day, p, t) for day, (p, t) in sorted(points.items())] for act, points in series.items()}
+
+
+# main imports this module before anything writes, so every write of the session is counted
+summary_store = SessionSummaryStore()
+atexit.register(summary_store.flush)
+events.subscribe(events.SESSION_ADDED, summary_store.on_session_added)
+events.subscribe(events.MARK_CHANGED, summary_store.on_mark_changed)
+events.subscribe(events.ROSTER_CHANGED, summary_store.on_roster_changed)
+events.subscribe(events.FILE_REWRITTEN, summary_store.on_file_rewritten)
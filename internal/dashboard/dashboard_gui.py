@@ -0,0 +1,153 @@
+import tkinter as tk
+import customtkinter as ctk
+from internal.dashboard.dashboard_func import summary_store, turnout_series
+from internal.resultview import ResultView
+from internal.utils import events
+from internal.windowcache import ReusableWindow
+
+ALL_LEVELS = "All levels"
+ALL_ACTIVITIES = "All activities"
+
+# Line colours, one per activity in the chart
+COLORS = ["#4C9BE8", "#F2A541", "#5CC689", "#E5585F", "#B388EB", "#4ED1D1", "#F28AC0", "#C9C95B"]
+
+
+class DashboardWindow(ctk.CTkToplevel, ReusableWindow):
+    """
+    Turnout per session over time, per level and activity.
+    Everything comes from the session summary (see dashboard_func), so no attendance file is read.
+    """
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.summaries = {}
+
+        self.title("Attendance Dashboard")
+        self.geometry("900x700")
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(2, weight=1)
+
+        ctk.CTkLabel(self, text="Attendance Dashboard", font=("Arial", 20, "bold")).grid(row=0, column=0, pady=(20, 10))
+
+        # 1. Filters
+        frame_filters = ctk.CTkFrame(self, fg_color="transparent")
+        frame_filters.grid(row=1, column=0, padx=20, sticky="ew")
+        self.level_var = ctk.StringVar(value=ALL_LEVELS)
+        self.level_menu = ctk.CTkOptionMenu(frame_filters, variable=self.level_var, values=[ALL_LEVELS],
+                                            command=lambda _: self.redraw())
+        self.level_menu.pack(side="left", padx=(0, 10))
+        self.activity_var = ctk.StringVar(value=ALL_ACTIVITIES)
+        self.activity_menu = ctk.CTkOptionMenu(frame_filters, variable=self.activity_var, values=[ALL_ACTIVITIES],
+                                               command=lambda _: self.redraw())
+        self.activity_menu.pack(side="left")
+        ctk.CTkButton(frame_filters, text="Refresh", width=80, command=self.refresh).pack(side="right")
+
+        # 2. Chart
+        self.canvas = tk.Canvas(self, bg="#2b2b2b", highlightthickness=0, height=360)
+        self.canvas.grid(row=2, column=0, padx=20, pady=10, sticky="nsew")
+        self.canvas.bind("<Configure>", lambda e: self.draw_chart())
+
+        # 3. Per level figures
+        self.table = ResultView(self, width=840, height=160)
+        self.table.grid(row=3, column=0, padx=20, sticky="ew")
+
+        ctk.CTkButton(self, text="Back to Menu", command=self.close_window).grid(row=4, column=0, pady=(10, 20))
+        self.protocol("WM_DELETE_WINDOW", self.close_window)
+
+        # Redraw when attendance is added or corrected while the dashboard is open
+        self._event_handlers = {event: self._on_change for event in
+                                (events.SESSION_ADDED, events.MARK_CHANGED, events.ROSTER_CHANGED, events.FILE_REWRITTEN)}
+        events.subscribe_all(self._event_handlers)
+        self.bind("<Destroy>", lambda e: events.unsubscribe_all(self._event_handlers) if e.widget is self else None, add="+")
+
+        self.refresh()
+
+    def refresh(self):
+        """Reloads the summaries (only files changed outside the app are recounted) and redraws."""
+        self.summaries = summary_store.all_levels()
+        self.level_menu.configure(values=[ALL_LEVELS] + list(self.summaries))
+        if self.level_var.get() not in self.summaries:
+            self.level_var.set(ALL_LEVELS)
+        activities = sorted({s['activity'].upper() for sessions in self.summaries.values() for s in sessions})
+        self.activity_menu.configure(values=[ALL_ACTIVITIES] + activities)
+        if self.activity_var.get() not in activities:
+            self.activity_var.set(ALL_ACTIVITIES)
+        self.redraw()
+
+    def _on_change(self, payload):
+        if self.winfo_exists() and self.winfo_viewable():
+            self.refresh()
+
+    def _filters(self):
+        level = self.level_var.get()
+        activity = self.activity_var.get()
+        return (None if level == ALL_LEVELS else level), (None if activity == ALL_ACTIVITIES else activity)
+
+    def redraw(self):
+        self.draw_chart()
+        self.fill_table()
+
+    def draw_chart(self):
+        """One line per activity: turnout (present / marked) of each session, oldest on the left."""
+        canvas = self.canvas
+        canvas.delete("all")
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        if width < 50 or height < 50:
+            return
+        series = turnout_series(self.summaries, *self._filters())
+        days = sorted({day for points in series.values() for day, _, _ in points})
+        if not days:
+            canvas.create_text(width / 2, height / 2, text="No sessions recorded yet.", fill="gray")
+            return
+
+        left, right, top, bottom = 50, width - 20, 20, height - 60
+        span = max((days[-1] - days[0]).days, 1)
+
+        def x_of(day):
+            return left + (right - left) * (day - days[0]).days / span
+
+        def y_of(percent):
+            return bottom - (bottom - top) * percent / 100
+
+        # Axes and gridlines every 25%
+        for percent in range(0, 101, 25):
+            y = y_of(percent)
+            canvas.create_line(left, y, right, y, fill="#444444")
+            canvas.create_text(left - 8, y, text=f"{percent}%", anchor="e", fill="gray")
+        for day in (days[0], days[len(days) // 2], days[-1]):
+            canvas.create_text(x_of(day), bottom + 12, text=day.strftime("%d/%m/%y"), fill="gray")
+
+        # Lines and legend
+        for i, (activity, points) in enumerate(sorted(series.items())):
+            color = COLORS[i % len(COLORS)]
+            coords = []
+            for day, present, total in points:
+                if total:
+                    coords += [x_of(day), y_of(100 * present / total)]
+            if len(coords) >= 4:
+                canvas.create_line(*coords, fill=color, width=2)
+            for x, y in zip(coords[::2], coords[1::2]):
+                canvas.create_oval(x - 3, y - 3, x + 3, y + 3, fill=color, outline=color)
+            legend_x = left + (i % 4) * (right - left) / 4
+            legend_y = bottom + 32 + (i // 4) * 14
+            canvas.create_rectangle(legend_x, legend_y - 4, legend_x + 10, legend_y + 4, fill=color, outline=color)
+            canvas.create_text(legend_x + 14, legend_y, text=activity, anchor="w", fill="white")
+
+    def fill_table(self):
+        """Sessions, average turnout and the latest session's turnout of every level."""
+        _, activity = self._filters()
+        header = f"{'LEVEL':<12}{'SESSIONS':>10}{'AVG TURNOUT':>14}   LATEST SESSION\n" + "-" * 80
+        lines = []
+        for level, sessions in self.summaries.items():
+            points = [p for series in turnout_series({level: sessions}, activity=activity).values() for p in series]
+            marked = sum(t for _, _, t in points)
+            average = f"{100 * sum(p for _, p, _ in points) / marked:.0f}%" if marked else "-"
+            latest = max(points, default=None)
+            latest_text = (f"{latest[0].strftime('%d/%m/%y')}  {latest[1]}/{latest[2]} present"
+                           if latest else "-")
+            lines.append(f"{level:<12}{len(points):>10}{average:>14}   {latest_text}")
+        self.table.set_lines(lines, header=header)
+
+    def close_window(self):
+        self.parent.deiconify()
+        self.close()
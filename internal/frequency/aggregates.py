@@ -0,0 +1,202 @@
+"""
+Running totals of marks per (level, matric, activity, month).
+
+Frequency reports over whole months add these up instead of recounting every mark.
+The totals follow the app's own writes through the event bus: a new session adds one
+column's worth of counts, a point edit moves one count, new students start at zero. Anything
+else (a sort, a restore, a file edited outside the app) makes the next query rebuild the
+level from its matrix.
+"""
+import threading
+
+import numpy as np
+
+from internal.attendance.create.create_func import normalize_matric
+from internal.utils import events, tracing
+from internal.utils.attendance_matrix import LATE, UNKNOWN, _session_dates, codes_for, mark_code
+from internal.utils.file_cache import file_signature
+
+N_CODES = LATE + 1
+
+
+def month_bounds(start_date, end_date):
+    """First and last whole calendar month inside start_date..end_date, as datetime64[M]."""
+    start = np.datetime64(start_date, "D")
+    end = np.datetime64(end_date, "D")
+    first = start.astype("datetime64[M]")
+    if first.astype("datetime64[D]") != start:
+        first += 1
+    last = end.astype("datetime64[M]")
+    if (last + 1).astype("datetime64[D]") - 1 != end:
+        last -= 1
+    return first, last
+
+
+class LevelAggregates:
+    """
+    Totals for one attendance file: counts[row, key, code] is how many sessions of
+    keys[key] = (activity, month) the student on roster row `row` was marked with code.
+    Sessions are remembered by CSV field so edits can be mapped to their key. Blanks and
+    unknown text land in the UNKNOWN slot, which no query reads.
+    """
+    def __init__(self, matrix, signature=None):
+        self.signature = signature
+        self.surnames = [str(s) for s in matrix.surnames]
+        self.firstnames = [str(s) for s in matrix.firstnames]
+        self.matrics = [str(s) for s in matrix.matrics]
+        self.rows_of = {}
+        for row, matric in enumerate(self.matrics):
+            self.rows_of.setdefault(normalize_matric(matric), []).append(row)
+
+        self.session_cols = [int(c) for c in matrix.session_cols]
+        self.session_dates = matrix.session_dates.copy()
+        self.keys = []
+        self.key_of = {}
+        self.session_keys = [self._key(d, a) for d, a in zip(self.session_dates, matrix.session_activities)]
+
+        # (students x sessions) one-hot codes times (sessions x keys) one-hot keys
+        key_matrix = np.zeros((len(self.session_keys), len(self.keys)), dtype=np.int32)
+        for j, k in enumerate(self.session_keys):
+            if k >= 0:
+                key_matrix[j, k] = 1
+        self.counts = np.zeros((len(self.matrics), len(self.keys), N_CODES), dtype=np.int32)
+        for code in range(UNKNOWN + 1, N_CODES):
+            self.counts[:, :, code] = (matrix.marks == code).astype(np.int32) @ key_matrix
+
+    def _key(self, session_date, activity) -> int:
+        """Index of the (activity, month) key of a session, added if new; -1 for an unreadable date."""
+        if np.isnat(session_date):
+            return -1
+        key = (str(activity), str(np.datetime64(session_date, "M")))
+        if key not in self.key_of:
+            self.key_of[key] = len(self.keys)
+            self.keys.append(key)
+        return self.key_of[key]
+
+    # --- Updates. Each returns False when the change can't be applied and the level must be rebuilt. ---
+
+    def add_session(self, field, date_str, activity, rows) -> bool:
+        session_date = _session_dates([date_str])[0]
+        k = self._key(session_date, activity)
+        self.session_cols.append(int(field))
+        self.session_dates = np.append(self.session_dates, session_date)
+        self.session_keys.append(k)
+        if k < 0:
+            return True
+        if k == self.counts.shape[1]:
+            self.counts = np.concatenate(
+                [self.counts, np.zeros((len(self.matrics), 1, N_CODES), dtype=np.int32)], axis=1)
+        for _, _, matric, mark in rows:
+            for row in self.rows_of.get(normalize_matric(matric), []):
+                self.counts[row, k, mark_code(mark)] += 1
+        return True
+
+    def change_marks(self, cells) -> bool:
+        for cell in cells:
+            if cell['field'] not in self.session_cols:
+                return False     # A name or matric changed
+            k = self.session_keys[self.session_cols.index(cell['field'])]
+            rows = self.rows_of.get(normalize_matric(cell['matric']), [])
+            if len(rows) != 1:
+                return False
+            if k >= 0:
+                self.counts[rows[0], k, mark_code(cell['old'])] -= 1
+                self.counts[rows[0], k, mark_code(cell['new'])] += 1
+        return True
+
+    def add_students(self, students) -> bool:
+        if any(len(s) > 3 and any(str(v).strip() for v in s[3:]) for s in students):
+            return False         # Arrived with marks
+        for student in students:
+            student = list(student) + [''] * (3 - len(student))
+            self.rows_of.setdefault(normalize_matric(student[2]), []).append(len(self.matrics))
+            self.surnames.append(str(student[0]))
+            self.firstnames.append(str(student[1]))
+            self.matrics.append(str(student[2]))
+        grow = len(self.matrics) - self.counts.shape[0]
+        self.counts = np.concatenate([self.counts, np.zeros((grow, len(self.keys), N_CODES), dtype=np.int32)])
+        return True
+
+    # --- Queries ---
+
+    def sessions_between(self, start_date, end_date) -> np.ndarray:
+        dates = self.session_dates
+        return (dates >= np.datetime64(start_date, "D")) & (dates <= np.datetime64(end_date, "D"))
+
+    def count_months(self, first_month, last_month, target_marks) -> np.ndarray:
+        """Per student, sessions marked with target_marks in the months first_month..last_month."""
+        if not self.keys or first_month > last_month:
+            return np.zeros(len(self.matrics), dtype=np.int64)
+        months = np.array([m for _, m in self.keys], dtype="datetime64[M]")
+        in_months = (months >= first_month) & (months <= last_month)
+        return self.counts[:, in_months][:, :, codes_for(target_marks)].sum(axis=(1, 2))
+
+    def roster(self) -> list[dict]:
+        return [{'Surname': s, 'Firstname': f, 'Matric NO': m}
+                for s, f, m in zip(self.surnames, self.firstnames, self.matrics)]
+
+
+class AggregateStore:
+    """LevelAggregates per attendance file, kept current by the app's own writes."""
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._levels: dict[str, LevelAggregates] = {}
+
+    def get(self, file_path, load_matrix) -> LevelAggregates | None:
+        """The file's totals, rebuilt from load_matrix(file_path) if the file changed behind our back."""
+        path = events.event_file(file_path)
+        signature = file_signature(file_path)
+        with self._lock:
+            level = self._levels.get(path)
+            if level is not None and signature is not None and level.signature == signature:
+                return level
+        return self.rebuild(file_path, load_matrix(file_path), signature)
+
+    def rebuild(self, file_path, matrix, signature=None) -> LevelAggregates | None:
+        """Recounts a level from its matrix."""
+        if matrix is None:
+            return None
+        with tracing.span("build_aggregates", file=file_path, students=len(matrix)):
+            level = LevelAggregates(matrix, signature)
+        with self._lock:
+            if signature is not None:
+                self._levels[events.event_file(file_path)] = level
+        return level
+
+    def invalidate(self, file_path=None):
+        with self._lock:
+            if file_path is None:
+                self._levels.clear()
+            else:
+                self._levels.pop(events.event_file(file_path), None)
+
+    def _apply(self, payload, update):
+        with self._lock:
+            level = self._levels.get(payload['file'])
+            if level is None:
+                return
+            if update(level):
+                level.signature = file_signature(payload['file'])
+            else:
+                del self._levels[payload['file']]
+
+    def on_session_added(self, payload):
+        self._apply(payload, lambda level: level.add_session(payload['field'], payload['date'],
+                                                             payload['activity'], payload['rows']))
+
+    def on_mark_changed(self, payload):
+        self._apply(payload, lambda level: level.change_marks(payload['cells']))
+
+    def on_roster_changed(self, payload):
+        self._apply(payload, lambda level: level.add_students(payload['added']))
+
+    def on_file_rewritten(self, payload):
+        self.invalidate(payload['file'])
+
+
+# One store shared by every window, updated straight from the writers' threads
+aggregate_store = AggregateStore()
+events.subscribe(events.SESSION_ADDED, aggregate_store.on_session_added)
+events.subscribe(events.MARK_CHANGED, aggregate_store.on_mark_changed)
+events.subscribe(events.ROSTER_CHANGED, aggregate_store.on_roster_changed)
+events.subscribe(events.FILE_REWRITTEN, aggregate_store.on_file_rewritten)
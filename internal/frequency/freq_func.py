@@ -1,70 +1,81 @@
+import os
+
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from internal.records.records_func import load_attendance_file, get_session_info
+
+from internal.frequency.aggregates import aggregate_store, month_bounds
+from internal.records.records_func import get_attendance_matrix
+from internal.utils import tracing
+from internal.utils.excel_styler import apply_excel_styling
+
+# Marks counted by the attendance and absence frequency reports
+PRESENT_MARKS = ['✓', 'P', 'p', 'Present']
+ABSENT_MARKS = ['✗', 'x', 'X', 'A', 'a', 'Absent']
 
 def calculate_frequency(file_path, start_date, end_date, target_marks):
     """
     Calculates the frequency of target_marks for each student within the date range.
     Returns a list of dictionaries: {'Surname': ..., 'Firstname': ..., 'Matric NO': ..., 'Count': ...}
-    """
-    df = load_attendance_file(file_path)
-    if df is None:
-        return []
 
-    sessions = get_session_info(file_path)
-    if not sessions:
+    Whole months come from the running totals in aggregates; only the sessions of a partly
+    covered first or last month are counted from the marks themselves.
+    """
+    level = aggregate_store.get(file_path, get_attendance_matrix)
+    if level is None:
         return []
 
-    # Identify relevant columns based on date range
-    relevant_indices = []
-    
-    # sessions is { 'dd/mm/yy': [{'activity': 'Name', 'col_index': int}, ...] }
-    for date_str, session_list in sessions.items():
-        try:
-            # Parse date. Assuming format dd/mm/yy as seen in get_session_info
-            current_date = datetime.strptime(date_str, "%d/%m/%y").date()
-            
-            if start_date <= current_date <= end_date:
-                for session in session_list:
-                    relevant_indices.append(session['col_index'])
-        except ValueError:
-            continue
-
-    if not relevant_indices:
+    # Sessions in the date range; dates in either dd/mm/yy or dd/mm/YYYY count
+    in_range = level.sessions_between(start_date, end_date)
+    if not in_range.any():
         return []
 
-    # Prepare data for processing
-    local_df = df.copy()
-    if len(local_df.columns) < 3:
-        return []
+    first_month, last_month = month_bounds(start_date, end_date)
+    months = level.session_dates.astype("datetime64[M]")
+    edges = in_range & ~((months >= first_month) & (months <= last_month))
+    counts = level.count_months(first_month, last_month, target_marks)
+    roster = level.roster()
 
-    # Rename standard columns
-    local_df.rename(columns={'0': 'Surname', '1': 'Firstname', '2': 'Matric NO'}, inplace=True)
+    if edges.any():
+        matrix = get_attendance_matrix(file_path)
+        if matrix is None:
+            return []
+        if list(matrix.matrics) != level.matrics:
+            # The totals fell behind the file; count this query from the marks and rebuild next time
+            aggregate_store.invalidate(file_path)
+            counts = matrix.count(target_marks, matrix.session_mask(start_date, end_date))
+            roster = matrix.roster()
+        else:
+            edge_cols = np.array(level.session_cols)[edges]
+            counts = counts + matrix.count(target_marks, np.isin(matrix.session_cols, edge_cols))
 
-    # Filter out header/metadata rows
-    mask_valid_rows = ~local_df['Surname'].str.upper().isin(['DATE', 'ACTIVITY', 'SURNAME', 'NAN', 'NONE'])
-    mask_valid_rows &= local_df['Surname'].notna()
-    
-    clean_df = local_df[mask_valid_rows].copy()
+    return [dict(student, Count=int(count)) for student, count in zip(roster, counts)]
 
-    # Calculate counts
-    results = []
-    
-    for index, row in clean_df.iterrows():
-        count = 0
-        for col_idx in relevant_indices:
-            col_name = str(col_idx)
-            # Check if column exists in row
-            if col_name in row:
-                cell_value = str(row[col_name]).strip()
-                if cell_value in target_marks:
-                    count += 1
-        
-        results.append({
-            'Surname': str(row['Surname']),
-            'Firstname': str(row['Firstname']),
-            'Matric NO': str(row['Matric NO']),
-            'Count': count
-        })
+def calculate_frequency_all(file_paths, start_date, end_date, target_marks):
+    """
+    calculate_frequency over several level files.
+    Returns every level's rows with a 'Level' column first, levels in the order given.
+    Levels are counted in this process, from the totals and matrices already cached for them.
+    """
+    rows = []
+    with tracing.span("calculate_frequency_all", levels=len(file_paths)):
+        for file_path in file_paths:
+            level = os.path.splitext(os.path.basename(str(file_path)))[0]
+            rows.extend({'Level': level, **row}
+                        for row in calculate_frequency(str(file_path), start_date, end_date, target_marks))
+    return rows
 
-    return results
+def save_frequency_workbook(rows, save_path, count_column="Count"):
+    """
+    Writes frequency rows to one styled workbook, with Count renamed to count_column.
+    Rows with a 'Level' (from calculate_frequency_all) get an "All levels" sheet plus a sheet per level.
+    """
+    df = pd.DataFrame(rows).rename(columns={'Count': count_column})
+    with tracing.span("export_frequency", file=save_path, rows=len(df)):
+        if 'Level' in df.columns:
+            with pd.ExcelWriter(save_path) as writer:
+                df.to_excel(writer, sheet_name="All levels", index=False)
+                for level, level_df in df.groupby('Level', sort=False):
+                    level_df.drop(columns='Level').to_excel(writer, sheet_name=str(level)[:31], index=False)
+        else:
+            df.to_excel(save_path, index=False)
+        apply_excel_styling(save_path)
@@ -1,32 +1,55 @@
 import customtkinter as ctk
 import os
-import pandas as pd
 from tkinter import messagebox, filedialog
 from internal.choosecsv import ChooseCSVWindow
 from internal.calender import CalendarDialog
-from internal.frequency.freq_func import calculate_frequency
-from internal.utils.excel_styler import apply_excel_styling
+from internal.resultview import ResultView
+from internal.frequency.freq_func import (ABSENT_MARKS, PRESENT_MARKS, calculate_frequency, calculate_frequency_all,
+                                         save_frequency_workbook)
+from internal.records.records_func import get_session_index, get_attendance_matrix, parse_session_date, sessions_in_range
+from internal.attendance.create.create_func import normalize_matric
+from internal.utils import events
 from internal.utils.general import get_target_dir
 class ChooseFrequencyFileWindow(ChooseCSVWindow):
+    prefetch_loaders = (get_attendance_matrix, get_session_index)
+
     def __init__(self, master):
         attendance_dir = os.path.join(os.path.dirname(__file__), "..", "..", "db", "attendance")
         super().__init__(master, 
                          target_dir=attendance_dir, 
                          callback=self.open_frequency_window,
                          title="Select Attendance File for Frequency")
+        self.geometry("400x300")
+        self.all_levels_button = ctk.CTkButton(self, text="All Levels", command=self._on_select_all)
+        self.all_levels_button.grid(row=4, column=0, padx=20, pady=(0, 10))
 
     def open_frequency_window(self, file_path):
         FrequencyWindow(self.master, file_path)
 
+    def _on_select_all(self):
+        """Opens the frequency window over every attendance file at once."""
+        if not self.csv_files:
+            return
+        self.close()
+        FrequencyWindow(self.master, level_files=[os.path.join(self.target_dir, f) for f in sorted(self.csv_files)])
+
 class FrequencyWindow(ctk.CTkToplevel):
-    def __init__(self, master, file_path):
+    """
+    Frequency of one attendance file, or with level_files of several at once. Over several
+    files every row carries its 'Level' and the export has a sheet per level.
+    """
+    def __init__(self, master, file_path=None, level_files=None):
         super().__init__(master)
         self.master = master
         self.file_path = file_path
+        self.level_files = level_files or [file_path]
+        self.all_levels = level_files is not None
         self.start_date = None
         self.end_date = None
         self.current_data = [] # List of dicts
         self.current_mode = "" # "Attendance" or "Absence"
+        self.current_marks = []
+        self.range_cols = {}  # File -> columns of the sessions counted in current_data
 
         self.title("Attendance Frequency")
         self.geometry("600x650")
@@ -34,13 +57,26 @@ class FrequencyWindow(ctk.CTkToplevel):
         # UI Setup
         self._setup_ui()
 
+        # Update the counts in place when attendance is added or corrected elsewhere
+        self._event_handlers = {
+            events.SESSION_ADDED: self._on_session_added,
+            events.MARK_CHANGED: self._on_mark_changed,
+            events.ROSTER_CHANGED: self._on_roster_changed,
+            events.FILE_REWRITTEN: self._on_file_rewritten,
+        }
+        events.subscribe_all(self._event_handlers)
+        self.bind("<Destroy>", lambda e: events.unsubscribe_all(self._event_handlers) if e.widget is self else None, add="+")
+
     def _setup_ui(self):
         # Title
         ctk.CTkLabel(self, text="Frequency Analysis", font=("Arial", 20, "bold")).pack(pady=10)
         
         # File info
-        file_name = os.path.basename(self.file_path)
-        ctk.CTkLabel(self, text=f"File: {file_name}", text_color="gray").pack(pady=5)
+        if self.all_levels:
+            file_text = f"All levels ({len(self.level_files)} files)"
+        else:
+            file_text = f"File: {os.path.basename(self.file_path)}"
+        ctk.CTkLabel(self, text=file_text, text_color="gray").pack(pady=5)
 
         # Date Selection
         self.date_btn = ctk.CTkButton(self, text="Select Date Range", command=self._select_date_range)
@@ -57,9 +93,8 @@ class FrequencyWindow(ctk.CTkToplevel):
         ctk.CTkButton(btn_frame, text="Calculate Absence", command=self._calc_absence).pack(side="left", padx=10)
 
         # Results Area
-        self.textbox = ctk.CTkTextbox(self, width=500, height=350)
+        self.textbox = ResultView(self, width=500, height=350)
         self.textbox.pack(pady=10)
-        self.textbox.configure(state="disabled")
 
         # Export Button
         self.btn_export = ctk.CTkButton(self, text="Export to Excel", command=self._export, state="disabled")
@@ -71,21 +106,35 @@ class FrequencyWindow(ctk.CTkToplevel):
         self.protocol("WM_DELETE_WINDOW", self._close)
 
     def _select_date_range(self):
-        cal = CalendarDialog(self, selection_mode="range")
-        self.wait_window(cal)
+        cal = CalendarDialog.open(self, selection_mode="range", session_index=self._session_index())
+        cal.wait()
         selection = cal.get_selection()
         if selection and selection[0] and selection[1]:
             self.start_date, self.end_date = selection
-            self.lbl_date_range.configure(text=f"Range: {self.start_date.strftime('%d/%m/%y')}" + "-" + {self.end_date.strftime('%d/%m/%y')})
+            self.lbl_date_range.configure(text=f"Range: {self.start_date.strftime('%d/%m/%y')} - {self.end_date.strftime('%d/%m/%y')}")
         elif selection and selection[0]:
             self.start_date = self.end_date = selection[0]
             self.lbl_date_range.configure(text=f"Range: {self.start_date.strftime('%d/%m/%y')} (Single Day)")
 
+    def _session_index(self):
+        """The session index of the file, or of every level merged for the calendar."""
+        if not self.all_levels:
+            return get_session_index(self.file_path)
+        merged = {}
+        for path in self.level_files:
+            for d_obj, sessions in get_session_index(path).items():
+                merged.setdefault(d_obj, []).extend(sessions)
+        return merged
+
+    def _level_of(self, file_path):
+        """What rows of file_path carry in 'Level' (nothing for a single file)."""
+        return os.path.splitext(os.path.basename(file_path))[0] if self.all_levels else None
+
     def _calc_attendance(self):
-        self._calculate(target_marks=['✓', 'P', 'p', 'Present'], mode="Attendance")
+        self._calculate(target_marks=PRESENT_MARKS, mode="Attendance")
 
     def _calc_absence(self):
-        self._calculate(target_marks=['✗', 'x', 'X', 'A', 'a', 'Absent'], mode="Absence")
+        self._calculate(target_marks=ABSENT_MARKS, mode="Absence")
 
     def _calculate(self, target_marks, mode):
         if not self.start_date or not self.end_date:
@@ -93,38 +142,108 @@ class FrequencyWindow(ctk.CTkToplevel):
             return
 
         self.current_mode = mode
-        self.textbox.configure(state="normal")
-        self.textbox.delete("0.0", "end")
-        self.textbox.insert("0.0", f"Calculating {mode} frequency...\n")
+        self.textbox.show_message(f"Calculating {mode} frequency...\n")
         self.update()
 
-        results = calculate_frequency(self.file_path, self.start_date, self.end_date, target_marks)
+        if self.all_levels:
+            results = calculate_frequency_all(self.level_files, self.start_date, self.end_date, target_marks)
+        else:
+            results = calculate_frequency(self.file_path, self.start_date, self.end_date, target_marks)
         
         self.current_data = results
-        
-        self.textbox.delete("0.0", "end")
+        self.current_marks = target_marks
+        self.range_cols = {events.event_file(path): {act['col_index'] for _, act in
+                                                     sessions_in_range(get_session_index(path), self.start_date, self.end_date)}
+                           for path in self.level_files}
+        self._render()
+
+    def _render(self):
+        results = self.current_data
         if not results:
-            self.textbox.insert("0.0", "No data found for the selected range.")
+            self.textbox.show_message("No data found for the selected range.")
             self.btn_export.configure(state="disabled")
         else:
-            header = f"SURNAME\tFIRSTNAME\tMATRIC NO\tCOUNT\n" 
-            header += "-"*60 + "\n"
-            self.textbox.insert("0.0", header)
-            
-            for row in results:
-                line = f"{row['Surname']}\t{row['Firstname']}\t{row['Matric NO']}\t{row['Count']}\n"
-                self.textbox.insert("end", line)
+            fields = (['Level'] if self.all_levels else []) + ['Surname', 'Firstname', 'Matric NO', 'Count']
+            header = "\t".join(f.upper() for f in fields) + "\n"
+            header += "-"*60
+            lines = ["\t".join(str(row[f]) for f in fields) for row in results]
+            self.textbox.set_lines(lines, header=header)
             
             self.btn_export.configure(state="normal")
-            
-        self.textbox.configure(state="disabled")
+
+    # --- Change notifications ---
+
+    def _is_mine(self, payload):
+        return (self.winfo_exists() and bool(self.current_mode)
+                and (payload["file"] is None or payload["file"] in self.range_cols))
+
+    def _rows_by_matric(self, payload):
+        level = self._level_of(payload["file"])
+        return {normalize_matric(row['Matric NO']): row for row in self.current_data if row.get('Level') == level}
+
+    def _new_row(self, payload, surname, firstname, matric):
+        row = {'Surname': surname, 'Firstname': firstname, 'Matric NO': matric, 'Count': 0}
+        return {'Level': self._level_of(payload["file"]), **row} if self.all_levels else row
+
+    def _on_session_added(self, payload):
+        """Counts the new session if it falls inside the selected range."""
+        if not self._is_mine(payload):
+            return
+        dt = parse_session_date(payload["date"])
+        if dt is None or not (self.start_date <= dt <= self.end_date):
+            return
+        self.range_cols[payload["file"]].add(payload["field"])
+        rows = self._rows_by_matric(payload)
+        for surname, firstname, matric, mark in payload["rows"]:
+            row = rows.get(matric)
+            if row is None:
+                row = self._new_row(payload, surname, firstname, matric)
+                self.current_data.append(row)
+                rows[matric] = row
+            if mark in self.current_marks:
+                row['Count'] += 1
+        self._render()
+
+    def _on_mark_changed(self, payload):
+        """Adjusts the count of each student whose mark changed in a counted session."""
+        if not self._is_mine(payload):
+            return
+        rows = self._rows_by_matric(payload)
+        changed = False
+        for cell in payload["cells"]:
+            row = rows.get(cell["matric"])
+            if row is None or cell["field"] not in self.range_cols[payload["file"]]:
+                continue
+            delta = (cell["new"].strip() in self.current_marks) - (cell["old"].strip() in self.current_marks)
+            if delta:
+                row['Count'] += delta
+                changed = True
+        if changed:
+            self._render()
+
+    def _on_roster_changed(self, payload):
+        """New students start with a count of zero."""
+        if not self._is_mine(payload):
+            return
+        rows = self._rows_by_matric(payload)
+        for student in payload["added"]:
+            matric = normalize_matric(student[2]) if len(student) > 2 else ""
+            if matric and matric not in rows:
+                self.current_data.append(self._new_row(payload, student[0], student[1], matric))
+        self._render()
+
+    def _on_file_rewritten(self, payload):
+        if self._is_mine(payload):
+            self._calculate(self.current_marks, self.current_mode)
 
     def _export(self):
         if not self.current_data:
             return
             
-        file_name = os.path.basename(self.file_path)
-        level_name = os.path.splitext(file_name)[0].upper()
+        if self.all_levels:
+            level_name = "ALL_LEVELS"
+        else:
+            level_name = os.path.splitext(os.path.basename(self.file_path))[0].upper()
         
         # Construct default filename
         s_str = self.start_date.strftime("%d-%m-%y")
@@ -139,18 +258,14 @@ class FrequencyWindow(ctk.CTkToplevel):
             filetypes=[("Excel Files", "*.xlsx")],
             initialfile=default_name,
             title="Export Frequency Report",
-            intialdir=filepath
+            initialdir=filepath
         )
         
         if save_path:
             try:
-                df = pd.DataFrame(self.current_data)
                 # Rename Count column based on mode
                 col_name = "NO Attended" if self.current_mode == "Attendance" else "NO Missed"
-                df.rename(columns={'Count': col_name}, inplace=True)
-                
-                df.to_excel(save_path, index=False)
-                apply_excel_styling(save_path)
+                save_frequency_workbook(self.current_data, save_path, col_name)
                 messagebox.showinfo("Success", f"Exported to {os.path.basename(save_path)}")
             except Exception as e:
                 messagebox.showerror("Export Error", f"Failed to export: {str(e)}")
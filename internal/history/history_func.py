@@ -0,0 +1,254 @@
+import csv
+import os
+import threading
+from datetime import date
+
+import pandas as pd
+
+from internal.attendance.create.create_func import ATTENDANCE_DIR, normalize_matric
+from internal.records.records_func import parse_session_date
+from internal.utils import tracing
+from internal.utils.attendance_matrix import ABSENT, EXCUSED, LATE, PRESENT, UNKNOWN, mark_code
+from internal.utils.csv_index import CSVLineIndex
+from internal.utils.excel_styler import apply_excel_styling
+from internal.utils.file_cache import file_cache
+
+_NOT_STUDENTS = {'DATE', 'ACTIVITY', 'SURNAME', 'NAN', 'NONE', ''}
+
+
+def matric_key(value) -> str:
+    """How matrics are compared: as typed, without spaces, '.0' from Excel or letter case."""
+    return normalize_matric(value).replace(" ", "").upper()
+
+
+def _fields(raw: bytes, count=None) -> list[str]:
+    """The first count fields of a CSV line (all of them without count)."""
+    text = raw.decode("utf-8", errors="replace")
+    if count is not None and '"' not in text:
+        return text.split(",", count)[:count]
+    return next(csv.reader([text]), [])
+
+
+class LevelRows:
+    """
+    Where every student sits in one level file: matric -> line number, the file's CSVLineIndex
+    to read that line with one seek, and the file's sessions as (field, date_str, date, activity).
+    """
+    def __init__(self, file_path):
+        self.file_path = str(file_path)
+        self.level = os.path.splitext(os.path.basename(self.file_path))[0]
+        self.lines = CSVLineIndex(self.file_path)
+        self.matric_lines: dict[str, int] = {}
+        self.sessions: list[tuple] = []
+
+        with open(self.file_path, "rb") as f:
+            data = f.read()
+        date_row = activity_row = None
+        for line_no, (start, end) in enumerate(zip(self.lines.offsets, self.lines.ends)):
+            if self.lines.blank[line_no]:
+                continue
+            fields = _fields(data[start:end], 3)
+            first = fields[0].strip().upper()
+            if first == "DATE":
+                date_row = _fields(data[start:end])
+            elif first == "ACTIVITY":
+                activity_row = _fields(data[start:end])
+            elif first not in _NOT_STUDENTS and len(fields) > 2 and fields[2].strip():
+                # The first row of a matric wins, like everywhere else in the app
+                self.matric_lines.setdefault(matric_key(fields[2]), line_no)
+
+        if date_row and activity_row:
+            for field in range(3, min(len(date_row), len(activity_row))):
+                d_str, activity = date_row[field].strip(), activity_row[field].strip()
+                if d_str and activity:
+                    self.sessions.append((field, d_str, parse_session_date(d_str), activity))
+        # Oldest first; columns of the same day stay in file order
+        self.sessions.sort(key=lambda s: (s[2] or date.max, s[0]))
+
+    def __len__(self):
+        return len(self.matric_lines)
+
+    def card(self, line_no, start_date=date.min, end_date=date.max, activity=None) -> dict:
+        """The history card of the student on line_no, read with one seek."""
+        return _card(self, self.lines.read_row(line_no), start_date, end_date, activity)
+
+
+def build_level_rows(file_path):
+    try:
+        with tracing.span("build_level_rows", file=file_path, bytes=lambda: tracing.file_size(file_path)) as s:
+            rows = LevelRows(file_path)
+            s.set(students=len(rows))
+        return rows
+    except Exception as e:
+        print(f"Error indexing {file_path}: {e}")
+        return None
+
+
+def get_level_rows(file_path):
+    """Shared, cached LevelRows for a level file. Re-built only when the file changes."""
+    return file_cache.get(file_path, "level_rows", build_level_rows)
+
+
+class MatricIndex:
+    """
+    matric -> [(level file, line number)] over every attendance file, so finding a student is
+    a dict lookup and reading their marks is one seek, instead of parsing every level.
+    Merged from the cached LevelRows of each file, again only when one of them changed.
+    """
+    def __init__(self, attendance_dir=ATTENDANCE_DIR):
+        self.attendance_dir = attendance_dir
+        self._lock = threading.Lock()
+        self._levels: dict[str, LevelRows] = {}
+        self._locations: dict[str, list[tuple[str, int]]] = {}
+
+    def files(self) -> list[str]:
+        try:
+            names = sorted(n for n in os.listdir(self.attendance_dir) if n.lower().endswith(".csv"))
+        except OSError:
+            return []
+        return [os.path.abspath(os.path.join(self.attendance_dir, n)) for n in names]
+
+    def refresh(self):
+        levels = {path: get_level_rows(path) for path in self.files()}
+        levels = {path: rows for path, rows in levels.items() if rows is not None}
+        with self._lock:
+            if levels.keys() == self._levels.keys() and all(levels[p] is self._levels[p] for p in levels):
+                return
+            locations = {}
+            for path, rows in levels.items():
+                for matric, line_no in rows.matric_lines.items():
+                    locations.setdefault(matric, []).append((path, line_no))
+            self._levels, self._locations = levels, locations
+
+    def __len__(self):
+        self.refresh()
+        return len(self._locations)
+
+    def locate(self, matric, refresh=True) -> list[tuple[str, int]]:
+        """(level file, line number) of every row with this matric, usually just one."""
+        if refresh:
+            self.refresh()
+        with self._lock:
+            return list(self._locations.get(matric_key(matric), []))
+
+    def level_rows(self, file_path) -> LevelRows | None:
+        with self._lock:
+            return self._levels.get(os.path.abspath(str(file_path)))
+
+
+def _card(level_rows, fields, start_date, end_date, activity) -> dict:
+    counts = {PRESENT: 0, LATE: 0, ABSENT: 0, EXCUSED: 0}
+    absences, history = [], []
+    for field, d_str, d_obj, session_activity in level_rows.sessions:
+        if d_obj is None or not start_date <= d_obj <= end_date:
+            continue
+        if activity and session_activity.upper() != activity.upper():
+            continue
+        text = fields[field].strip() if field < len(fields) else ""
+        code = mark_code(text)
+        if code == UNKNOWN:
+            continue
+        counts[code] += 1
+        history.append({'Date': d_str, 'Activity': session_activity, 'Mark': text})
+        if code == ABSENT:
+            absences.append(f"{d_str} ({session_activity})")
+
+    eligible = counts[PRESENT] + counts[LATE] + counts[ABSENT]
+    return {
+        'Level': level_rows.level,
+        'Surname': fields[0].strip() if fields else "",
+        'Firstname': fields[1].strip() if len(fields) > 1 else "",
+        'Matric NO': normalize_matric(fields[2]) if len(fields) > 2 else "",
+        'Sessions': len(history),
+        'Present': counts[PRESENT],
+        'Late': counts[LATE],
+        'Absent': counts[ABSENT],
+        'Excused': counts[EXCUSED],
+        'Percent': round(100.0 * (counts[PRESENT] + counts[LATE]) / eligible, 1) if eligible else None,
+        'Absent Dates': ", ".join(absences),
+        'History': history,
+    }
+
+
+def _level_cards(level_rows, line_numbers, start_date, end_date, activity) -> list[dict]:
+    """Cards for several students of one level, keeping the file open across seeks."""
+    rows = level_rows.lines.read_rows(line_numbers)
+    return [_card(level_rows, rows[n], start_date, end_date, activity) for n in line_numbers]
+
+
+matric_index = MatricIndex()
+
+
+def history_card(matric, start_date=date.min, end_date=date.max, activity=None, index=None) -> list[dict]:
+    """History card of one student, one per level they appear in ([] for an unknown matric)."""
+    index = index or matric_index
+    with tracing.span("history_card"):
+        return [index.level_rows(path).card(line_no, start_date, end_date, activity)
+                for path, line_no in index.locate(matric)]
+
+
+def history_cards(matrics, start_date=date.min, end_date=date.max, activity=None,
+                  index=None) -> tuple[list[dict], list[str]]:
+    """
+    History cards for a list of matrics, in the order given, and the matrics that were not found.
+    Each level's students are read in one pass over its file.
+    """
+    index = index or matric_index
+    index.refresh()
+    wanted, missing = [], []
+    by_level: dict[str, list[int]] = {}
+    for matric in dict.fromkeys(matric_key(m) for m in matrics if str(m).strip()):
+        locations = index.locate(matric, refresh=False)
+        if not locations:
+            missing.append(matric)
+        for path, line_no in locations:
+            wanted.append((path, line_no))
+            by_level.setdefault(path, []).append(line_no)
+
+    paths = list(by_level)
+    with tracing.span("history_cards", cards=len(wanted), levels=len(paths)):
+        results = [_level_cards(index.level_rows(p), by_level[p], start_date, end_date, activity) for p in paths]
+
+    found = {}
+    for path, cards in zip(paths, results):
+        for line_no, card in zip(by_level[path], cards):
+            found[(path, line_no)] = card
+    return [found[location] for location in wanted], missing
+
+
+def format_card(card) -> str:
+    """The card as printable text."""
+    percent = "-" if card['Percent'] is None else f"{card['Percent']}%"
+    return "\n".join([
+        f"Student: {card['Surname']} {card['Firstname']}",
+        f"Matric NO: {card['Matric NO']}    Level: {card['Level']}",
+        f"Sessions: {card['Sessions']}    Present: {card['Present']}    Late: {card['Late']}"
+        f"    Excused: {card['Excused']}    Attendance: {percent}",
+        f"Total Absent: {card['Absent']}",
+        f"Dates: {card['Absent Dates'] or 'None'}",
+    ])
+
+
+@tracing.traced("export_history_cards")
+def save_history_cards(cards, save_path) -> bool:
+    """
+    Writes the cards as a text document (.txt) or a workbook with a summary sheet
+    and every student's marks session by session.
+    """
+    try:
+        if save_path.endswith(".txt"):
+            with open(save_path, "w", encoding="utf-8") as f:
+                f.write("\n\n".join(format_card(card) for card in cards) + "\n")
+            return True
+        summary = pd.DataFrame([{k: v for k, v in card.items() if k != 'History'} for card in cards])
+        history = pd.DataFrame([{'Level': card['Level'], 'Surname': card['Surname'], 'Firstname': card['Firstname'],
+                                 'Matric NO': card['Matric NO'], **session}
+                                for card in cards for session in card['History']])
+        with pd.ExcelWriter(save_path) as writer:
+            summary.to_excel(writer, sheet_name="Summary", index=False)
+            history.to_excel(writer, sheet_name="History", index=False)
+        apply_excel_styling(save_path)
+        return True
+    except Exception as e:
+        print(f"Error saving history cards: {e}")
+        return False
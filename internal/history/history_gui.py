@@ -0,0 +1,137 @@
+import customtkinter as ctk
+import os
+import re
+from datetime import date
+from tkinter import messagebox, filedialog
+from internal.attendance.create.create_func import _get_external_matrics
+from internal.calender import CalendarDialog
+from internal.resultview import ResultView
+from internal.history.history_func import format_card, history_cards, matric_index, save_history_cards
+from internal.records.records_func import get_session_index
+from internal.utils.general import get_target_dir
+from internal.windowcache import ReusableWindow
+
+
+class HistoryCardWindow(ctk.CTkToplevel, ReusableWindow):
+    """
+    Student History Card: total absences and the dates missed for one matric,
+    or for a batch of matrics typed in or loaded from a CSV.
+    """
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.start_date = None
+        self.end_date = None
+        self.current_cards = []
+
+        self.title("Student History")
+        self.geometry("760x680")
+
+        ctk.CTkLabel(self, text="Student History Card", font=("Arial", 20, "bold")).pack(pady=10)
+
+        # Matric search
+        frame_search = ctk.CTkFrame(self, fg_color="transparent")
+        frame_search.pack(pady=5)
+        self.matric_entry = ctk.CTkEntry(frame_search, width=320, placeholder_text="Matric NO (several: separate with commas)")
+        self.matric_entry.pack(side="left", padx=5)
+        self.matric_entry.bind("<Return>", lambda e: self._run())
+        ctk.CTkButton(frame_search, text="Show", width=80, command=self._run).pack(side="left", padx=5)
+        ctk.CTkButton(frame_search, text="Load List (CSV)", command=self._load_list).pack(side="left", padx=5)
+
+        ctk.CTkButton(self, text="Select Date Range", command=self._select_date_range).pack(pady=5)
+        self.lbl_date_range = ctk.CTkLabel(self, text="Range: All sessions")
+        self.lbl_date_range.pack(pady=5)
+
+        self.textbox = ResultView(self, width=700, height=380)
+        self.textbox.pack(pady=10, fill="both", expand=True)
+
+        self.btn_export = ctk.CTkButton(self, text="Export", command=self._export, state="disabled")
+        self.btn_export.pack(pady=5)
+        ctk.CTkButton(self, text="Back to Menu", command=self.close_window).pack(pady=(5, 15))
+        self.protocol("WM_DELETE_WINDOW", self.close_window)
+
+    def refresh(self):
+        """Shows the cards again with the current marks."""
+        if self.current_cards:
+            self._run()
+
+    def show_matric(self, matric):
+        """Fills in matric and shows its card."""
+        self.matric_entry.delete(0, "end")
+        self.matric_entry.insert(0, str(matric))
+        self._run()
+
+    def _matrics(self):
+        return [m for m in re.split(r"[,;\s]+", self.matric_entry.get()) if m]
+
+    def _load_list(self):
+        path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")], title="Select a list of matric numbers")
+        if not path:
+            return
+        matrics = _get_external_matrics(path)
+        if not matrics:
+            messagebox.showwarning("No Matrics", "No matric numbers found in that file.")
+            return
+        self.matric_entry.delete(0, "end")
+        self.matric_entry.insert(0, ", ".join(matrics))
+        self._run()
+
+    def _select_date_range(self):
+        merged = {}
+        for path in matric_index.files():
+            for d_obj, sessions in get_session_index(path).items():
+                merged.setdefault(d_obj, []).extend(sessions)
+        cal = CalendarDialog.open(self, selection_mode="range", session_index=merged)
+        cal.wait()
+        selection = cal.get_selection()
+        if selection and selection[0] and selection[1]:
+            self.start_date, self.end_date = selection
+            self.lbl_date_range.configure(text=f"Range: {self.start_date.strftime('%d/%m/%y')} - {self.end_date.strftime('%d/%m/%y')}")
+        elif selection and selection[0]:
+            self.start_date = self.end_date = selection[0]
+            self.lbl_date_range.configure(text=f"Range: {self.start_date.strftime('%d/%m/%y')} (Single Day)")
+
+    def _run(self):
+        matrics = self._matrics()
+        if not matrics:
+            messagebox.showwarning("No Matric", "Type a matric number.")
+            return
+        self.textbox.show_message("Loading...")
+        self.update()
+        self.current_cards, missing = history_cards(matrics, self.start_date or date.min, self.end_date or date.max)
+
+        lines = []
+        for card in self.current_cards:
+            lines.extend(format_card(card).splitlines())
+            lines.append("-" * 90)
+        lines.extend(f"No student with matric {m}" for m in missing)
+        if lines:
+            self.textbox.set_lines(lines)
+        else:
+            self.textbox.show_message("No students found.")
+        self.btn_export.configure(state="normal" if self.current_cards else "disabled")
+
+    def _export(self):
+        if not self.current_cards:
+            return
+        if len(self.current_cards) == 1:
+            card = self.current_cards[0]
+            name, level_name = f"{card['Matric NO']}_HISTORY", card['Level'].upper()
+        else:
+            name, level_name = f"{len(self.current_cards)}_STUDENTS_HISTORY", "ALL_LEVELS"
+        save_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel Files", "*.xlsx"), ("Text Document", "*.txt")],
+            initialfile=f"{name}.xlsx",
+            title="Export History Cards",
+            initialdir=get_target_dir(level_name, "HISTORY")
+        )
+        if save_path:
+            if save_history_cards(self.current_cards, save_path):
+                messagebox.showinfo("Success", f"Exported to {os.path.basename(save_path)}")
+            else:
+                messagebox.showerror("Export Error", "Failed to export the history cards.")
+
+    def close_window(self):
+        self.parent.deiconify()
+        self.close()
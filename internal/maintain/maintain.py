@@ -4,19 +4,12 @@ import csv
 import json
 from pathlib import Path
 from datetime import datetime
+from internal.utils.general import _get_documents_folder
+from internal.utils import events, tracing
 #Self Explantory
 EXPECTED_HEADER = ["Surname", "Firstname", "Matric NO"]
 attendance_dir = os.path.join(os.path.dirname(__file__), "..", "..", "db", "allstudents")
 
-def _get_documents_folder() -> Path:
-    """
-    Attempts to find the user's "Documents" folder in Widows.
-    Who tf in MTU uses Linux NOBODY not even me YET>>>.
-    """
-    # Windows typically stores Documents under the USERPROFILE directory.
-    return Path(os.environ['USERPROFILE']) / "Documents"
-
-
 # def _validate_csv_header(file_path: Path) -> bool:
 #     """
 #     Validates if the first row (header) of a given CSV file matches the EXPECTED_HEADER.
@@ -38,43 +31,88 @@ def _get_documents_folder() -> Path:
 #         return False
 
 # ==============================================================
-def perform_daily_backup():
+def get_backup_root() -> Path:
+    """
+    Returns the MTU_BACKUP folder: AppData/Roaming on Windows, ~/.config elsewhere.
+    """
+    if os.name == 'nt':
+        app_data = os.getenv('APPDATA')
+        app_data = Path(app_data) if app_data else Path.home() / "AppData" / "Roaming"
+    else:
+        app_data = Path.home() / ".config"
+    return app_data / "MTU_BACKUP"
+
+def _backup_date(backup_dir: Path):
+    try:
+        return datetime.strptime(backup_dir.name, "%d-%m-%Y")
+    except ValueError:
+        return datetime.min
+
+def list_backups() -> list[Path]:
+    """Backup folders, newest first."""
+    backup_root = get_backup_root()
+    if not backup_root.exists():
+        return []
+    return sorted([d for d in backup_root.iterdir() if d.is_dir()], key=lambda x: (_backup_date(x), x.name), reverse=True)
+
+def perform_daily_backup(force: bool = False) -> Path | None:
     """
     Creates a daily backup of the 'db' directory to the user's AppData/Roaming/MTU_BACKUP folder.
     This ensures we have a recovery point for every day the application is used.
+    With force=True today's backup is replaced. Returns the backup folder, or None if nothing was copied.
     """
-try:
-    #GEt app data location on windows
-    app_data = os.getenv('APPDATA')
-    
-    app_data_path = Path(app_data)
-    backup_root = app_data_path / "MTU_BACKUP"
-
-    #Ensuring that the flder exists
-
-    backup_root.mkdir(parents=True, exist_ok= True)
-
-    today_str = datetime.now().strftime("%d-%m-%Y")
-
-    
-    today_backup_path  =  backup_root / today_str
-    
-    #If the today_backup folder does not exist 
-    if not today_backup_path.exists():
-        print(f"Creatng backup today at {today_backup_path}")
-        
-
-        source = Path("db")
-        #Create it 
-        if source.exists():
-            shutil.copytree(source ,today_backup_path)
-            print("Daily backup successful")
+    try:
+        backup_root = get_backup_root()
+
+        #Ensuring that the flder exists
+        backup_root.mkdir(parents=True, exist_ok= True)
+
+        today_str = datetime.now().strftime("%d-%m-%Y")
+        today_backup_path  =  backup_root / today_str
+
+        if force and today_backup_path.exists():
+            shutil.rmtree(today_backup_path)
+
+        #If the today_backup folder does not exist 
+        if not today_backup_path.exists():
+            print(f"Creatng backup today at {today_backup_path}")
+
+            source = Path("db")
+            #Create it 
+            if source.exists():
+                with tracing.span("daily_backup", dest=today_backup_path):
+                    shutil.copytree(source ,today_backup_path)
+                print("Daily backup successful")
+                return today_backup_path
+            else:
+                print(f"Error copying file to  {today_backup_path}")
         else:
-            print(f"Error copying file to  {today_backup_path}")
-    else:
-        print(f"Backup skipped: Folder for today already exists.")
-except Exception as e:
-    print(f"Error performing daily backup: {e}")
+            print(f"Backup skipped: Folder for today already exists.")
+    except Exception as e:
+        print(f"Error performing daily backup: {e}")
+    return None
+
+def restore_backup(backup_dir: Path):
+    """
+    Replaces the 'db' folder with the backup in backup_dir. Daily backups are a copy of
+    'db' itself; a backup holding a 'db' folder is restored from that folder.
+    Raises FileNotFoundError if the backup holds no attendance data.
+    """
+    current_db = Path("db")
+    backup_db_source = Path(backup_dir) / "db"
+    if not backup_db_source.exists():
+        backup_db_source = Path(backup_dir)
+    if not (backup_db_source / "attendance").exists() and not (backup_db_source / "allstudents").exists():
+        raise FileNotFoundError("Backup is corrupted: no attendance data inside backup.")
+
+    with tracing.span("restore_backup", source=backup_db_source):
+        # 1. Remove current 'db' folder
+        if current_db.exists():
+            shutil.rmtree(current_db)
+
+        # 2. Copy backup 'db' folder to current location
+        shutil.copytree(backup_db_source, current_db)
+    events.publish(events.FILE_REWRITTEN, None)
 
         
 def create_attendance_mtu():
@@ -135,8 +173,9 @@ def maintain_student_data_files():
     external_data_dir = documents_path / "MTU-STUDENT-DATA"
     external_data_dir.mkdir(parents=True, exist_ok= True)
 
-    for internal_file_path in internal_data_dir.glob("*.csv"):
-        shutil.copy2(internal_file_path, external_data_dir)
+    with tracing.span("sync_student_data", dest=external_data_dir):
+        for internal_file_path in internal_data_dir.glob("*.csv"):
+            shutil.copy2(internal_file_path, external_data_dir)
     
 
     
@@ -2,7 +2,16 @@ import os
 import csv
 import glob
 from datetime import datetime
+from internal.utils import events, tracing
 
+# Order of activities within a day, used when sorting session columns
+PROGRAM_ORDER = [
+    "MORNING SERVICE", "EVENING SERVICE", "MANNA WATER", 
+    "SUNDAY SERVICE", "HOUSE FELLOWSHIP", "BIBLE STUDY", 
+    "PMCH", "MTU PRAYS", "SPECIAL SERVICE"
+]
+
+@tracing.traced()
 def prepare_attendance_files():
     """
     Processes student list CSV files from 'db/allstudents' and creates or updates
@@ -49,11 +58,13 @@ def prepare_attendance_files():
                     for student_row in source_students.values():
                         writer.writerow(student_row)
                 print(f"Created new attendance sheet: {file_name}")
+                events.publish(events.FILE_REWRITTEN, destination_file_path)
                 continue # Move to the next file
 
             # --- If destination file exists, check structure and append new students ---
             # We use 'r' to read everything first
-            with open(destination_file_path, mode='r', newline='', encoding='utf-8') as infile:
+            with open(destination_file_path, mode='r', newline='', encoding='utf-8') as infile, \
+                    tracing.span("read_sheet", file=destination_file_path, bytes=lambda: tracing.file_size(destination_file_path)):
                 lines = list(csv.reader(infile))
 
             has_activity = False
@@ -100,6 +111,7 @@ def prepare_attendance_files():
                 
                 if new_students_to_add:
                     print(f"Also appended {len(new_students_to_add)} new students to: {file_name}")
+                events.publish(events.FILE_REWRITTEN, destination_file_path)
     
             else:
                 # File structure is good, just append new students if any
@@ -109,30 +121,28 @@ def prepare_attendance_files():
                         for student_row in new_students_to_add:
                             writer.writerow(student_row)
                     print(f"Appended {len(new_students_to_add)} new students to: {file_name}")
+                    events.publish(events.ROSTER_CHANGED, destination_file_path, added=new_students_to_add)
                 else:
                     print(f"No new students to add to: {file_name}")
 
         except Exception as e:
             print(f"Error processing file {source_file_path}: {e}")
 
+@tracing.traced()
 def sort_attendance_files():
     """
     Sorts the activity columns in each attendance CSV file based on date
     and a predefined program priority.
     """
     attendance_dir = os.path.join("db", "attendance")
-    PROGRAM_ORDER = [
-        "MORNING SERVICE", "EVENING SERVICE", "MANNA WATER", 
-        "SUNDAY SERVICE", "HOUSE FELLOWSHIP", "BIBLE STUDY", 
-        "PMCH", "MTU PRAYS", "SPECIAL SERVICE"
-    ]
     activity_priority = {act.upper(): i for i, act in enumerate(PROGRAM_ORDER)}
 
     files = glob.glob(os.path.join(attendance_dir, "*.csv"))
     
     for file_path in files:
         try:
-            with open(file_path, mode='r', newline='', encoding='utf-8') as f:
+            with open(file_path, mode='r', newline='', encoding='utf-8') as f, \
+                    tracing.span("read_sheet", file=file_path, bytes=lambda: tracing.file_size(file_path)):
                 reader_list = list(csv.reader(f))
             
             if len(reader_list) < 4:
@@ -207,10 +217,15 @@ def sort_attendance_files():
                     new_row.append(val)
                 new_rows.append(new_row)
             
-            with open(file_path, mode='w', newline='', encoding='utf-8') as f:
+            with open(file_path, mode='w', newline='', encoding='utf-8') as f, \
+                    tracing.span("write_sheet", file=file_path, rows=len(new_rows)):
                 writer = csv.writer(f)
                 writer.writerows(new_rows)
             print(f"Sorted attendance activities in: {os.path.basename(file_path)}")
+
+            # Columns only moved if the order (or the set of columns) is different now
+            if [meta['col_idx'] for meta in sorted_metadata] != list(range(start_col, max_cols)):
+                events.publish(events.FILE_REWRITTEN, file_path)
             
         except Exception as e:
             print(f"Error sorting file {file_path}: {e}")
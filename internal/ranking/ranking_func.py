@@ -0,0 +1,127 @@
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from internal.frequency.freq_func import ABSENT_MARKS, PRESENT_MARKS
+from internal.records.records_func import get_attendance_matrix
+from internal.utils import tracing
+from internal.utils.excel_styler import apply_excel_styling
+
+# Late still counts as attended; excused sessions are left out of the student's eligible sessions
+ATTENDED_MARKS = PRESENT_MARKS + ['L', 'Late']
+ELIGIBLE_MARKS = ATTENDED_MARKS + ABSENT_MARKS
+
+
+class AttendanceRates:
+    """
+    Attended and eligible session counts of every student in one or more levels, as parallel arrays.
+    A student's eligible sessions are the ones in the range where they were marked present, late or absent,
+    so students who joined late are not ranked down for sessions before they joined.
+    """
+    def __init__(self, roster, attended, eligible):
+        self.roster = roster     # [{'Level', 'Surname', 'Firstname', 'Matric NO'}]
+        self.levels = np.array([row['Level'] for row in roster], dtype=str)
+        self.attended = np.asarray(attended, dtype=np.int64)
+        self.eligible = np.asarray(eligible, dtype=np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.percent = np.where(self.eligible > 0, 100.0 * self.attended / self.eligible, np.nan)
+
+    def __len__(self):
+        return len(self.roster)
+
+    def score(self, metric="percent") -> np.ndarray:
+        return self.percent if metric == "percent" else self.attended.astype(np.float64)
+
+    def rows(self, indices) -> list[dict]:
+        """Report rows for the students at indices, ranked in that order."""
+        return [dict({'Rank': position}, **self.roster[i], Attended=int(self.attended[i]), Eligible=int(self.eligible[i]),
+                     Percent=round(float(self.percent[i]), 1) if self.eligible[i] else None)
+                for position, i in enumerate(indices, start=1)]
+
+
+def attendance_rates(file_paths, start_date=date.min, end_date=date.max) -> AttendanceRates:
+    """Counts attended and eligible sessions from each level's cached matrix, both in one pass over the level."""
+    roster, attended, eligible = [], [], []
+    with tracing.span("attendance_rates", levels=len(file_paths)):
+        for file_path in file_paths:
+            matrix = get_attendance_matrix(str(file_path))
+            if matrix is None:
+                continue
+            level = os.path.splitext(os.path.basename(str(file_path)))[0]
+            sessions = matrix.session_mask(start_date, end_date)
+            roster.extend({'Level': level, **student} for student in matrix.roster())
+            attended.append(matrix.count(ATTENDED_MARKS, sessions))
+            eligible.append(matrix.count(ELIGIBLE_MARKS, sessions))
+    if not roster:
+        return AttendanceRates([], [], [])
+    return AttendanceRates(roster, np.concatenate(attended), np.concatenate(eligible))
+
+
+def _candidates(rates, min_eligible, level=None) -> np.ndarray:
+    mask = rates.eligible >= max(min_eligible, 1)
+    if level is not None:
+        mask &= rates.levels == level
+    return np.flatnonzero(mask)
+
+
+def top_k(rates, k, metric="percent", min_eligible=1, level=None) -> np.ndarray:
+    """
+    Indices of the k best students by metric ('percent' or 'count'), best first.
+    Only the k are sorted: the rest are split off with one argpartition. Ties go to more sessions attended.
+    """
+    candidates = _candidates(rates, min_eligible, level)
+    if k <= 0 or len(candidates) == 0:
+        return np.array([], dtype=np.intp)
+    score = rates.score(metric)[candidates]
+    if k < len(candidates):
+        # Everything scoring at least the k-th best, so ties at the cut are decided by the sort below
+        kth = score[np.argpartition(-score, k - 1)[k - 1]]
+        candidates = candidates[score >= kth]
+        score = score[score >= kth]
+    order = np.lexsort((-rates.attended[candidates], -score))
+    return candidates[order][:k]
+
+
+def below_threshold(rates, threshold, metric="percent", min_eligible=1, level=None) -> np.ndarray:
+    """Indices of the students scoring under threshold, worst first, in one pass over the arrays."""
+    candidates = _candidates(rates, min_eligible, level)
+    score = rates.score(metric)[candidates]
+    below = candidates[score < threshold]
+    return below[np.lexsort((rates.attended[below], rates.score(metric)[below]))]
+
+
+def ranking_report(file_paths, start_date=date.min, end_date=date.max, top=None, below=None,
+                   metric="percent", per_level=False, min_eligible=1) -> list[dict]:
+    """
+    Top `top` students, or everyone under `below`, across the given levels or (per_level) within each.
+    Rows: Rank, Level, Surname, Firstname, Matric NO, Attended, Eligible, Percent.
+    """
+    rates = attendance_rates(file_paths, start_date, end_date)
+    levels = [os.path.splitext(os.path.basename(str(p)))[0] for p in file_paths] if per_level else [None]
+    rows = []
+    for level in levels:
+        if top is not None:
+            chosen = top_k(rates, top, metric, min_eligible, level)
+        else:
+            chosen = below_threshold(rates, below, metric, min_eligible, level)
+        rows.extend(rates.rows(chosen))
+    return rows
+
+
+@tracing.traced("export_ranking")
+def save_ranking_report(rows, save_path, per_level=False) -> bool:
+    """Writes the ranking to a styled workbook, plus a sheet per level for a per level ranking."""
+    try:
+        df = pd.DataFrame(rows)
+        with pd.ExcelWriter(save_path) as writer:
+            df.to_excel(writer, sheet_name="Ranking", index=False)
+            if per_level and not df.empty:
+                for level, level_df in df.groupby('Level', sort=False):
+                    level_df.to_excel(writer, sheet_name=str(level)[:31], index=False)
+        apply_excel_styling(save_path)
+        return True
+    except Exception as e:
+        print(f"Error saving ranking: {e}")
+        return False
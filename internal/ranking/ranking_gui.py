@@ -0,0 +1,164 @@
+import customtkinter as ctk
+import glob
+import os
+from datetime import date
+from tkinter import messagebox, filedialog
+from internal.calender import CalendarDialog
+from internal.resultview import ResultView
+from internal.records.records_func import get_session_index
+from internal.ranking.ranking_func import ranking_report, save_ranking_report
+from internal.utils.general import get_target_dir
+from internal.windowcache import ReusableWindow
+
+ALL_LEVELS = "All levels"
+TOP = "Top attendees"
+BELOW = "Below threshold"
+
+
+class RankingWindow(ctk.CTkToplevel, ReusableWindow):
+    """
+    Top k attendees (for awards) or everyone under a percentage (for warnings),
+    in one level or across all of them. Percentages are of each student's eligible sessions.
+    """
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.attendance_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "db", "attendance"))
+        self.start_date = None
+        self.end_date = None
+        self.current_data = []
+        self.current_per_level = False
+
+        self.title("Attendance Ranking")
+        self.geometry("760x700")
+
+        ctk.CTkLabel(self, text="Attendance Ranking", font=("Arial", 20, "bold")).pack(pady=10)
+
+        # Scope and range
+        frame_scope = ctk.CTkFrame(self, fg_color="transparent")
+        frame_scope.pack(pady=5)
+        self.level_var = ctk.StringVar(value=ALL_LEVELS)
+        self.level_menu = ctk.CTkOptionMenu(frame_scope, variable=self.level_var, values=[ALL_LEVELS])
+        self.level_menu.pack(side="left", padx=5)
+        self.per_level_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(frame_scope, text="Rank each level separately", variable=self.per_level_var).pack(side="left", padx=10)
+        ctk.CTkButton(frame_scope, text="Select Date Range", command=self._select_date_range).pack(side="left", padx=5)
+        self.lbl_date_range = ctk.CTkLabel(self, text="Range: All sessions")
+        self.lbl_date_range.pack(pady=5)
+
+        # What to list
+        frame_mode = ctk.CTkFrame(self, fg_color="transparent")
+        frame_mode.pack(pady=5)
+        self.mode_var = ctk.StringVar(value=TOP)
+        ctk.CTkSegmentedButton(frame_mode, values=[TOP, BELOW], variable=self.mode_var,
+                               command=self._on_mode).pack(side="left", padx=5)
+        self.lbl_value = ctk.CTkLabel(frame_mode, text="How many:")
+        self.lbl_value.pack(side="left", padx=(10, 5))
+        self.value_entry = ctk.CTkEntry(frame_mode, width=60)
+        self.value_entry.insert(0, "20")
+        self.value_entry.pack(side="left")
+        ctk.CTkLabel(frame_mode, text="Min. sessions:").pack(side="left", padx=(10, 5))
+        self.min_entry = ctk.CTkEntry(frame_mode, width=50)
+        self.min_entry.insert(0, "1")
+        self.min_entry.pack(side="left")
+
+        ctk.CTkButton(self, text="Rank", command=self._run).pack(pady=10)
+
+        self.textbox = ResultView(self, width=700, height=360)
+        self.textbox.pack(pady=10, fill="both", expand=True)
+
+        self.btn_export = ctk.CTkButton(self, text="Export to Excel", command=self._export, state="disabled")
+        self.btn_export.pack(pady=5)
+        ctk.CTkButton(self, text="Back to Menu", command=self.close_window).pack(pady=(5, 15))
+        self.protocol("WM_DELETE_WINDOW", self.close_window)
+
+        self.refresh()
+
+    def refresh(self):
+        """Lists the level files again, in case one was added."""
+        levels = [os.path.splitext(os.path.basename(p))[0] for p in sorted(glob.glob(os.path.join(self.attendance_dir, "*.csv")))]
+        self.level_menu.configure(values=[ALL_LEVELS] + levels)
+        if self.level_var.get() not in levels:
+            self.level_var.set(ALL_LEVELS)
+
+    def _files(self):
+        level = self.level_var.get()
+        if level == ALL_LEVELS:
+            return sorted(glob.glob(os.path.join(self.attendance_dir, "*.csv")))
+        return [os.path.join(self.attendance_dir, f"{level}.csv")]
+
+    def _on_mode(self, mode):
+        self.lbl_value.configure(text="How many:" if mode == TOP else "Under %:")
+        self.value_entry.delete(0, "end")
+        self.value_entry.insert(0, "20" if mode == TOP else "60")
+
+    def _select_date_range(self):
+        merged = {}
+        for path in self._files():
+            for d_obj, sessions in get_session_index(path).items():
+                merged.setdefault(d_obj, []).extend(sessions)
+        cal = CalendarDialog.open(self, selection_mode="range", session_index=merged)
+        cal.wait()
+        selection = cal.get_selection()
+        if selection and selection[0] and selection[1]:
+            self.start_date, self.end_date = selection
+            self.lbl_date_range.configure(text=f"Range: {self.start_date.strftime('%d/%m/%y')} - {self.end_date.strftime('%d/%m/%y')}")
+        elif selection and selection[0]:
+            self.start_date = self.end_date = selection[0]
+            self.lbl_date_range.configure(text=f"Range: {self.start_date.strftime('%d/%m/%y')} (Single Day)")
+
+    def _run(self):
+        top = self.mode_var.get() == TOP
+        try:
+            value = int(self.value_entry.get()) if top else float(self.value_entry.get())
+            min_eligible = int(self.min_entry.get())
+            if value <= 0 or min_eligible < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showwarning("Invalid Number", "Enter a positive number of students or percentage.")
+            return
+        files = self._files()
+        if not files:
+            messagebox.showwarning("No Files", f"No attendance files in {self.attendance_dir}")
+            return
+
+        self.textbox.show_message("Ranking...")
+        self.update()
+        self.current_per_level = self.per_level_var.get() and len(files) > 1
+        self.current_data = ranking_report(files, self.start_date or date.min, self.end_date or date.max,
+                                           top=value if top else None, below=None if top else value,
+                                           per_level=self.current_per_level, min_eligible=min_eligible)
+        self._render()
+
+    def _render(self):
+        if not self.current_data:
+            self.textbox.show_message("No students match.")
+            self.btn_export.configure(state="disabled")
+            return
+        header = "RANK\tLEVEL\tSURNAME\tFIRSTNAME\tMATRIC NO\tATTENDED\tPERCENT\n" + "-" * 90
+        lines = [f"{r['Rank']}\t{r['Level']}\t{r['Surname']}\t{r['Firstname']}\t{r['Matric NO']}"
+                 f"\t{r['Attended']}/{r['Eligible']}\t{r['Percent']}%" for r in self.current_data]
+        self.textbox.set_lines(lines, header=header)
+        self.btn_export.configure(state="normal")
+
+    def _export(self):
+        if not self.current_data:
+            return
+        level_name = self.level_var.get().upper().replace(" ", "_")
+        kind = "TOP" if self.mode_var.get() == TOP else "BELOW"
+        save_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel Files", "*.xlsx")],
+            initialfile=f"{level_name}_{kind}_{self.value_entry.get()}_RANKING.xlsx",
+            title="Export Ranking",
+            initialdir=get_target_dir(level_name, "RANKING")
+        )
+        if save_path:
+            if save_ranking_report(self.current_data, save_path, per_level=self.current_per_level):
+                messagebox.showinfo("Success", f"Exported to {os.path.basename(save_path)}")
+            else:
+                messagebox.showerror("Export Error", "Failed to export the ranking.")
+
+    def close_window(self):
+        self.parent.deiconify()
+        self.close()
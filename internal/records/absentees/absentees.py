@@ -1,5 +1,6 @@
 from internal.records.records_gui import ChooseRecordFileWindow
+from internal.records.records_func import ABSENTEE_MARKS
 
 class ChooseAbsenteeFileWindow(ChooseRecordFileWindow):
     def __init__(self, master):
-        super().__init__(master, record_type="Absentees", target_marks=['x', 'X', '✗'], export_prefix="ABSENTEES")
+        super().__init__(master, record_type="Absentees", target_marks=ABSENTEE_MARKS, export_prefix="ABSENTEES")
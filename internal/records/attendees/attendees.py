@@ -1,5 +1,6 @@
 from internal.records.records_gui import ChooseRecordFileWindow
+from internal.records.records_func import ATTENDEE_MARKS
 
 class ChooseAttendeesFileWindow(ChooseRecordFileWindow):
     def __init__(self, master):
-        super().__init__(master, record_type="Attendees", target_marks=['✓'], export_prefix="ATTENDEES")
+        super().__init__(master, record_type="Attendees", target_marks=ATTENDEE_MARKS, export_prefix="ATTENDEES")
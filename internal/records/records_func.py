@@ -1,19 +1,63 @@
 import csv
 import pandas as pd
 import os
+from datetime import datetime
+from internal.utils.file_cache import file_cache
+from internal.utils import tracing
+from internal.utils.attendance_matrix import AttendanceMatrix
+from internal.utils.bitmap_index import SessionBitmapIndex
+
+# Marks the attendees and absentees reports look for
+ATTENDEE_MARKS = ['✓']
+ABSENTEE_MARKS = ['x', 'X', '✗']
 
 def load_attendance_file(file_path):
     """
     Loads the attendance CSV in a raw format suitable for processing.
     """
     try:
-        # Read with dummy headers to capture all structure
-        df = pd.read_csv(file_path, names=[str(i) for i in range(50)], dtype=str, on_bad_lines='skip')
+        # Read with dummy headers to capture all structure. At least 50 so columns '0'..'49'
+        # always exist, more when a semester has more sessions than that.
+        with tracing.span("parse_attendance_frame", file=file_path, bytes=lambda: tracing.file_size(file_path)) as s:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                width = max((line.count(',') + 1 for line in f), default=0)
+            df = pd.read_csv(file_path, names=[str(i) for i in range(max(50, width))], dtype=str, on_bad_lines='skip')
+            s.set(rows=len(df))
         return df
     except Exception as e:
         print(f"Error loading file: {e}")
         return None
 
+def get_attendance_frame(file_path):
+    """
+    Shared, cached load_attendance_file. Parsed once per file version, so treat the
+    result as read-only and copy it before changing it.
+    """
+    return file_cache.get(file_path, "attendance_frame", load_attendance_file)
+
+def load_attendance_matrix(file_path):
+    """Loads the attendance CSV as an AttendanceMatrix (None if it can't be read)."""
+    return AttendanceMatrix.from_frame(load_attendance_file(file_path), get_session_info(file_path))
+
+def get_attendance_matrix(file_path):
+    """
+    Shared, cached load_attendance_matrix. Parsed once per file version; the arrays are
+    shared, so copy them before changing them.
+    """
+    return file_cache.get(file_path, "attendance_matrix", load_attendance_matrix)
+
+def build_bitmap_index(file_path):
+    """Present/absent bitmaps per session of the file, for set queries across sessions."""
+    matrix = get_attendance_matrix(file_path)
+    if matrix is None:
+        return None
+    with tracing.span("build_bitmap_index", file=file_path, sessions=matrix.marks.shape[1]):
+        return SessionBitmapIndex(matrix)
+
+def get_bitmap_index(file_path):
+    """Shared, cached SessionBitmapIndex for a level file. Re-built only when the file changes."""
+    return file_cache.get(file_path, "bitmap_index", build_bitmap_index)
+
 def get_session_info(file_path):
     """
     Scans a CSV to find unique sessions (Date + Activity pairs).
@@ -59,41 +103,64 @@ def get_session_info(file_path):
 
     return sessions
 
-def extract_records(file_path, col_index, target_marks, df=None):
+def parse_session_date(value):
+    """Parses a session date written as dd/mm/yy or dd/mm/YYYY. Returns a date or None."""
+    if isinstance(value, datetime):
+        return value.date()
+    if hasattr(value, "year") and hasattr(value, "day"):
+        return value
+    for fmt in ("%d/%m/%y", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(str(value).strip(), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+def build_session_index(file_path):
+    """
+    Turns get_session_info into a date -> sessions index.
+    Returns { date: [{'activity': 'Name', 'col_index': int, 'date_str': 'dd/mm/yy'}, ...] }
+    Dates are parsed once here, so callers can look a day up instead of re-parsing every session.
+    """
+    index = {}
+    with tracing.span("build_session_index", file=file_path, bytes=lambda: tracing.file_size(file_path)) as s:
+        for d_str, session_list in get_session_info(file_path).items():
+            d_obj = parse_session_date(d_str)
+            if d_obj is None:
+                continue
+            for session in session_list:
+                index.setdefault(d_obj, []).append(dict(session, date_str=d_str))
+        s.set(days=len(index))
+    return index
+
+def get_session_index(file_path):
+    """Shared, cached session index for a level file. Re-built only when the file changes."""
+    return file_cache.get(file_path, "session_index", build_session_index)
+
+def sessions_in_range(session_index, start_date, end_date):
+    """Yields (date, session) pairs between start_date and end_date (inclusive), oldest first."""
+    for d_obj in sorted(d for d in session_index if start_date <= d <= end_date):
+        for session in session_index[d_obj]:
+            yield d_obj, session
+
+def extract_records(file_path, col_index, target_marks, matrix=None):
     """
     Returns a list of students marked with any of the target_marks in the specified column.
+    Pass the file's AttendanceMatrix when extracting several sessions, so it is loaded once.
     """
     try:
-        if df is None:
-            df = load_attendance_file(file_path)
+        if matrix is None:
+            matrix = get_attendance_matrix(file_path)
         
-        if df is None: return None
+        if matrix is None: return None
 
-        local_df = df.copy()
-        if len(local_df.columns) < 3: 
-            return []
-            
-        local_df.rename(columns={'0': 'Surname', '1': 'Firstname', '2': 'Matric NO'}, inplace=True)
-        
-        mask_valid_rows = ~local_df['Surname'].str.upper().isin(['DATE', 'ACTIVITY', 'SURNAME', 'NAN', 'NONE'])
-        mask_valid_rows &= local_df['Surname'].notna()
-        
-        clean_df = local_df[mask_valid_rows].copy()
-        
-        target_col = str(col_index)
-        if target_col not in clean_df.columns:
-            return []
-
-        clean_df[target_col] = clean_df[target_col].astype(str)
-        mask = clean_df[target_col].str.strip().isin(target_marks)
-        records = clean_df[mask]
-        
-        return records[['Surname', 'Firstname', 'Matric NO']].to_dict('records')
+        return matrix.roster(matrix.students_with(col_index, target_marks))
 
     except Exception as e:
         print(f"Error extracting records: {e}")
         return None
 
+@tracing.traced("export_records")
 def save_records(records_data, file_path):
     """Saves the records list to CSV or Excel."""
     try:
@@ -1,14 +1,18 @@
 import customtkinter as ctk
 import os
 import pandas as pd
-from datetime import datetime
 from tkinter import filedialog, messagebox
 from internal.choosecsv import ChooseCSVWindow
-from internal.records.records_func import get_session_info, extract_records, load_attendance_file
+from internal.records.records_func import get_session_index, sessions_in_range, extract_records, get_attendance_matrix, parse_session_date
 from internal.calender import CalendarDialog
+from internal.resultview import ResultView
 from internal.utils.excel_styler import apply_excel_styling
 from internal.utils.general import get_target_dir
+from internal.utils import events, tracing
+from internal.windowcache import ReusableWindow
 class ChooseRecordFileWindow(ChooseCSVWindow):
+    prefetch_loaders = (get_session_index, get_attendance_matrix)
+
     def __init__(self, master, record_type, target_marks, export_prefix):
         self.record_type = record_type
         self.target_marks = target_marks
@@ -21,10 +25,12 @@ class ChooseRecordFileWindow(ChooseCSVWindow):
                          title=f"Select Attendance File for {record_type}")
 
     def open_report(self, file_path):
-        PrintRecordsWindow(self.master, file_path, self.record_type, self.target_marks, self.export_prefix)
+        self.show_window(f"{self.record_type.lower()}:{os.path.abspath(file_path)}",
+                         lambda: PrintRecordsWindow(self.master, file_path, self.record_type,
+                                                    self.target_marks, self.export_prefix))
 
 
-class PrintRecordsWindow(ctk.CTkToplevel):
+class PrintRecordsWindow(ctk.CTkToplevel, ReusableWindow):
     def __init__(self, master, file_path, record_type, target_marks, export_prefix):
         super().__init__(master)
         self.master = master
@@ -34,6 +40,8 @@ class PrintRecordsWindow(ctk.CTkToplevel):
         self.export_prefix = export_prefix
         
         self.current_records = []
+        self.session_results = []   # (date, session, records) shown in the result box, oldest first
+        self.results_shown = False
         self.start_date = None
         self.end_date = None
         
@@ -42,12 +50,14 @@ class PrintRecordsWindow(ctk.CTkToplevel):
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(6, weight=1) 
 
-        self.sessions = get_session_info(self.file_path)
+        self.session_index = get_session_index(self.file_path)
         
         
-        if not self.sessions:
+        if not self.session_index:
             ctk.CTkLabel(self, text="No attendance data found.", text_color="red").grid(row=1, column=0, pady=20)
-            ctk.CTkButton(self, text="Back to Menu", command=self.close_window).grid(row=7, column=0, pady=20)
+            # Not worth keeping: built again next time, when the file may have data
+            ctk.CTkButton(self, text="Back to Menu", command=self.discard_window).grid(row=7, column=0, pady=20)
+            self.protocol("WM_DELETE_WINDOW", self.discard_window)
             return
 
         ctk.CTkLabel(self, text=f"{self.record_type} Report", font=("Arial", 20, "bold")).grid(row=0, column=0, pady=(20, 10))
@@ -68,20 +78,39 @@ class PrintRecordsWindow(ctk.CTkToplevel):
         self.export_btn = ctk.CTkButton(btn_frame, text="Export All", command=self.export_data, state="disabled")
         self.export_btn.pack(side="left", padx=10)
         
-        self.textbox_result = ctk.CTkTextbox(self, width=500, height=400)
+        self.textbox_result = ResultView(self, width=500, height=400)
         self.textbox_result.grid(row=6, column=0, padx=20, pady=(0, 20), sticky="nsew")
-        self.textbox_result.configure(state="disabled")
 
         ctk.CTkButton(self, text="Back to Menu", command=self.close_window).grid(row=7, column=0, pady=20)
 
+        # Keep the results in step with Add Attendance / Correct a Mark while the window is open
+        self._event_handlers = {
+            events.SESSION_ADDED: self._on_session_added,
+            events.MARK_CHANGED: self._on_mark_changed,
+            events.FILE_REWRITTEN: self._on_file_rewritten,
+        }
+        events.subscribe_all(self._event_handlers)
+        self.bind("<Destroy>", lambda e: events.unsubscribe_all(self._event_handlers) if e.widget is self else None, add="+")
+        self.protocol("WM_DELETE_WINDOW", self.close_window)
+
+    def refresh(self):
+        """Looks the sessions up again when the cached window is shown, in case the file changed unannounced."""
+        self.session_index = get_session_index(self.file_path)
+        if self.results_shown:
+            self.show_records()
+
     def close_window(self):
+        self.master.deiconify()
+        self.close()
+
+    def discard_window(self):
         self.master.deiconify()
         self.destroy()
 
     def open_calendar(self):
         mode = "single" if self.mode_var.get() == "Single Date" else "range"
-        cal = CalendarDialog(self, selection_mode=mode)
-        self.wait_window(cal)
+        cal = CalendarDialog.open(self, selection_mode=mode, session_index=self.session_index)
+        cal.wait()
         res = cal.get_selection()
         
         if mode == "single" and res:
@@ -93,58 +122,103 @@ class PrintRecordsWindow(ctk.CTkToplevel):
 
     def show_records(self):
         if not self.start_date or not self.end_date:
-            self.textbox_result.configure(state="normal")
-            self.textbox_result.delete("0.0", "end")
-            self.textbox_result.insert("0.0", "Please select a date first.")
-            self.textbox_result.configure(state="disabled")
+            self.textbox_result.show_message("Please select a date first.")
             return
 
         self.export_btn.configure(state="disabled")
-        self.textbox_result.configure(state="normal")
-        self.textbox_result.delete("0.0", "end")
-        self.textbox_result.insert("0.0", "Processing...\n")
+        self.textbox_result.show_message("Processing...\n")
         self.update()
 
-        self.current_records = []
-        df = load_attendance_file(self.file_path)
-        if df is None:
-             self.textbox_result.insert("end", "\nError loading file.")
-             self.textbox_result.configure(state="disabled")
+        matrix = get_attendance_matrix(self.file_path)
+        if matrix is None:
+             self.textbox_result.show_message("Error loading file.")
              return
 
+        self.session_results = []
+        for dt, act in sessions_in_range(self.session_index, self.start_date, self.end_date):
+            records = extract_records(self.file_path, act['col_index'], self.target_marks, matrix=matrix)
+            self.session_results.append((dt, act, records or []))
+        self.results_shown = True
+        self._render_results()
+
+    def _render_results(self):
+        """Builds the result lines and export rows from session_results."""
+        self.current_records = []
         found_any = False
-        display_text = ""
-        sorted_dates = []
-        for d_str in self.sessions.keys():
-            try:
-                dt = datetime.strptime(d_str, "%d/%m/%y").date()
-                if self.start_date <= dt <= self.end_date:
-                    sorted_dates.append((dt, d_str))
-            except ValueError: pass
-        
-        sorted_dates.sort() 
-        for dt, d_str in sorted_dates:
-            for act in self.sessions[d_str]:
-                records = extract_records(self.file_path, act['col_index'], self.target_marks, df=df)
-                if records:
-                    found_any = True
-                    display_text += f"\n--- {d_str} : {act['activity']} (Total: {len(records)}) ---\n"
-                    for person in records:
-                        person['Date'], person['Activity'] = d_str, act['activity']
-                        self.current_records.append(person)
-                        display_text += f"{person['Surname']} {person['Firstname']} ({person['Matric NO']})\n"
-                else:
-                    display_text += f"\n--- {d_str} : {act['activity']} (No {self.record_type}) ---\n"
+        # Collect lines in a list; the view streams them in batches so big results don't freeze the UI
+        display_lines = []
+        for dt, act, records in self.session_results:
+            d_str = act['date_str']
+            if records:
+                found_any = True
+                display_lines.append(f"\n--- {d_str} : {act['activity']} (Total: {len(records)}) ---")
+                for person in records:
+                    self.current_records.append(dict(person, Date=d_str, Activity=act['activity']))
+                    display_lines.append(f"{person['Surname']} {person['Firstname']} ({person['Matric NO']})")
+            else:
+                display_lines.append(f"\n--- {d_str} : {act['activity']} (No {self.record_type}) ---")
 
         if found_any:
-            self.textbox_result.delete("0.0", "end")
-            header = f"Results for {self.start_date.strftime('%d/%m/%y')}:\n" if self.start_date == self.end_date else f"Results for {self.start_date.strftime('%d/%m/%y')} to {self.end_date.strftime('%d/%m/%y')}:\n"
-            self.textbox_result.insert("0.0", header + display_text)
+            header = f"Results for {self.start_date.strftime('%d/%m/%y')}:" if self.start_date == self.end_date else f"Results for {self.start_date.strftime('%d/%m/%y')} to {self.end_date.strftime('%d/%m/%y')}:"
+            self.textbox_result.set_lines(display_lines, header=header)
             self.export_btn.configure(state="normal")
         else:
-            self.textbox_result.delete("0.0", "end")
-            self.textbox_result.insert("0.0", f"No {self.record_type.lower()} found.")
-        self.textbox_result.configure(state="disabled")
+            self.textbox_result.show_message(f"No {self.record_type.lower()} found.")
+
+    # --- Change notifications ---
+
+    def _is_mine(self, payload):
+        return self.winfo_exists() and payload["file"] in (None, events.event_file(self.file_path))
+
+    def _on_session_added(self, payload):
+        """Adds the new session to the calendar index and, if it falls in the shown range, to the results."""
+        if not self._is_mine(payload):
+            return
+        dt = parse_session_date(payload["date"])
+        if dt is None:
+            return
+        act = {'activity': payload["activity"], 'col_index': payload["field"], 'date_str': payload["date"]}
+        # The index came from the shared cache, so extend a copy
+        index = {d: list(sessions) for d, sessions in self.session_index.items()}
+        index.setdefault(dt, []).append(act)
+        self.session_index = index
+
+        if not self.results_shown or not (self.start_date <= dt <= self.end_date):
+            return
+        records = [{'Surname': surname, 'Firstname': firstname, 'Matric NO': matric}
+                   for surname, firstname, matric, mark in payload["rows"] if mark in self.target_marks]
+        self.session_results.append((dt, act, records))
+        self.session_results.sort(key=lambda item: item[0])
+        self._render_results()
+
+    def _on_mark_changed(self, payload):
+        """Moves students in or out of the shown sessions whose marks were corrected."""
+        if not self._is_mine(payload) or not self.results_shown:
+            return
+        by_col = {act['col_index']: records for _, act, records in self.session_results}
+        changed = False
+        for cell in payload["cells"]:
+            records = by_col.get(cell["field"])
+            if records is None:
+                continue
+            was_listed = cell["old"].strip() in self.target_marks
+            now_listed = cell["new"].strip() in self.target_marks
+            if was_listed and not now_listed:
+                records[:] = [p for p in records if str(p['Matric NO']).strip() != cell["matric"]]
+                changed = True
+            elif now_listed and not was_listed:
+                records.append({'Surname': cell["surname"], 'Firstname': cell["firstname"], 'Matric NO': cell["matric"]})
+                changed = True
+        if changed:
+            self._render_results()
+
+    def _on_file_rewritten(self, payload):
+        """Columns may have moved, so look the sessions up again (from the cache if it is warm)."""
+        if not self._is_mine(payload):
+            return
+        self.session_index = get_session_index(self.file_path)
+        if self.results_shown:
+            self.show_records()
 
     def export_data(self):
         file_name = os.path.basename(self.file_path)
@@ -160,13 +234,14 @@ class PrintRecordsWindow(ctk.CTkToplevel):
             try:
                 df = pd.DataFrame(self.current_records)
                 count = 0
-                for date_str, group_df in df.groupby('Date'):
-                    act_name = group_df.iloc[0]['Activity']
-                    filename = f"{level_name}_{self.export_prefix}_{str(date_str).replace('/', '-')}_{act_name}.xlsx"
-                    full_path = os.path.join(folder_path, filename)
-                    group_df[[c for c in group_df.columns if c not in ['Date', 'Activity']]].to_excel(full_path, index=False)
-                    apply_excel_styling(full_path)
-                    count += 1
+                with tracing.span("export_records", folder=folder_path, rows=len(df)):
+                    for date_str, group_df in df.groupby('Date'):
+                        act_name = group_df.iloc[0]['Activity']
+                        filename = f"{level_name}_{self.export_prefix}_{str(date_str).replace('/', '-')}_{act_name}.xlsx"
+                        full_path = os.path.join(folder_path, filename)
+                        group_df[[c for c in group_df.columns if c not in ['Date', 'Activity']]].to_excel(full_path, index=False)
+                        apply_excel_styling(full_path)
+                        count += 1
                 messagebox.showinfo("Success", f"Exported {count} files.")
             except Exception as e: messagebox.showerror("Error", f"Export failed: {e}")
         else:
@@ -178,9 +253,10 @@ class PrintRecordsWindow(ctk.CTkToplevel):
                 try:
                     df = pd.DataFrame(self.current_records)
                     df = df[[c for c in df.columns if c not in ['Date', 'Activity']]]
-                    if file_path.endswith('.xlsx'):
-                        df.to_excel(file_path, index=False)
-                        apply_excel_styling(file_path)
-                    else: df.to_csv(file_path, index=False)
+                    with tracing.span("export_records", file=file_path, rows=len(df)):
+                        if file_path.endswith('.xlsx'):
+                            df.to_excel(file_path, index=False)
+                            apply_excel_styling(file_path)
+                        else: df.to_csv(file_path, index=False)
                     messagebox.showinfo("Success", f"Saved to {file_path}")
                 except Exception as e: messagebox.showerror("Error", f"Save failed: {e}")
@@ -1,15 +1,18 @@
 import customtkinter as ctk
 import os
 import pandas as pd
-from datetime import datetime
 from tkinter import filedialog, messagebox
 from internal.choosecsv import ChooseCSVWindow
-from internal.records.records_func import get_session_info, extract_records, load_attendance_file
+from internal.records.records_func import get_session_index, sessions_in_range, extract_records, get_attendance_matrix
 from internal.calender import CalendarDialog
+from internal.resultview import ResultView
+from internal.virtuallist import WidgetPool
 from internal.utils.excel_styler import apply_excel_styling
 from internal.utils.general import get_target_dir
 
 class ChooseRecordFileWindow(ChooseCSVWindow):
+    prefetch_loaders = (get_session_index, get_attendance_matrix)
+
     def __init__(self, master, record_type, target_marks, export_prefix):
         self.record_type = record_type
         self.target_marks = target_marks
@@ -44,9 +47,9 @@ class PrintRecordsWindow(ctk.CTkToplevel):
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(7, weight=1) 
 
-        self.sessions = get_session_info(self.file_path)
+        self.session_index = get_session_index(self.file_path)
         
-        if not self.sessions:
+        if not self.session_index:
             ctk.CTkLabel(self, text="No attendance data found.", text_color="red").grid(row=1, column=0, pady=20)
             ctk.CTkButton(self, text="Back to Menu", command=self.close_window).grid(row=8, column=0, pady=20)
             return
@@ -67,6 +70,9 @@ class PrintRecordsWindow(ctk.CTkToplevel):
         
         self.scroll_frame = ctk.CTkScrollableFrame(self, height=120, label_text="Activities")
         self.scroll_frame.grid(row=5, column=0, padx=20, pady=5, sticky="ew")
+        # Checkboxes are reused across date changes instead of destroyed and rebuilt
+        self.checkbox_pool = WidgetPool(lambda: ctk.CTkCheckBox(self.scroll_frame, text="", offvalue=""))
+        self.lbl_no_activities = ctk.CTkLabel(self.scroll_frame, text="No activities in range")
         # --------------------------------------
 
         btn_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -76,9 +82,8 @@ class PrintRecordsWindow(ctk.CTkToplevel):
         self.export_btn = ctk.CTkButton(btn_frame, text="Export Results", command=self.export_data, state="disabled")
         self.export_btn.pack(side="left", padx=10)
         
-        self.textbox_result = ctk.CTkTextbox(self, width=500, height=300)
+        self.textbox_result = ResultView(self, width=500, height=300)
         self.textbox_result.grid(row=7, column=0, padx=20, pady=(0, 20), sticky="nsew")
-        self.textbox_result.configure(state="disabled")
 
         ctk.CTkButton(self, text="Back to Menu", command=self.close_window).grid(row=8, column=0, pady=20)
 
@@ -88,8 +93,8 @@ class PrintRecordsWindow(ctk.CTkToplevel):
 
     def open_calendar(self):
         mode = "single" if self.mode_var.get() == "Single Date" else "range"
-        cal = CalendarDialog(self, selection_mode=mode)
-        self.wait_window(cal)
+        cal = CalendarDialog.open(self, selection_mode=mode, session_index=self.session_index)
+        cal.wait()
         res = cal.get_selection()
         
         valid_selection = False
@@ -110,44 +115,30 @@ class PrintRecordsWindow(ctk.CTkToplevel):
             self.update_activity_options()
 
     def update_activity_options(self):
-        """Scans the selected dates and creates checkboxes for found activities."""
-        # 1. Clear old checkboxes
-        for widget in self.scroll_frame.winfo_children():
-            widget.destroy()
-        self.activity_checkboxes.clear()
+        """Scans the selected dates and shows a checkbox for each activity found."""
+        # 1. Put the old checkboxes back in the pool
+        self.checkbox_pool.release_all()
+        self.activity_checkboxes = self.checkbox_pool.active
+        self.lbl_no_activities.pack_forget()
 
         if not self.start_date or not self.end_date:
             return
 
         # 2. Find unique activities in the date range
-        found_activities = set()
-        for d_str, sessions_list in self.sessions.items():
-            try:
-                dt = datetime.strptime(d_str, "%d/%m/%y").date()
-                if self.start_date <= dt <= self.end_date:
-                    for s in sessions_list:
-                        found_activities.add(s['activity'])
-            except ValueError:
-                pass
+        found_activities = {s['activity'] for _, s in sessions_in_range(self.session_index, self.start_date, self.end_date)}
         
-        # 3. Create a checkbox for each activity
+        # 3. Show a checkbox for each activity
         if not found_activities:
-            ctk.CTkLabel(self.scroll_frame, text="No activities in range").pack()
+            self.lbl_no_activities.pack()
         else:
-            for act_name in sorted(list(found_activities)):
-                # Default value is 1 (Checked)
-                var = ctk.StringVar(value=act_name) 
-                chk = ctk.CTkCheckBox(self.scroll_frame, text=act_name, onvalue=act_name, offvalue="")
+            for act_name in sorted(found_activities):
+                chk = self.checkbox_pool.acquire(text=act_name, onvalue=act_name)
                 chk.select() # Check by default
                 chk.pack(anchor="w", pady=2, padx=5)
-                self.activity_checkboxes.append(chk)
 
     def show_records(self):
         if not self.start_date or not self.end_date:
-            self.textbox_result.configure(state="normal")
-            self.textbox_result.delete("0.0", "end")
-            self.textbox_result.insert("0.0", "Please select a date first.")
-            self.textbox_result.configure(state="disabled")
+            self.textbox_result.show_message("Please select a date first.")
             return
 
         # Get list of activities user actually wants to see
@@ -158,56 +149,40 @@ class PrintRecordsWindow(ctk.CTkToplevel):
             return
 
         self.export_btn.configure(state="disabled")
-        self.textbox_result.configure(state="normal")
-        self.textbox_result.delete("0.0", "end")
-        self.textbox_result.insert("0.0", "Processing...\n")
+        self.textbox_result.show_message("Processing...\n")
         self.update()
 
         self.current_records = []
-        df = load_attendance_file(self.file_path)
-        if df is None:
-             self.textbox_result.insert("end", "\nError loading file.")
-             self.textbox_result.configure(state="disabled")
+        matrix = get_attendance_matrix(self.file_path)
+        if matrix is None:
+             self.textbox_result.show_message("Error loading file.")
              return
 
         found_any = False
-        display_text = ""
-        sorted_dates = []
-        
-        # Sort dates
-        for d_str in self.sessions.keys():
-            try:
-                dt = datetime.strptime(d_str, "%d/%m/%y").date()
-                if self.start_date <= dt <= self.end_date:
-                    sorted_dates.append((dt, d_str))
-            except ValueError: pass
-        sorted_dates.sort() 
-        
+        # Collect lines in a list; the view streams them in batches so big results don't freeze the UI
+        display_lines = []
         # Process Logic
-        for dt, d_str in sorted_dates:
-            for act in self.sessions[d_str]:
-                # ONLY Process if the activity name is in our selected list
-                if act['activity'] in selected_activities:
-                    records = extract_records(self.file_path, act['col_index'], self.target_marks, df=df)
-                    if records:
-                        found_any = True
-                        display_text += f"\n--- {d_str} : {act['activity']} (Total: {len(records)}) ---\n"
-                        for person in records:
-                            person['Date'], person['Activity'] = d_str, act['activity']
-                            self.current_records.append(person)
-                            display_text += f"{person['Surname']} {person['Firstname']} ({person['Matric NO']})\n"
-                    else:
-                        display_text += f"\n--- {d_str} : {act['activity']} (No {self.record_type}) ---\n"
+        for dt, act in sessions_in_range(self.session_index, self.start_date, self.end_date):
+            # ONLY Process if the activity name is in our selected list
+            if act['activity'] in selected_activities:
+                d_str = act['date_str']
+                records = extract_records(self.file_path, act['col_index'], self.target_marks, matrix=matrix)
+                if records:
+                    found_any = True
+                    display_lines.append(f"\n--- {d_str} : {act['activity']} (Total: {len(records)}) ---")
+                    for person in records:
+                        person['Date'], person['Activity'] = d_str, act['activity']
+                        self.current_records.append(person)
+                        display_lines.append(f"{person['Surname']} {person['Firstname']} ({person['Matric NO']})")
+                else:
+                    display_lines.append(f"\n--- {d_str} : {act['activity']} (No {self.record_type}) ---")
 
         if found_any:
-            self.textbox_result.delete("0.0", "end")
-            header = f"Results for selected activities ({self.start_date.strftime('%d/%m/%y')} - {self.end_date.strftime('%d/%m/%y')}):\n"
-            self.textbox_result.insert("0.0", header + display_text)
+            header = f"Results for selected activities ({self.start_date.strftime('%d/%m/%y')} - {self.end_date.strftime('%d/%m/%y')}):"
+            self.textbox_result.set_lines(display_lines, header=header)
             self.export_btn.configure(state="normal")
         else:
-            self.textbox_result.delete("0.0", "end")
-            self.textbox_result.insert("0.0", f"No {self.record_type.lower()} found for selected activities.")
-        self.textbox_result.configure(state="disabled")
+            self.textbox_result.show_message(f"No {self.record_type.lower()} found for selected activities.")
 
     def export_data(self):
         file_name = os.path.basename(self.file_path)
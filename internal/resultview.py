@@ -0,0 +1,100 @@
+import customtkinter as ctk
+
+
+class ResultView(ctk.CTkFrame):
+    """
+    A read-only text view for long result listings (records, frequency, reports).
+
+    Inserting thousands of lines into a CTkTextbox in one go (or one insert per line)
+    freezes the window. This view paints the first screenful straight away and then
+    streams the remaining lines in batches between event-loop ticks, so the window
+    stays responsive no matter how many lines there are.
+    """
+    def __init__(self, parent, first_batch: int = 200, batch_size: int = 1000, **kwargs):
+        width = kwargs.pop("width", 500)
+        height = kwargs.pop("height", 350)
+        super().__init__(parent, fg_color="transparent", **kwargs)
+        self.first_batch = first_batch
+        self.batch_size = batch_size
+
+        self.lines = []          # Everything that has been handed to the view
+        self._cursor = 0         # Index of the first line not yet inserted
+        self._job = None         # Pending after() id of the streaming loop
+        self._generation = 0     # Bumped on every reset so stale batches stop
+
+        self.textbox = ctk.CTkTextbox(self, width=width, height=height)
+        self.textbox.pack(fill="both", expand=True)
+        self.textbox.configure(state="disabled")
+
+    def show_message(self, text: str):
+        """Replaces the content with a short status message (e.g. 'Processing...')."""
+        self._reset()
+        self._insert(text)
+
+    def set_lines(self, lines: list[str], header: str = ""):
+        """
+        Replaces the content with the given lines.
+        The first `first_batch` lines are shown immediately, the rest is streamed.
+        """
+        self._reset()
+        if header:
+            self._insert(header if header.endswith("\n") else header + "\n")
+        self.append_lines(lines)
+
+    def append_lines(self, lines: list[str]):
+        """Adds lines to the end of the view without touching what is already shown."""
+        if not lines:
+            return
+        self.lines.extend(lines)
+
+        if self._job is None:
+            # Paint what fits on screen right away, stream the rest
+            self._flush(self.first_batch)
+            self._schedule()
+
+    def get_text(self) -> str:
+        """Returns all lines, including those not yet painted."""
+        return "\n".join(self.lines)
+
+    def is_streaming(self) -> bool:
+        return self._job is not None
+
+    def _reset(self):
+        self._generation += 1
+        if self._job is not None:
+            try:
+                self.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+        self.lines = []
+        self._cursor = 0
+        self.textbox.configure(state="normal")
+        self.textbox.delete("0.0", "end")
+        self.textbox.configure(state="disabled")
+
+    def _schedule(self):
+        if self._cursor < len(self.lines):
+            generation = self._generation
+            self._job = self.after(1, lambda: self._stream(generation))
+        else:
+            self._job = None
+
+    def _stream(self, generation: int):
+        if generation != self._generation or not self.winfo_exists():
+            return
+        self._flush(self.batch_size)
+        self._schedule()
+
+    def _flush(self, count: int):
+        """Inserts up to `count` pending lines with a single Text insert."""
+        if self._cursor >= len(self.lines):
+            return
+        chunk = self.lines[self._cursor:self._cursor + count]
+        self._cursor += len(chunk)
+        self._insert("\n".join(chunk) + "\n")
+
+    def _insert(self, text: str):
+        self.textbox.configure(state="normal")
+        self.textbox.insert("end", text)
+        self.textbox.configure(state="disabled")
@@ -0,0 +1,131 @@
+import bisect
+import csv
+import os
+import threading
+from functools import reduce
+
+import numpy as np
+
+from internal.attendance.create.create_func import STUDENTS_DIR, normalize_matric
+from internal.utils import events, tracing
+from internal.utils.file_cache import file_signature
+from internal.utils.search_index import tokenize
+
+
+def _signature(file_paths) -> tuple:
+    signatures = ((path, file_signature(path)) for path in file_paths)
+    return tuple((path, signature) for path, signature in signatures if signature is not None)
+
+
+class StudentDirectory:
+    """
+    Every student of every level in db/allstudents, searchable by prefixes of their
+    matric, surname and firstname.
+
+    Students are kept in name order and each token points at its student's position (rank)
+    in that order. Tokens sit in one sorted list, so a prefix is two binary searches giving a
+    slice of the rank array. Marking those ranks in a boolean array (and-ed across words) leaves
+    the matches already sorted by name. PrefixIndex hands back a set of every match instead,
+    which for a one-letter prefix over a few thousand students costs milliseconds per keystroke.
+
+    The index is built on a background thread and swapped in whole, so searches never wait
+    for it: until it is ready they return nothing, and while a newer one is built after the
+    files changed they answer from the old one. Searches never look at the files themselves;
+    the lists are checked again when attendance files change and when the search box is focused.
+    """
+    def __init__(self, students_dir=STUDENTS_DIR):
+        self.students_dir = students_dir
+        self.ready = threading.Event()
+        self.signature = None
+        self._building = threading.Lock()
+        # Replaced together by build(), as one tuple so a search never sees half of each
+        self._state: tuple[list[str], np.ndarray, list[dict]] = ([], np.array([], dtype=np.int32), [])
+
+    def __len__(self):
+        return len(self._state[2])
+
+    def files(self) -> list[str]:
+        try:
+            names = sorted(n for n in os.listdir(self.students_dir) if n.lower().endswith(".csv"))
+        except OSError:
+            return []
+        return [os.path.abspath(os.path.join(self.students_dir, n)) for n in names]
+
+    def is_stale(self) -> bool:
+        return _signature(self.files()) != self.signature
+
+    @tracing.traced("build_student_directory")
+    def build(self):
+        """
+        Reads the student lists and swaps in a new index. Skipped if another build is running
+        or the lists have not changed since the last one.
+        Each student is {'Level', 'Surname', 'Firstname', 'Matric NO', 'file', 'line'}.
+        """
+        if not self._building.acquire(blocking=False):
+            return
+        try:
+            files = self.files()
+            signature = _signature(files)
+            if signature == self.signature:
+                return
+            students, seen = [], set()
+            for path in files:
+                level = os.path.splitext(os.path.basename(path))[0]
+                try:
+                    with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+                        reader = csv.reader(f)
+                        next(reader, None)   # Header
+                        for row in reader:
+                            if len(row) < 3 or not row[2].strip():
+                                continue
+                            matric = normalize_matric(row[2])
+                            if (level, matric) in seen:
+                                continue
+                            seen.add((level, matric))
+                            students.append({'Level': level, 'Surname': row[0].strip(), 'Firstname': row[1].strip(),
+                                             'Matric NO': matric, 'file': path, 'line': reader.line_num - 1})
+                except OSError as e:
+                    print(f"Could not read {path}: {e}")
+
+            students.sort(key=lambda s: (s['Surname'].lower(), s['Firstname'].lower(), s['Matric NO'], s['Level']))
+            entries = sorted((token, rank) for rank, s in enumerate(students)
+                             for token in tokenize(f"{s['Matric NO']} {s['Surname']} {s['Firstname']}"))
+            self._state = ([token for token, _ in entries], np.array([rank for _, rank in entries], dtype=np.int32),
+                           students)
+            self.signature = signature
+            self.ready.set()
+        finally:
+            self._building.release()
+
+    def build_in_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self.build, name="student-directory", daemon=True)
+        thread.start()
+        return thread
+
+    def refresh_in_background(self, payload=None):
+        """Rebuilds in the background if the lists changed. Does nothing before the first build."""
+        if self.ready.is_set():
+            return self.build_in_background()
+
+    def _mask(self, tokens, ranks, count, prefix) -> np.ndarray:
+        start = bisect.bisect_left(tokens, prefix)
+        end = bisect.bisect_left(tokens, prefix + "\uffff", lo=start)
+        mask = np.zeros(count, dtype=bool)
+        mask[ranks[start:end]] = True
+        return mask
+
+    def search(self, query: str, limit: int = 8) -> list[dict]:
+        """Students with a token starting with each word of query, sorted by name, at most limit of them."""
+        words = tokenize(query)
+        if not words:
+            return []
+        tokens, ranks, students = self._state
+        found = reduce(np.logical_and, (self._mask(tokens, ranks, len(students), word) for word in words))
+        return [students[r] for r in np.flatnonzero(found)[:limit]]
+
+
+student_directory = StudentDirectory()
+
+# New students reach the attendance files from the lists, and the lists themselves are edited in the viewer
+events.subscribe(events.ROSTER_CHANGED, student_directory.refresh_in_background)
+events.subscribe(events.FILE_REWRITTEN, student_directory.refresh_in_background)
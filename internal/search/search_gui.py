@@ -0,0 +1,98 @@
+import customtkinter as ctk
+from internal.search.search_func import student_directory
+
+
+class StudentSearchBox(ctk.CTkFrame):
+    """
+    Typeahead over every student in db/allstudents. Results drop down over the widgets
+    below the box and narrow on every keystroke; each one opens the student's row in the
+    viewer (on_view) or their history card (on_history), called with the student's dict.
+    """
+    MAX_RESULTS = 6
+
+    def __init__(self, master, on_view, on_history, directory=student_directory, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.on_view = on_view
+        self.on_history = on_history
+        self.directory = directory
+        self.current = []
+        self._waiting = None
+
+        self.entry = ctk.CTkEntry(self, placeholder_text="Find a student by matric or name...")
+        self.entry.pack(fill="x")
+        self.entry.bind("<KeyRelease>", self._on_typed)
+        self.entry.bind("<Return>", lambda e: self._pick(self.on_history, 0))
+        self.entry.bind("<Escape>", lambda e: self.clear())
+        # Picks up lists changed outside the app; the check runs off the Tk thread
+        self.entry.bind("<FocusIn>", lambda e: self.directory.refresh_in_background())
+
+        # Child of the window, not of this frame, so it can be placed over the menu buttons
+        self.results = ctk.CTkFrame(self.winfo_toplevel(), border_width=1)
+        self.lbl_status = ctk.CTkLabel(self.results, text="", text_color="gray")
+        # Fixed set of rows, reconfigured on every keystroke instead of recreated
+        self.rows = []
+        for i in range(self.MAX_RESULTS):
+            row = ctk.CTkFrame(self.results, fg_color="transparent")
+            btn_card = ctk.CTkButton(row, text="", height=24, anchor="w", fg_color="transparent", border_width=1,
+                                     text_color=("gray10", "gray90"), command=lambda i=i: self._pick(self.on_history, i))
+            btn_card.pack(side="left", fill="x", expand=True)
+            ctk.CTkButton(row, text="Row", width=50, height=24,
+                          command=lambda i=i: self._pick(self.on_view, i)).pack(side="left", padx=(4, 0))
+            self.rows.append((row, btn_card))
+
+    def _on_typed(self, event=None):
+        if event is not None and event.keysym in ("Return", "KP_Enter", "Escape"):
+            return
+        if not self.entry.get().strip():
+            self.hide_results()
+            return
+        if not self.directory.ready.is_set():
+            # Still being built at startup; try again shortly
+            self._show_status("Loading students...")
+            if self._waiting is None:
+                self._waiting = self.after(200, self._retry)
+            return
+
+        self.current = self.directory.search(self.entry.get(), self.MAX_RESULTS)
+        for i, (row, btn_card) in enumerate(self.rows):
+            if i < len(self.current):
+                s = self.current[i]
+                btn_card.configure(text=f"{s['Matric NO']}  {s['Surname']} {s['Firstname']}  ({s['Level']})")
+                row.pack(fill="x", padx=4, pady=1)
+            else:
+                row.pack_forget()
+        if self.current:
+            self.lbl_status.pack_forget()
+            self._place_results()
+        else:
+            self._show_status("No students found")
+
+    def _retry(self):
+        self._waiting = None
+        self._on_typed()
+
+    def _show_status(self, text):
+        for row, _ in self.rows:
+            row.pack_forget()
+        self.lbl_status.configure(text=text)
+        self.lbl_status.pack(padx=8, pady=4)
+        self._place_results()
+
+    def _place_results(self):
+        self.results.place(in_=self.entry, relx=0, rely=1.0, relwidth=1.0, y=2)
+        self.results.lift()
+
+    def hide_results(self):
+        self.results.place_forget()
+
+    def clear(self):
+        self.entry.delete(0, "end")
+        self.current = []
+        self.hide_results()
+
+    def _pick(self, callback, i):
+        if i >= len(self.current):
+            return
+        student = self.current[i]
+        self.clear()
+        callback(student)
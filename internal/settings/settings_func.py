@@ -1,2 +1,32 @@
+import json
+from pathlib import Path
 
+SETTINGS_FILE = Path("db") / "settings.json"
 
+DEFAULT_SETTINGS = {
+    "watchdog_enabled": False,     # Log UI freezes (see internal/utils/watchdog.py)
+    "watchdog_threshold_ms": 150,
+}
+
+
+def load_settings() -> dict:
+    """Returns the saved settings, filling in defaults for anything missing."""
+    settings = dict(DEFAULT_SETTINGS)
+    try:
+        if SETTINGS_FILE.exists():
+            with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
+                settings.update(json.load(f))
+    except Exception as e:
+        print(f"Error reading settings: {e}")
+    return settings
+
+
+def save_settings(settings: dict) -> bool:
+    try:
+        SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
+            json.dump(settings, f, indent=2)
+        return True
+    except Exception as e:
+        print(f"Error saving settings: {e}")
+        return False
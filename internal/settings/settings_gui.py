@@ -0,0 +1,83 @@
+import customtkinter as ctk
+from tkinter import messagebox
+from internal.resultview import ResultView
+from internal.settings.settings_func import load_settings, save_settings
+from internal.utils.watchdog import read_stall_log, clear_stall_log, stall_log_path
+from internal.windowcache import ReusableWindow
+
+
+class SettingsWindow(ctk.CTkToplevel, ReusableWindow):
+    """
+    Application settings. For now: the UI freeze watchdog and its log.
+    """
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.settings = load_settings()
+
+        self.title("Settings")
+        self.geometry("700x650")
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(3, weight=1)
+
+        ctk.CTkLabel(self, text="Settings", font=("Arial", 20, "bold")).grid(row=0, column=0, pady=(20, 10))
+
+        # 1. Watchdog
+        frame_watchdog = ctk.CTkFrame(self)
+        frame_watchdog.grid(row=1, column=0, padx=20, pady=10, sticky="ew")
+
+        self.watchdog_var = ctk.BooleanVar(value=self.settings["watchdog_enabled"])
+        ctk.CTkSwitch(frame_watchdog, text="Log UI freezes", variable=self.watchdog_var,
+                      command=self.apply_watchdog).pack(side="left", padx=10, pady=10)
+
+        ctk.CTkLabel(frame_watchdog, text="Threshold (ms):").pack(side="left", padx=(20, 5))
+        self.threshold_entry = ctk.CTkEntry(frame_watchdog, width=70)
+        self.threshold_entry.insert(0, str(self.settings["watchdog_threshold_ms"]))
+        self.threshold_entry.pack(side="left")
+        ctk.CTkButton(frame_watchdog, text="Apply", width=60, command=self.apply_watchdog).pack(side="left", padx=10)
+
+        # 2. Log
+        frame_log = ctk.CTkFrame(self, fg_color="transparent")
+        frame_log.grid(row=2, column=0, padx=20, sticky="ew")
+        ctk.CTkLabel(frame_log, text="Recent freezes (newest first)", font=("Arial", 12, "bold")).pack(side="left")
+        ctk.CTkButton(frame_log, text="Clear Log", width=80, fg_color="gray", command=self.clear_log).pack(side="right")
+        ctk.CTkButton(frame_log, text="Refresh", width=80, command=self.refresh).pack(side="right", padx=5)
+
+        self.log_view = ResultView(self, width=640, height=380)
+        self.log_view.grid(row=3, column=0, padx=20, pady=10, sticky="nsew")
+
+        ctk.CTkButton(self, text="Back to Menu", command=self.close_window).grid(row=4, column=0, pady=(0, 20))
+        self.protocol("WM_DELETE_WINDOW", self.close_window)
+
+        self.refresh()
+
+    def refresh(self):
+        """Reloads the freeze log."""
+        lines = read_stall_log()
+        if lines:
+            self.log_view.set_lines(lines)
+        else:
+            self.log_view.show_message(f"No freezes logged.\n\nLog file: {stall_log_path()}")
+
+    def apply_watchdog(self):
+        try:
+            threshold = int(self.threshold_entry.get())
+            if threshold <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Threshold must be a whole number of milliseconds.")
+            return
+
+        self.settings["watchdog_enabled"] = bool(self.watchdog_var.get())
+        self.settings["watchdog_threshold_ms"] = threshold
+        save_settings(self.settings)
+        self.parent.configure_watchdog(self.settings["watchdog_enabled"], threshold)
+
+    def clear_log(self):
+        if messagebox.askyesno("Clear Log", "Delete all logged freezes?"):
+            clear_stall_log()
+            self.refresh()
+
+    def close_window(self):
+        self.parent.deiconify()
+        self.close()
@@ -0,0 +1,147 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from internal.utils import tracing
+from internal.utils.attendance_matrix import ABSENT, LATE, PRESENT
+from internal.utils.excel_styler import apply_excel_styling
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def chronological_sessions(matrix, start_date=date.min, end_date=date.max, activity=None) -> np.ndarray:
+    """Positions of the matrix's sessions in the range (optionally one activity), oldest first."""
+    positions = np.flatnonzero(matrix.session_mask(start_date, end_date, activity))
+    # Stable, so sessions on the same day keep their column order
+    return positions[np.argsort(matrix.session_dates[positions], kind="stable")]
+
+
+def absence_runs(marks: np.ndarray):
+    """
+    Run lengths of absences along each row of a students x sessions block of codes, oldest first.
+
+    Present (or late) ends a run, absent extends it. Blanks and excused marks are skipped:
+    they neither end nor extend a run, so a student who had not joined yet or was excused
+    keeps the streak they had.
+
+    Returns (run, absent): run[i, j] is the length of the run student i is in at session j
+    (0 where they were not absent), absent is the bool block of absences.
+    """
+    absent = marks == ABSENT
+    present = np.isin(marks, (PRESENT, LATE))
+    absences_so_far = np.cumsum(absent, axis=1)
+    # Absences counted up to the most recent present mark, carried forward
+    at_last_present = np.maximum.accumulate(np.where(present, absences_so_far, 0), axis=1)
+    run = np.where(absent, absences_so_far - at_last_present, 0)
+    return run, absent
+
+
+def absence_streaks(matrix, positions) -> dict:
+    """
+    Longest and current absence streak of every student over the sessions at positions (oldest first).
+    Returns arrays: longest, longest_start, longest_end (session positions, -1 without a streak), current.
+    """
+    students = len(matrix)
+    if len(positions) == 0:
+        empty = np.zeros(students, dtype=np.int64)
+        return {'longest': empty, 'longest_start': empty - 1, 'longest_end': empty - 1, 'current': empty}
+    block = matrix.marks[:, positions]
+    run, absent = absence_runs(block)
+    longest = run.max(axis=1)
+    end = run.argmax(axis=1)
+    # The run ending at `end` started longest - 1 absences earlier
+    absences_so_far = np.cumsum(absent, axis=1)
+    first_of_run = absences_so_far[np.arange(students), end] - longest + 1
+    start = np.argmax(absent & (absences_so_far == first_of_run[:, None]), axis=1)
+    # Current: the run still open at the student's last marked session (trailing blanks are skipped)
+    current = run[np.arange(students), _last_marked(block)]
+    positions = np.asarray(positions)
+    has = longest > 0
+    return {
+        'longest': longest,
+        'longest_start': np.where(has, positions[start], -1),
+        'longest_end': np.where(has, positions[end], -1),
+        'current': current,
+    }
+
+
+def _last_marked(block) -> np.ndarray:
+    """Per row, the index of the last session with a present, late or absent mark (0 if none)."""
+    marked = np.isin(block, (ABSENT, PRESENT, LATE))
+    return block.shape[1] - 1 - np.argmax(marked[:, ::-1], axis=1)
+
+
+def miss_patterns(matrix, positions, by="weekday"):
+    """
+    How often each student missed each weekday (or activity) over the sessions at positions.
+    Returns (labels, missed, marked): missed[i, g] absences of student i in group labels[g],
+    marked[i, g] sessions of that group where the student had a mark at all.
+    """
+    positions = np.asarray(positions, dtype=np.intp)
+    if by == "weekday":
+        # datetime64 day 0 (1970-01-01) was a Thursday
+        groups = (matrix.session_dates[positions].astype(np.int64) + 3) % 7
+        labels = WEEKDAYS
+    else:
+        names = np.char.upper(matrix.session_activities[positions])
+        labels, groups = np.unique(names, return_inverse=True)
+        labels = [str(label) for label in labels]
+    one_hot = np.zeros((len(positions), len(labels)), dtype=np.int32)
+    one_hot[np.arange(len(positions)), groups] = 1
+    block = matrix.marks[:, positions]
+    missed = (block == ABSENT).astype(np.int32) @ one_hot
+    marked = np.isin(block, (ABSENT, PRESENT, LATE)).astype(np.int32) @ one_hot
+    return labels, missed, marked
+
+
+def streak_report(matrix, start_date=date.min, end_date=date.max, activity=None, min_streak=3,
+                  current_only=False, min_sessions=2) -> list[dict]:
+    """
+    Students whose longest (or, with current_only, current) absence streak is at least min_streak
+    sessions, longest first. "Always Misses" lists the weekdays and activities where the student
+    missed every one of at least min_sessions marked sessions.
+    """
+    if matrix is None:
+        return []
+    with tracing.span("streak_report", students=len(matrix)) as s:
+        positions = chronological_sessions(matrix, start_date, end_date, activity)
+        streaks = absence_streaks(matrix, positions)
+        always = [[] for _ in range(len(matrix))]
+        for by in ("weekday", "activity"):
+            labels, missed, marked = miss_patterns(matrix, positions, by)
+            for i, g in zip(*np.nonzero((missed == marked) & (marked >= min_sessions))):
+                always[i].append(labels[g])
+
+        key = streaks['current'] if current_only else streaks['longest']
+        chosen = np.flatnonzero(key >= min_streak)
+        chosen = chosen[np.argsort(-key[chosen], kind="stable")]
+        roster = matrix.roster(chosen)
+        rows = []
+        for student, i in zip(roster, chosen):
+            start, end = streaks['longest_start'][i], streaks['longest_end'][i]
+            rows.append(dict(student, **{
+                'Longest Streak': int(streaks['longest'][i]),
+                'From': f"{matrix.session_date_strs[start]} {matrix.session_activities[start]}" if start >= 0 else "",
+                'To': f"{matrix.session_date_strs[end]} {matrix.session_activities[end]}" if end >= 0 else "",
+                'Current Streak': int(streaks['current'][i]),
+                'Always Misses': ", ".join(always[i]),
+            }))
+        s.set(rows=len(rows))
+    return rows
+
+
+@tracing.traced("export_streaks")
+def save_streak_report(rows, save_path) -> bool:
+    """Writes the report to a styled Excel workbook (or CSV for a .csv path)."""
+    try:
+        df = pd.DataFrame(rows)
+        if save_path.endswith('.csv'):
+            df.to_csv(save_path, index=False)
+        else:
+            df.to_excel(save_path, index=False)
+            apply_excel_styling(save_path)
+        return True
+    except Exception as e:
+        print(f"Error saving streak report: {e}")
+        return False
@@ -0,0 +1,152 @@
+import customtkinter as ctk
+import os
+from datetime import date
+from tkinter import messagebox, filedialog
+from internal.choosecsv import ChooseCSVWindow
+from internal.calender import CalendarDialog
+from internal.resultview import ResultView
+from internal.records.records_func import get_attendance_matrix, get_session_index
+from internal.streaks.streaks_func import save_streak_report, streak_report
+from internal.utils import events
+from internal.utils.general import get_target_dir
+
+ALL_ACTIVITIES = "All activities"
+
+
+class ChooseStreakFileWindow(ChooseCSVWindow):
+    prefetch_loaders = (get_attendance_matrix, get_session_index)
+
+    def __init__(self, master):
+        attendance_dir = os.path.join(os.path.dirname(__file__), "..", "..", "db", "attendance")
+        super().__init__(master,
+                         target_dir=attendance_dir,
+                         callback=self.open_streak_window,
+                         title="Select Attendance File for Absence Streaks")
+
+    def open_streak_window(self, file_path):
+        StreakWindow(self.master, file_path)
+
+
+class StreakWindow(ctk.CTkToplevel):
+    """
+    Students absent from N or more sessions in a row, and the weekdays or activities
+    they miss every time, for one attendance file.
+    """
+    def __init__(self, master, file_path):
+        super().__init__(master)
+        self.master = master
+        self.file_path = file_path
+        self.start_date = None
+        self.end_date = None
+        self.current_data = []
+
+        self.title("Absence Streaks")
+        self.geometry("760x680")
+
+        self._setup_ui()
+
+        # Run the report again when this file changes while it is shown
+        self._event_handlers = {event: self._on_change for event in
+                                (events.SESSION_ADDED, events.MARK_CHANGED, events.ROSTER_CHANGED, events.FILE_REWRITTEN)}
+        events.subscribe_all(self._event_handlers)
+        self.bind("<Destroy>", lambda e: events.unsubscribe_all(self._event_handlers) if e.widget is self else None, add="+")
+
+    def _setup_ui(self):
+        ctk.CTkLabel(self, text="Absence Streaks", font=("Arial", 20, "bold")).pack(pady=10)
+        ctk.CTkLabel(self, text=f"File: {os.path.basename(self.file_path)}", text_color="gray").pack(pady=5)
+
+        # Date range (optional, whole semester by default)
+        self.date_btn = ctk.CTkButton(self, text="Select Date Range", command=self._select_date_range)
+        self.date_btn.pack(pady=5)
+        self.lbl_date_range = ctk.CTkLabel(self, text="Range: All sessions")
+        self.lbl_date_range.pack(pady=5)
+
+        # Filters
+        options = ctk.CTkFrame(self, fg_color="transparent")
+        options.pack(pady=5)
+        activities = sorted({s['activity'].upper() for sessions in get_session_index(self.file_path).values()
+                             for s in sessions})
+        self.activity_var = ctk.StringVar(value=ALL_ACTIVITIES)
+        ctk.CTkOptionMenu(options, variable=self.activity_var, values=[ALL_ACTIVITIES] + activities).pack(side="left", padx=5)
+        ctk.CTkLabel(options, text="At least").pack(side="left", padx=(10, 5))
+        self.min_entry = ctk.CTkEntry(options, width=50)
+        self.min_entry.insert(0, "3")
+        self.min_entry.pack(side="left")
+        ctk.CTkLabel(options, text="in a row").pack(side="left", padx=5)
+        self.current_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(options, text="Still absent", variable=self.current_var).pack(side="left", padx=10)
+
+        ctk.CTkButton(self, text="Find Streaks", command=self._run).pack(pady=10)
+
+        self.textbox = ResultView(self, width=700, height=350)
+        self.textbox.pack(pady=10, fill="both", expand=True)
+
+        self.btn_export = ctk.CTkButton(self, text="Export to Excel", command=self._export, state="disabled")
+        self.btn_export.pack(pady=5)
+        ctk.CTkButton(self, text="Back", command=self._close).pack(pady=5)
+
+        self.protocol("WM_DELETE_WINDOW", self._close)
+
+    def _select_date_range(self):
+        cal = CalendarDialog.open(self, selection_mode="range", session_index=get_session_index(self.file_path))
+        cal.wait()
+        selection = cal.get_selection()
+        if selection and selection[0] and selection[1]:
+            self.start_date, self.end_date = selection
+            self.lbl_date_range.configure(text=f"Range: {self.start_date.strftime('%d/%m/%y')} - {self.end_date.strftime('%d/%m/%y')}")
+        elif selection and selection[0]:
+            self.start_date = self.end_date = selection[0]
+            self.lbl_date_range.configure(text=f"Range: {self.start_date.strftime('%d/%m/%y')} (Single Day)")
+
+    def _run(self):
+        try:
+            min_streak = int(self.min_entry.get())
+            if min_streak <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showwarning("Invalid Number", "Enter how many sessions in a row, e.g. 3.")
+            return
+
+        activity = self.activity_var.get()
+        self.current_data = streak_report(get_attendance_matrix(self.file_path),
+                                          self.start_date or date.min, self.end_date or date.max,
+                                          None if activity == ALL_ACTIVITIES else activity,
+                                          min_streak=min_streak, current_only=self.current_var.get())
+        self._render()
+
+    def _render(self):
+        if not self.current_data:
+            self.textbox.show_message("No student missed that many sessions in a row.")
+            self.btn_export.configure(state="disabled")
+            return
+        header = "SURNAME\tFIRSTNAME\tMATRIC NO\tLONGEST\tCURRENT\tALWAYS MISSES\n" + "-" * 90
+        lines = [f"{r['Surname']}\t{r['Firstname']}\t{r['Matric NO']}\t{r['Longest Streak']} ({r['From']} - {r['To']})"
+                 f"\t{r['Current Streak']}\t{r['Always Misses']}" for r in self.current_data]
+        self.textbox.set_lines(lines, header=header)
+        self.btn_export.configure(state="normal")
+
+    def _on_change(self, payload):
+        if (self.winfo_exists() and self.current_data
+                and payload["file"] in (None, events.event_file(self.file_path))):
+            self._run()
+
+    def _export(self):
+        if not self.current_data:
+            return
+        level_name = os.path.splitext(os.path.basename(self.file_path))[0].upper()
+        save_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel Files", "*.xlsx"), ("CSV Files", "*.csv")],
+            initialfile=f"{level_name}_ABSENCE_STREAKS.xlsx",
+            title="Export Absence Streaks",
+            initialdir=get_target_dir(level_name, "STREAKS")
+        )
+        if save_path:
+            if save_streak_report(self.current_data, save_path):
+                messagebox.showinfo("Success", f"Exported to {os.path.basename(save_path)}")
+            else:
+                messagebox.showerror("Export Error", "Failed to export the report.")
+
+    def _close(self):
+        self.master.deiconify()
+        self.destroy()
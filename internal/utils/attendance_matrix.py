@@ -0,0 +1,207 @@
+import csv
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# --- Mark codes ---
+UNKNOWN = 0     # Blank, or text that is not a mark
+PRESENT = 1
+ABSENT = 2
+EXCUSED = 3
+LATE = 4
+
+CODE_NAMES = {UNKNOWN: "unknown", PRESENT: "present", ABSENT: "absent", EXCUSED: "excused", LATE: "late"}
+
+# Every spelling found in attendance files -> code
+MARK_CODES = {
+    '✓': PRESENT, 'P': PRESENT, 'p': PRESENT, 'Present': PRESENT, 'PRESENT': PRESENT, 'present': PRESENT,
+    '✗': ABSENT, 'x': ABSENT, 'X': ABSENT, 'A': ABSENT, 'a': ABSENT, 'Absent': ABSENT, 'ABSENT': ABSENT, 'absent': ABSENT,
+    'E': EXCUSED, 'e': EXCUSED, 'Excused': EXCUSED, 'EXCUSED': EXCUSED,
+    'L': LATE, 'l': LATE, 'Late': LATE, 'LATE': LATE,
+}
+
+# What each code is written back as
+CODE_MARKS = {UNKNOWN: '', PRESENT: '✓', ABSENT: '✗', EXCUSED: 'E', LATE: 'L'}
+
+_NOT_STUDENTS = ['DATE', 'ACTIVITY', 'SURNAME', 'NAN', 'NONE']
+
+
+def mark_code(text) -> int:
+    """Code of a single mark as written in a file."""
+    return MARK_CODES.get(str(text).strip(), UNKNOWN)
+
+
+def codes_for(marks) -> np.ndarray:
+    """Codes matching a list of mark spellings, e.g. ['✓', 'P'] -> [PRESENT]."""
+    return np.array(sorted({mark_code(m) for m in marks} - {UNKNOWN}), dtype=np.int8)
+
+
+def _session_dates(date_strs) -> np.ndarray:
+    """dd/mm/yy or dd/mm/YYYY strings -> datetime64[D], NaT where neither format fits."""
+    text = pd.Series(date_strs, dtype=str).str.strip()
+    short = pd.to_datetime(text, format="%d/%m/%y", errors="coerce")
+    long = pd.to_datetime(text, format="%d/%m/%Y", errors="coerce")
+    return short.fillna(long).to_numpy(dtype="datetime64[D]")
+
+
+class PackedStrings:
+    """
+    Read-only list of strings kept as one UTF-8 buffer plus offsets. A fixed-width numpy
+    string array pads every entry to the longest one at 4 bytes a character, which made the
+    roster most of the matrix.
+    """
+    def __init__(self, values):
+        encoded = [str(v).encode("utf-8") for v in values]
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int32)
+        np.cumsum([len(b) for b in encoded], out=self.offsets[1:])
+        self.buffer = b"".join(encoded)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        i = int(i)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("PackedStrings index out of range")
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def __iter__(self):
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield self.buffer[start:end].decode("utf-8")
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.buffer) + self.offsets.nbytes
+
+
+class AttendanceMatrix:
+    """
+    One attendance file held as arrays instead of a frame of strings.
+
+    marks is a students x sessions int8 array of codes (PRESENT, ABSENT, ...), so a level of
+    400 students and 60 sessions is 24 KB. Row i of marks belongs to surnames[i], firstnames[i],
+    matrics[i] (PackedStrings); column j to the session on session_dates[j] / session_activities[j], which sits at
+    field session_cols[j] of the CSV. Sessions whose date can't be read have NaT as their date.
+
+    Cells whose text is not the usual spelling of their code (e.g. 'P' rather than '✓', or a note)
+    are kept in `extra` so save() writes the file back as it was.
+    """
+    def __init__(self, surnames, firstnames, matrics, marks, session_cols, session_date_strs,
+                 session_activities, extra=None):
+        self.surnames = PackedStrings(surnames)
+        self.firstnames = PackedStrings(firstnames)
+        self.matrics = PackedStrings(matrics)
+        self.marks = np.asarray(marks, dtype=np.int8).reshape(len(self.surnames), len(session_cols))
+        self.session_cols = np.asarray(session_cols, dtype=np.int32)
+        self.session_date_strs = np.asarray(session_date_strs, dtype=str)
+        self.session_activities = np.asarray(session_activities, dtype=str)
+        self.session_dates = _session_dates(self.session_date_strs)
+        self.extra = extra or {}      # (row, session) -> original text
+
+    # --- Loading ---
+
+    @classmethod
+    def from_frame(cls, df, sessions):
+        """
+        Builds the matrix from load_attendance_file's frame (columns '0', '1', ...) and
+        get_session_info's {date_str: [{'activity', 'col_index'}]}. Returns None without a frame.
+        """
+        if df is None or len(df.columns) < 3:
+            return None
+        surnames = df['0']
+        valid = surnames.notna() & ~surnames.astype(str).str.strip().str.upper().isin(_NOT_STUDENTS)
+        students = df[valid]
+
+        session_list = sorted(((s['col_index'], d_str, s['activity'])
+                               for d_str, items in (sessions or {}).items() for s in items))
+        # Only a handful of distinct cell texts exist, so decode those and index back into the block
+        block = students.reindex(columns=[str(c) for c, _, _ in session_list]).fillna('').to_numpy(dtype=str)
+        texts, inverse = np.unique(block, return_inverse=True)
+        texts = [t.strip() for t in texts]
+        codes = np.array([MARK_CODES.get(t, UNKNOWN) for t in texts], dtype=np.int8)
+        marks = codes[inverse].reshape(block.shape)
+        uncommon = np.array([t != CODE_MARKS[int(c)] for t, c in zip(texts, codes)], dtype=bool)
+        extra = {(int(i), int(j)): texts[inverse.reshape(block.shape)[i, j]]
+                 for i, j in np.argwhere(uncommon[inverse].reshape(block.shape))}
+
+        def names(column):
+            return students[column].fillna('').astype(str).to_numpy() if column in students.columns else [''] * len(students)
+
+        return cls(names('0'), names('1'), names('2'), marks,
+                   [c for c, _, _ in session_list], [d for _, d, _ in session_list], [a for _, _, a in session_list],
+                   extra)
+
+    # --- Queries ---
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.surnames, self.firstnames, self.matrics, self.marks, self.session_cols,
+                  self.session_date_strs, self.session_activities, self.session_dates)
+        return sum(a.nbytes for a in arrays)
+
+    def __len__(self):
+        return len(self.surnames)
+
+    def session_mask(self, start_date: date, end_date: date, activity: str | None = None) -> np.ndarray:
+        """Sessions between start_date and end_date (inclusive), optionally of one activity only."""
+        mask = ((self.session_dates >= np.datetime64(start_date, "D"))
+                & (self.session_dates <= np.datetime64(end_date, "D")))
+        if activity:
+            mask &= np.char.upper(self.session_activities) == activity.upper()
+        return mask
+
+    def session_position(self, col_index: int) -> int | None:
+        """Index into the session arrays of the session at CSV field col_index."""
+        found = np.flatnonzero(self.session_cols == col_index)
+        return int(found[0]) if len(found) else None
+
+    def count(self, marks, sessions=None) -> np.ndarray:
+        """Per student, how many of the selected sessions (bool mask, default all) carry one of marks."""
+        block = self.marks if sessions is None else self.marks[:, sessions]
+        return np.isin(block, codes_for(marks)).sum(axis=1)
+
+    def students_with(self, col_index: int, marks) -> np.ndarray:
+        """Row numbers of the students marked with one of marks in the session at field col_index."""
+        j = self.session_position(col_index)
+        if j is None:
+            return np.array([], dtype=np.intp)
+        return np.flatnonzero(np.isin(self.marks[:, j], codes_for(marks)))
+
+    def roster(self, rows=None) -> list[dict]:
+        """[{'Surname', 'Firstname', 'Matric NO'}] for the given rows (default all)."""
+        rows = range(len(self)) if rows is None else rows
+        return [{'Surname': str(self.surnames[i]), 'Firstname': str(self.firstnames[i]),
+                 'Matric NO': str(self.matrics[i])} for i in rows]
+
+    def mark_text(self, row: int, session: int) -> str:
+        return self.extra.get((row, session), CODE_MARKS[int(self.marks[row, session])])
+
+    def to_frame(self, sessions=None) -> pd.DataFrame:
+        """Roster plus one column of marks per selected session, named 'dd/mm/yy ACTIVITY', for exports."""
+        positions = range(self.marks.shape[1]) if sessions is None else np.flatnonzero(sessions)
+        frame = pd.DataFrame(self.roster())
+        for j in positions:
+            frame[f"{self.session_date_strs[j]} {self.session_activities[j]}"] = [
+                self.mark_text(i, j) for i in range(len(self))]
+        return frame
+
+    # --- Saving ---
+
+    def save(self, file_path):
+        """Writes the matrix in the attendance CSV layout (header, DATE and ACTIVITY rows, students)."""
+        with open(file_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Surname", "Firstname", "Matric NO"])
+            writer.writerow([])
+            writer.writerow(["DATE", "", ""] + list(self.session_date_strs))
+            writer.writerow(["ACTIVITY", "", ""] + list(self.session_activities))
+            writer.writerow([])
+            for i in range(len(self)):
+                writer.writerow([self.surnames[i], self.firstnames[i], self.matrics[i]]
+                                + [self.mark_text(i, j) for j in range(self.marks.shape[1])])
@@ -0,0 +1,110 @@
+from datetime import date
+
+import numpy as np
+
+from internal.utils.attendance_matrix import ABSENT, LATE, PRESENT
+
+
+def _to_bits(column: np.ndarray) -> int:
+    """Bool array -> int with bit i set where column[i] is True."""
+    return int.from_bytes(np.packbits(column, bitorder="little").tobytes(), "little")
+
+
+class Bitmap:
+    """
+    A set of roster rows as an int bitset. Combine with & | ~ and -, then read the rows back.
+    ~ is taken over the roster (size rows), so it never yields rows that don't exist.
+    """
+    __slots__ = ("bits", "size")
+
+    def __init__(self, bits: int, size: int):
+        self.bits = bits
+        self.size = size
+
+    def __and__(self, other):
+        return Bitmap(self.bits & other.bits, self.size)
+
+    def __or__(self, other):
+        return Bitmap(self.bits | other.bits, self.size)
+
+    def __sub__(self, other):
+        return Bitmap(self.bits & ~other.bits, self.size)
+
+    def __invert__(self):
+        return Bitmap(((1 << self.size) - 1) ^ self.bits, self.size)
+
+    def __eq__(self, other):
+        return isinstance(other, Bitmap) and (self.bits, self.size) == (other.bits, other.size)
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+    def __bool__(self):
+        return self.bits != 0
+
+    def rows(self) -> np.ndarray:
+        """Row numbers in the set, in roster order."""
+        if not self.bits:
+            return np.array([], dtype=np.intp)
+        raw = np.frombuffer(self.bits.to_bytes((self.size + 7) // 8, "little"), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(raw, bitorder="little")[:self.size])
+
+
+class SessionBitmapIndex:
+    """
+    Present and absent bitmaps for every session of one AttendanceMatrix.
+
+    Late counts as present. Blanks are neither, so a student who joined late is not
+    "absent" from the sessions before they joined.
+
+        index = SessionBitmapIndex(matrix)
+        month = (date(2026, 3, 1), date(2026, 3, 31))
+        rows = index.present(*month, "SUNDAY SERVICE") & index.absent(*month, "BIBLE STUDY", every=True)
+        index.roster(rows)
+    """
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self.size = len(matrix)
+        present = np.isin(matrix.marks, (PRESENT, LATE))
+        absent = matrix.marks == ABSENT
+        self._present = [_to_bits(present[:, j]) for j in range(matrix.marks.shape[1])]
+        self._absent = [_to_bits(absent[:, j]) for j in range(matrix.marks.shape[1])]
+
+    def sessions(self, start_date: date, end_date: date, activity: str | None = None) -> list[int]:
+        """Positions of the sessions between start_date and end_date (inclusive), optionally of one activity."""
+        return np.flatnonzero(self.matrix.session_mask(start_date, end_date, activity)).tolist()
+
+    def everyone(self) -> Bitmap:
+        return Bitmap((1 << self.size) - 1, self.size)
+
+    def nobody(self) -> Bitmap:
+        return Bitmap(0, self.size)
+
+    def present(self, start_date: date, end_date: date, activity: str | None = None, every=False) -> Bitmap:
+        """
+        Students present at any (every=True: every) matching session.
+        Empty when no session matches.
+        """
+        return self._combine(self._present, self.sessions(start_date, end_date, activity), every)
+
+    def absent(self, start_date: date, end_date: date, activity: str | None = None, every=False) -> Bitmap:
+        """Students marked absent at any (every=True: every) matching session. Empty when no session matches."""
+        return self._combine(self._absent, self.sessions(start_date, end_date, activity), every)
+
+    def present_at(self, position: int) -> Bitmap:
+        return Bitmap(self._present[position], self.size)
+
+    def absent_at(self, position: int) -> Bitmap:
+        return Bitmap(self._absent[position], self.size)
+
+    def roster(self, bitmap: Bitmap) -> list[dict]:
+        """[{'Surname', 'Firstname', 'Matric NO'}] of the students in bitmap."""
+        return self.matrix.roster(bitmap.rows())
+
+    def _combine(self, bitmaps, positions, every):
+        if not positions:
+            return self.nobody()
+        bits = bitmaps[positions[0]]
+        for j in positions[1:]:
+            bits = (bits & bitmaps[j]) if every else (bits | bitmaps[j])
+        return Bitmap(bits, self.size)
@@ -1,7 +1,10 @@
 import pandas as pd
 import os
 import csv
+from internal.utils.file_cache import file_cache
+from internal.utils import tracing
 
+@tracing.traced()
 def _get_max_cols(file_path):
     """
     Scans the file to find the maximum number of columns (commas + 1).
@@ -27,6 +30,12 @@ def read_csv_robust(file_path):
     if not os.path.exists(file_path):
         return pd.DataFrame()
 
+    with tracing.span("read_csv_robust", file=file_path, bytes=lambda: tracing.file_size(file_path)) as s:
+        df = _read_csv_robust(file_path)
+        s.set(rows=len(df), columns=len(df.columns))
+    return df
+
+def _read_csv_robust(file_path):
     try:
         # Attempt 1: Standard read
         return pd.read_csv(file_path, skip_blank_lines=True, encoding='utf-8')
@@ -75,6 +84,13 @@ def read_csv_robust(file_path):
         print(f"Error reading {file_path}: {e}")
         return pd.DataFrame()
 
+def read_csv_cached(file_path):
+    """
+    Shared, cached read_csv_robust. Parsed once per file version, so treat the
+    result as read-only and copy it before changing it.
+    """
+    return file_cache.get(file_path, "csv_frame", read_csv_robust)
+
 def save_csv(file_path, df):
     """Saves a DataFrame to CSV."""
     try:
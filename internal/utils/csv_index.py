@@ -0,0 +1,176 @@
+import csv
+import io
+import os
+import threading
+
+# Only one point-update may touch a file at a time
+_write_lock = threading.Lock()
+
+BOM = b"\xef\xbb\xbf"
+
+
+def _file_signature(file_path) -> tuple:
+    stat = os.stat(file_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class CSVLineIndex:
+    """
+    Byte offsets of every line in a CSV file.
+    Lets us read or rewrite a single row with one seek instead of parsing the whole file.
+    Assumes one record per line, which holds for the attendance and student files.
+    """
+    def __init__(self, file_path):
+        self.file_path = str(file_path)
+        self.offsets: list[int] = []     # Start of each line
+        self.ends: list[int] = []        # End of each line's content (before the line break)
+        self.blank: list[bool] = []      # True for empty lines (pandas skips these)
+        self.signature = None
+        self.build()
+
+    def build(self):
+        """(Re)scans the file for line boundaries."""
+        offsets, ends, blank = [], [], []
+        with open(self.file_path, "rb") as f:
+            data = f.read()
+        pos = len(BOM) if data.startswith(BOM) else 0
+        while pos < len(data):
+            offsets.append(pos)
+            nl = data.find(b"\n", pos)
+            end = len(data) if nl == -1 else (nl - 1 if nl > pos and data[nl - 1:nl] == b"\r" else nl)
+            ends.append(end)
+            blank.append(not data[pos:end].strip())
+            if nl == -1:
+                break
+            pos = nl + 1
+        self.offsets, self.ends, self.blank = offsets, ends, blank
+        self.signature = _file_signature(self.file_path)
+
+    def is_fresh(self) -> bool:
+        """False if the file was written since the index was built."""
+        try:
+            return _file_signature(self.file_path) == self.signature
+        except OSError:
+            return False
+
+    def refresh(self):
+        if not self.is_fresh():
+            self.build()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def shift(self, new_lines: dict[int, bytes]):
+        """Moves the offsets after lines were rewritten, without rescanning the file."""
+        delta = 0
+        for line_no in range(min(new_lines), len(self.offsets)):
+            self.offsets[line_no] += delta
+            if line_no in new_lines:
+                raw = new_lines[line_no]
+                delta += len(raw) - (self.ends[line_no] + delta - self.offsets[line_no])
+                self.blank[line_no] = not raw.strip()
+            self.ends[line_no] = self.ends[line_no] + delta
+        self.signature = _file_signature(self.file_path)
+
+    def nonblank_lines(self) -> list[int]:
+        """
+        Line numbers of lines that are not empty.
+        pandas skips blank lines, so DataFrame row i is nonblank_lines()[i + 1].
+        """
+        return [i for i, is_blank in enumerate(self.blank) if not is_blank]
+
+    def read_row(self, line_no: int) -> list[str]:
+        """Parses a single line with one seek."""
+        with open(self.file_path, "rb") as f:
+            f.seek(self.offsets[line_no])
+            raw = f.read(self.ends[line_no] - self.offsets[line_no])
+        return _parse_line(raw)
+
+    def read_rows(self, line_numbers) -> dict[int, list[str]]:
+        """Parses several lines, keeping the file open across seeks."""
+        rows = {}
+        with open(self.file_path, "rb") as f:
+            for line_no in line_numbers:
+                f.seek(self.offsets[line_no])
+                rows[line_no] = _parse_line(f.read(self.ends[line_no] - self.offsets[line_no]))
+        return rows
+
+
+def _parse_line(raw: bytes) -> list[str]:
+    text = raw.decode("utf-8", errors="replace")
+    return next(csv.reader([text]), [])
+
+
+def _format_line(fields: list[str]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="").writerow(fields)
+    return buffer.getvalue().encode("utf-8")
+
+
+def patch_cells(file_path, changes: dict, index: CSVLineIndex | None = None) -> dict:
+    """
+    Writes individual cells without re-serialising the file.
+
+    changes maps (line_no, field_no) -> new value. Lines are re-read at write time, so
+    columns appended by another writer in the meantime are kept.
+    If a rewritten line keeps its byte length (e.g. '✓' <-> '✗') it is patched in place;
+    otherwise only the part of the file after the first changed line is rewritten.
+
+    Returns the previous values as {(line_no, field_no): old_value} so the change can be undone.
+    """
+    if not changes:
+        return {}
+
+    with _write_lock:
+        if index is None:
+            index = CSVLineIndex(file_path)
+        else:
+            index.refresh()
+
+        by_line = {}
+        for (line_no, field_no), value in changes.items():
+            if line_no >= len(index):
+                raise IndexError(f"Line {line_no} is past the end of {file_path}")
+            by_line.setdefault(line_no, {})[field_no] = "" if value is None else str(value)
+
+        old_values = {}
+        new_lines = {}
+        rows = index.read_rows(sorted(by_line))
+        for line_no, fields in by_line.items():
+            row = rows[line_no]
+            for field_no, value in fields.items():
+                while len(row) <= field_no:
+                    row.append("")
+                old_values[(line_no, field_no)] = row[field_no]
+                row[field_no] = value
+            new_lines[line_no] = _format_line(row)
+
+        same_length = all(
+            len(raw) == index.ends[n] - index.offsets[n] for n, raw in new_lines.items()
+        )
+
+        with open(file_path, "r+b") as f:
+            if same_length:
+                for line_no, raw in new_lines.items():
+                    f.seek(index.offsets[line_no])
+                    f.write(raw)
+            else:
+                first = min(new_lines)
+                f.seek(index.offsets[first])
+                tail = f.read()
+                base = index.offsets[first]
+                pieces = []
+                cursor = 0
+                for line_no in sorted(new_lines):
+                    start = index.offsets[line_no] - base
+                    end = index.ends[line_no] - base
+                    pieces.append(tail[cursor:start])
+                    pieces.append(new_lines[line_no])
+                    cursor = end
+                pieces.append(tail[cursor:])
+                f.seek(base)
+                f.write(b"".join(pieces))
+                f.truncate()
+
+        index.shift(new_lines)
+        return old_values
@@ -0,0 +1,80 @@
+import os
+import queue
+import threading
+
+from internal.utils import tracing
+
+# --- Event names ---
+# Every payload has 'file': the absolute path of the attendance file that changed.
+SESSION_ADDED = "session_added"      # date, activity, field, rows: [(surname, firstname, matric, mark)]
+MARK_CHANGED = "mark_changed"        # cells: [{'line', 'field', 'old', 'new', 'matric', 'surname', 'firstname'}]
+ROSTER_CHANGED = "roster_changed"    # added: [student rows]
+FILE_REWRITTEN = "file_rewritten"    # No delta, the file was reordered or replaced; 'file' is None for all files
+
+_lock = threading.Lock()
+_subscribers: dict[str, list[tuple]] = {}   # event -> [(callback, ui)]
+_ui_queue = queue.SimpleQueue()
+
+
+def event_file(file_path):
+    """Normalises a path so publishers and subscribers compare the same string."""
+    return os.path.abspath(str(file_path)) if file_path is not None else None
+
+
+def subscribe(event: str, callback, ui: bool = False):
+    """
+    Calls callback(payload) whenever event is published.
+    With ui=True the call is queued and made from the Tk main loop by pump(),
+    so windows can touch their widgets even when the writer runs on a background thread.
+    """
+    with _lock:
+        _subscribers.setdefault(event, []).append((callback, ui))
+    return callback
+
+
+def unsubscribe(event: str, callback):
+    with _lock:
+        _subscribers[event] = [(cb, ui) for cb, ui in _subscribers.get(event, []) if cb != callback]
+
+
+def subscribe_all(handlers: dict, ui: bool = True):
+    """Subscribes {event: callback} in one go; pass the same dict to unsubscribe_all."""
+    for event, callback in handlers.items():
+        subscribe(event, callback, ui=ui)
+
+
+def unsubscribe_all(handlers: dict):
+    for event, callback in handlers.items():
+        unsubscribe(event, callback)
+
+
+def publish(event: str, file_path, **delta):
+    """Notifies subscribers that file_path changed. delta describes what changed."""
+    payload = dict(delta, event=event, file=event_file(file_path))
+    with _lock:
+        listeners = list(_subscribers.get(event, []))
+    for callback, ui in listeners:
+        if ui:
+            _ui_queue.put((callback, payload))
+            continue
+        try:
+            callback(payload)
+        except Exception as e:
+            print(f"Error handling {event}: {e}")
+
+
+def pump(limit: int = 100) -> int:
+    """Runs queued ui callbacks. Call from the Tk main loop. Returns how many ran."""
+    handled = 0
+    while handled < limit:
+        try:
+            callback, payload = _ui_queue.get_nowait()
+        except queue.Empty:
+            break
+        handled += 1
+        try:
+            with tracing.span(payload.get('event'), handler=getattr(callback, "__qualname__", callback)):
+                callback(payload)
+        except Exception as e:
+            print(f"Error handling {payload.get('event')}: {e}")
+    return handled
@@ -0,0 +1,100 @@
+import os
+import threading
+from typing import Any, Callable
+
+
+def file_signature(file_path):
+    """(mtime_ns, size) of a file, None if it can't be read. Changes whenever the file is written."""
+    try:
+        stat = os.stat(file_path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+class FileCache:
+    """
+    In-process cache for data parsed from files (dataframes, session indexes, ...).
+
+    Entries are keyed by (absolute path, kind) and remember the file's mtime and size,
+    so a file written since it was parsed is simply parsed again on the next get().
+    Safe to use from background threads: if two threads ask for the same entry at once,
+    the second one waits for the first load instead of parsing the file twice.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, tuple] = {}           # key -> (signature, value)
+        self._loading: dict[tuple, threading.Event] = {}
+
+    @staticmethod
+    def _key(file_path, kind: str) -> tuple:
+        return (os.path.abspath(str(file_path)), kind)
+
+    def get(self, file_path, kind: str, loader: Callable[[Any], Any]) -> Any:
+        """Returns the cached value, calling loader(file_path) if it is missing or stale."""
+        key = self._key(file_path, kind)
+        while True:
+            signature = file_signature(file_path)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and signature is not None and entry[0] == signature:
+                    return entry[1]
+                waiting = self._loading.get(key)
+                if waiting is None:
+                    done = threading.Event()
+                    self._loading[key] = done
+                    break
+            # Someone else is parsing this file right now, wait and re-check
+            waiting.wait()
+
+        try:
+            value = loader(file_path)
+            with self._lock:
+                if signature is not None and value is not None:
+                    self._entries[key] = (signature, value)
+            return value
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+            done.set()
+
+    def peek(self, file_path, kind: str) -> Any:
+        """Returns the cached value if it is fresh, without loading anything."""
+        key = self._key(file_path, kind)
+        signature = file_signature(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        return None
+
+    def invalidate(self, file_path=None):
+        """Drops everything cached for file_path (or everything when no path is given)."""
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                return
+            path = os.path.abspath(str(file_path))
+            for key in [k for k in self._entries if k[0] == path]:
+                del self._entries[key]
+
+
+# One cache shared by every window
+file_cache = FileCache()
+
+
+def prefetch(file_path, loaders):
+    """
+    Runs each loader(file_path) on a background thread so the results are already cached
+    when a window asks for them. Loaders should be the cached getters (get_session_index, ...).
+    """
+    def run():
+        for loader in loaders:
+            try:
+                loader(file_path)
+            except Exception as e:
+                print(f"Prefetch of {os.path.basename(str(file_path))} failed: {e}")
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
@@ -8,7 +8,9 @@ def _get_documents_folder() -> Path:
     Who tf in MTU uses Linux NOBODY not even me YET>>>.
     """
     # Windows typically stores Documents under the USERPROFILE directory.
-    return Path(os.environ['USERPROFILE']) / "Documents"
+    # Elsewhere (or if it isn't set) fall back to the home folder so we don't crash with a KeyError.
+    profile = os.environ.get('USERPROFILE')
+    return Path(profile if profile else Path.home()) / "Documents"
 
 
 def get_target_dir(level: str, type: str) -> str:
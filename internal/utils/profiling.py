@@ -0,0 +1,227 @@
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tkinter
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from internal.utils.general import _get_documents_folder
+
+# Actions quicker than this only go into the session totals, not a .prof file of their own
+SLOW_ACTION_MS = 50
+TOP_ALLOCATORS = 25
+
+_session = None
+
+
+def profiling_requested(argv=None) -> bool:
+    """True when the app was started with --profile or ATTENDANCE_PROFILE=1."""
+    argv = sys.argv if argv is None else argv
+    return "--profile" in argv or os.environ.get("ATTENDANCE_PROFILE") == "1"
+
+
+def current():
+    """The running ProfileSession, or None when the app was not started in profile mode."""
+    return _session
+
+
+def window_event(event: str, window):
+    """Takes a memory snapshot when a window is opened or closed in profile mode. Does nothing otherwise."""
+    if _session is None:
+        return
+    try:
+        title = window.title()
+    except Exception:
+        title = type(window).__name__
+    _session.snapshot(f"{event} {title}")
+
+
+def _safe_name(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", text).strip("_")[:60] or "action"
+
+
+def _callback_name(func) -> str:
+    name = getattr(func, "__qualname__", None) or repr(func)
+    if name.endswith("after.<locals>.callit"):
+        # after() wraps the real callback in callit; name the callback instead
+        for cell in func.__closure__ or ():
+            inner = cell.cell_contents
+            if callable(inner) and inner is not func:
+                return f"after: {getattr(inner, '__qualname__', repr(inner))}"
+        return "after"
+    return name
+
+
+class ProfileSession:
+    """
+    Field profiling for "the app is slow" reports, enabled with --profile.
+
+    Every Tk callback (button clicks, bindings, after() jobs) and the startup run under
+    cProfile. All of them add up into session.prof; any action slower than SLOW_ACTION_MS
+    also gets its own numbered .prof. tracemalloc snapshots taken when windows open and
+    close list the top allocators and what grew since the previous snapshot.
+    Everything is written to Documents/ATTENDANCE_MTU/profiles/<timestamp>/.
+    """
+    def __init__(self, bundle_dir: Path | None = None):
+        self.bundle_dir = Path(bundle_dir or _get_documents_folder() / "ATTENDANCE_MTU" / "profiles"
+                               / f"profile-{datetime.now():%Y%m%d-%H%M%S}")
+        self.bundle_dir.mkdir(parents=True, exist_ok=True)
+        self.stats = None                    # pstats.Stats of every action so far
+        self.slow_actions = []               # (started, name, ms, prof file)
+        self.totals = {}                     # name -> [count, total ms, max ms]
+        self._count = 0
+        self._active = threading.local()
+        self._lock = threading.Lock()        # Background threads record actions too
+        self._last_snapshot = None
+        self._original_call = None
+        tracemalloc.start(10)
+
+    @contextlib.contextmanager
+    def action(self, name: str):
+        """Profiles the with-block. Actions started inside another one are part of it."""
+        if getattr(self._active, "depth", 0):
+            self._active.depth += 1
+            try:
+                yield
+            finally:
+                self._active.depth -= 1
+            return
+
+        profiler = cProfile.Profile()
+        self._active.depth = 1
+        started = datetime.now()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ runs one profiler at a time per process. An action on another
+            # thread (startup work under wrap()) has it, so this one is only timed.
+            profiler = None
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            self._active.depth = 0
+            self._record(name, started, (time.perf_counter() - start) * 1000, profiler)
+
+    def _record(self, name, started, ms, profiler):
+        with self._lock:
+            self._record_locked(name, started, ms, profiler)
+
+    def _record_locked(self, name, started, ms, profiler):
+        total = self.totals.setdefault(name, [0, 0.0, 0.0])
+        total[0] += 1
+        total[1] += ms
+        total[2] = max(total[2], ms)
+        stats = None
+        if profiler is not None:
+            try:
+                stats = pstats.Stats(profiler)
+            except TypeError:
+                # Nothing was called inside the action
+                return
+            if self.stats is None:
+                self.stats = stats
+            else:
+                self.stats.add(stats)
+
+        if ms >= SLOW_ACTION_MS:
+            prof_file = "(not profiled)"
+            if stats is not None:
+                self._count += 1
+                prof_file = f"{self._count:03d}_{_safe_name(name)}.prof"
+                stats.dump_stats(self.bundle_dir / prof_file)
+            self.slow_actions.append((started, name, ms, prof_file))
+
+    def snapshot(self, label: str):
+        """Writes the top allocators now, and the biggest growth since the last snapshot."""
+        if not tracemalloc.is_tracing():
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        self._count += 1
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"{label}  at {datetime.now():%H:%M:%S}",
+                 f"Traced memory: {current / 1024:.0f} KiB, peak {peak / 1024:.0f} KiB", "",
+                 f"Top {TOP_ALLOCATORS} allocators:"]
+        lines += [str(stat) for stat in snapshot.statistics("lineno")[:TOP_ALLOCATORS]]
+        if self._last_snapshot is not None:
+            lines += ["", "Biggest changes since the previous snapshot:"]
+            lines += [str(stat) for stat in snapshot.compare_to(self._last_snapshot, "lineno")[:TOP_ALLOCATORS]]
+        self._last_snapshot = snapshot
+
+        memory_dir = self.bundle_dir / "memory"
+        memory_dir.mkdir(exist_ok=True)
+        with open(memory_dir / f"{self._count:03d}_{_safe_name(label)}.txt", "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def wrap(self, func, name: str | None = None):
+        """Returns func running inside action(); for thread targets started outside Tk."""
+        def run(*args, **kwargs):
+            with self.action(name or func.__name__):
+                return func(*args, **kwargs)
+        return run
+
+    def install_tk_hook(self):
+        """Runs every Tk callback inside action(), named after the function it calls."""
+        if self._original_call is not None:
+            return
+        original = self._original_call = tkinter.CallWrapper.__call__
+        session = self
+
+        def __call__(wrapper, *args):
+            with session.action(_callback_name(wrapper.func)):
+                return original(wrapper, *args)
+
+        tkinter.CallWrapper.__call__ = __call__
+
+    def finish(self):
+        """Restores Tk, takes a last snapshot and writes the session totals. Returns the bundle folder."""
+        if self._original_call is not None:
+            tkinter.CallWrapper.__call__ = self._original_call
+            self._original_call = None
+        self.snapshot("exit")
+        tracemalloc.stop()
+
+        if self.stats is not None:
+            self.stats.dump_stats(self.bundle_dir / "session.prof")
+            out = io.StringIO()
+            self.stats.stream = out
+            for key in ("cumulative", "tottime"):
+                out.write(f"=== Sorted by {key} ===\n")
+                self.stats.sort_stats(key).print_stats(40)
+            with open(self.bundle_dir / "session_top.txt", "w", encoding="utf-8") as f:
+                f.write(out.getvalue())
+
+        with open(self.bundle_dir / "actions.txt", "w", encoding="utf-8") as f:
+            f.write(f"Actions slower than {SLOW_ACTION_MS} ms\nstarted\tms\taction\tprofile\n")
+            for started, name, ms, prof_file in self.slow_actions:
+                f.write(f"{started:%H:%M:%S.%f}\t{ms:.1f}\t{name}\t{prof_file}\n")
+            f.write("\nAll actions\ncount\ttotal ms\tmax ms\taction\n")
+            for name, (count, total, longest) in sorted(self.totals.items(), key=lambda item: -item[1][1]):
+                f.write(f"{count}\t{total:.1f}\t{longest:.1f}\t{name}\n")
+        print(f"Profile saved to {self.bundle_dir}")
+        return self.bundle_dir
+
+
+def start_session(bundle_dir=None) -> ProfileSession:
+    global _session
+    if _session is None:
+        _session = ProfileSession(bundle_dir)
+    return _session
+
+
+def stop_session():
+    global _session
+    session, _session = _session, None
+    return session.finish() if session is not None else None
@@ -0,0 +1,131 @@
+import bisect
+from collections import defaultdict
+from typing import Any, Hashable, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+def tokenize(value: Any) -> list[str]:
+    """
+    Splits a cell value into lowercased search tokens.
+    Excel-style numbers ('25030103001.0') are cleaned so matric numbers match as typed.
+    """
+    if value is None:
+        return []
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return []
+        if value.is_integer():
+            value = int(value)
+    text = str(value).strip().lower()
+    if text.endswith(".0") and text[:-2].isdigit():
+        text = text[:-2]
+    return text.split()
+
+
+def lowered_cells(rows) -> np.ndarray:
+    """Cell texts of a dataframe (or list of rows) as a lowercased array, so substring searches can be repeated cheaply."""
+    frame = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows)
+    if frame.empty:
+        return np.empty((len(frame), 0), dtype=str)
+    return np.char.lower(frame.fillna("").astype(str).to_numpy(dtype=str))
+
+
+def cells_containing(lowered: np.ndarray, query: str) -> list[tuple[int, int]]:
+    """(row, col) of every cell of lowered_cells() containing query, in reading order."""
+    if lowered.size == 0 or not query:
+        return []
+    rows, cols = np.nonzero(np.char.find(lowered, query.lower()) >= 0)
+    return list(zip(rows.tolist(), cols.tolist()))
+
+
+def _token_of(entry: tuple) -> str:
+    return entry[0]
+
+
+class PrefixIndex:
+    """
+    A prefix index over tokens -> keys.
+    Tokens are kept in one sorted list so a prefix lookup is two binary searches,
+    no matter how many entries there are. Keys can be anything hashable
+    (a (row, col) cell, a (level, row) pair, ...).
+    """
+    def __init__(self):
+        self._entries: list[tuple[str, Hashable]] = []   # Sorted (token, key) pairs
+        self._tokens_by_key: dict[Hashable, list[str]] = defaultdict(list)
+        self._sorted = True
+
+    def __len__(self):
+        return len(self._tokens_by_key)
+
+    def add(self, key: Hashable, value: Any):
+        """Indexes every token of value under key. Cheap for bulk loads: sorting is deferred."""
+        for token in tokenize(value):
+            self._entries.append((token, key))
+            self._tokens_by_key[key].append(token)
+            self._sorted = False
+
+    def remove(self, key: Hashable):
+        """Drops every token indexed under key."""
+        tokens = self._tokens_by_key.pop(key, [])
+        if not tokens:
+            return
+        self._ensure_sorted()
+        for token in tokens:
+            pos = bisect.bisect_left(self._entries, token, key=_token_of)
+            while pos < len(self._entries) and self._entries[pos][0] == token:
+                if self._entries[pos][1] == key:
+                    del self._entries[pos]
+                    break
+                pos += 1
+
+    def update(self, key: Hashable, value: Any):
+        """Re-indexes key with a new value (e.g. after a cell edit)."""
+        self.remove(key)
+        self._ensure_sorted()
+        for token in tokenize(value):
+            bisect.insort(self._entries, (token, key), key=_token_of)
+            self._tokens_by_key[key].append(token)
+
+    def search(self, prefix: str) -> set:
+        """Returns the keys that have at least one token starting with prefix."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return set()
+        self._ensure_sorted()
+        start = bisect.bisect_left(self._entries, prefix, key=_token_of)
+        end = bisect.bisect_left(self._entries, prefix + "\uffff", key=_token_of)
+        return {key for _, key in self._entries[start:end]}
+
+    def search_all(self, words: Iterable[str], group=None) -> set:
+        """
+        Returns the keys matching every word.
+        If group is given, words only need to match within the same group(key)
+        (e.g. the same row across several columns); the keys matching the first word are returned.
+        """
+        words = [w for w in words if w.strip()]
+        if not words:
+            return set()
+        first = self.search(words[0])
+        if len(words) == 1:
+            return first
+        if group is None:
+            for word in words[1:]:
+                first &= self.search(word)
+            return first
+
+        allowed = {group(key) for key in first}
+        for word in words[1:]:
+            allowed &= {group(key) for key in self.search(word)}
+        return {key for key in first if group(key) in allowed}
+
+    def key_matches(self, key: Hashable, prefix: str) -> bool:
+        """True if the key has a token starting with prefix (used to narrow earlier results)."""
+        prefix = prefix.strip().lower()
+        return any(token.startswith(prefix) for token in self._tokens_by_key.get(key, ()))
+
+    def _ensure_sorted(self):
+        if not self._sorted:
+            self._entries.sort(key=_token_of)
+            self._sorted = True
@@ -0,0 +1,164 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from internal.utils.general import _get_documents_folder
+
+# ATTENDANCE_TRACE=1 traces the whole run and writes the trace on exit,
+# ATTENDANCE_TRACE=<file.json> does the same into that file.
+_env = os.environ.get("ATTENDANCE_TRACE", "")
+
+_enabled = False
+_lock = threading.Lock()
+_events: list[dict] = []
+_output: Path | None = None
+_origin = time.perf_counter_ns()
+
+
+def trace_path() -> Path:
+    return _get_documents_folder() / "ATTENDANCE_MTU" / "logs" / f"trace-{datetime.now():%Y%m%d-%H%M%S}.json"
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable(output=None):
+    """Starts recording spans. dump() writes them to output (default: a new file under Documents/ATTENDANCE_MTU/logs)."""
+    global _enabled, _output
+    _output = Path(output) if output else None
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def file_size(path) -> int | None:
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return None
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        # Callables are details that cost something to find (a stat), only worked out when tracing
+        self.args = {k: v() if callable(v) else v for k, v in args.items()}
+        self.start = 0
+
+    def set(self, **args):
+        """Adds details found while the span runs, e.g. the row count once the file is read."""
+        self.args.update(args)
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = f"{exc_type.__name__}: {exc}"
+        event = {
+            "name": self.name,
+            "ph": "X",
+            "ts": (self.start - _origin) / 1000,   # Chrome wants microseconds
+            "dur": (end - self.start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {k: v if isinstance(v, (int, float, bool)) or v is None else str(v)
+                     for k, v in self.args.items()},
+        }
+        with _lock:
+            _events.append(event)
+        return False
+
+
+class _NoSpan:
+    """Returned while tracing is off, so instrumented code pays for one flag check."""
+    __slots__ = ()
+
+    def set(self, **args):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str, **args):
+    """
+    Times the with-block as a span named name. Spans opened inside it nest under it.
+    Arguments given as callables are only called when tracing is on.
+        with tracing.span("read_csv", file=path, bytes=lambda: tracing.file_size(path)) as s:
+            ...
+            s.set(rows=len(df))
+    """
+    if not _enabled:
+        return _NO_SPAN
+    return _Span(name, args)
+
+
+def traced(name: str | None = None):
+    """Decorator version of span(); the span is named after the function unless name is given."""
+    def decorate(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def events() -> list[dict]:
+    with _lock:
+        return list(_events)
+
+
+def clear():
+    with _lock:
+        _events.clear()
+
+
+def dump(path=None) -> Path | None:
+    """Writes the recorded spans as a Chrome trace_event file (open it in chrome://tracing or Perfetto)."""
+    recorded = events()
+    if not recorded:
+        return None
+    path = Path(path or _output or trace_path())
+    thread_names = {t.ident: t.name for t in threading.enumerate()}
+    metadata = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                 "args": {"name": thread_names.get(tid, f"thread {tid}")}}
+                for tid in {e["tid"] for e in recorded}]
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + recorded, "displayTimeUnit": "ms"}, f)
+        print(f"Trace written to {path}")
+        return path
+    except Exception as e:
+        print(f"Could not write trace: {e}")
+        return None
+
+
+if _env and _env != "0":
+    enable(None if _env == "1" else _env)
+    atexit.register(dump)
@@ -0,0 +1,158 @@
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from internal.utils.general import _get_documents_folder
+
+# Frames from files under this folder count as "our" code when naming the operation
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+
+def stall_log_path() -> Path:
+    return _get_documents_folder() / "ATTENDANCE_MTU" / "logs" / "ui_stalls.log"
+
+
+def read_stall_log(max_entries: int = 50) -> list[str]:
+    """Returns the lines of the last max_entries stalls, newest first."""
+    path = stall_log_path()
+    if not path.exists():
+        return []
+    entries, current = [], []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.startswith("=== ") and current:
+                entries.append(current)
+                current = []
+            current.append(line.rstrip("\n"))
+    if current:
+        entries.append(current)
+    lines = []
+    for entry in reversed(entries[-max_entries:]):
+        lines.extend(entry)
+    return lines
+
+
+def clear_stall_log():
+    path = stall_log_path()
+    if path.exists():
+        path.unlink()
+
+
+def _operation_of(frame) -> str:
+    """Names the innermost function from our own code in a stack, e.g. 'show_records (records_gui.py:120)'."""
+    found = None
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(PROJECT_ROOT) and filename != os.path.abspath(__file__):
+            found = f"{frame.f_code.co_name} ({os.path.basename(filename)}:{frame.f_lineno})"
+            break
+        frame = frame.f_back
+    return found or "Tk internals"
+
+
+class StallWatchdog:
+    """
+    Reports UI freezes.
+
+    The Tk thread re-arms a heartbeat with after() every interval_ms. A background thread
+    checks how late the next beat is; once it is more than threshold_ms late the main
+    thread is stuck in a handler, so its stack is captured with sys._current_frames().
+    When the loop catches up, the stall is written to the log with its duration, the
+    window that was active and the function that was running.
+    """
+    def __init__(self, app, threshold_ms: int = 150, interval_ms: int = 50, log_path: Path | None = None):
+        self.app = app
+        self.threshold = threshold_ms / 1000
+        self.interval_ms = interval_ms
+        self.log_path = log_path or stall_log_path()
+        self._stop = threading.Event()
+        self._thread = None
+        self._job = None
+        self._expected = 0.0          # When the next heartbeat should run
+        self._window = ""             # Title of the focused window at the last heartbeat
+        self._stall = None            # Details captured while a stall is in progress
+        self._main_id = threading.main_thread().ident
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._beat()
+        self._thread = threading.Thread(target=self._watch, name="ui-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._job is not None:
+            try:
+                self.app.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    # --- Tk thread ---
+
+    def _beat(self):
+        self._window = self._active_window()
+        self._expected = time.perf_counter() + self.interval_ms / 1000
+        if not self._stop.is_set():
+            self._job = self.app.after(self.interval_ms, self._beat)
+
+    def _active_window(self) -> str:
+        try:
+            widget = self.app.focus_get()
+            return widget.winfo_toplevel().title() if widget else self.app.title()
+        except Exception:
+            # focus_get() fails while some native dialogs are open
+            return "?"
+
+    # --- Watchdog thread ---
+
+    def _watch(self):
+        poll = max(self.interval_ms / 2000, 0.01)
+        while not self._stop.wait(poll):
+            late = time.perf_counter() - self._expected
+            if self._stall is None and late > self.threshold:
+                self._capture(late)
+            elif self._stall is not None and late < self.threshold:
+                # The loop caught up: the expected beat moved on, so the stall is over
+                self._finish()
+        if self._stall is not None:
+            self._finish()
+
+    def _capture(self, late: float):
+        frame = sys._current_frames().get(self._main_id)
+        self._stall = {
+            "started": datetime.now() - timedelta(seconds=late),
+            "expected": self._expected,
+            "window": self._window,
+            "operation": _operation_of(frame),
+            "stack": "".join(traceback.format_stack(frame)) if frame is not None else "",
+        }
+
+    def _finish(self):
+        stall, self._stall = self._stall, None
+        # The beat that ended the stall ran interval_ms before the new expected time
+        resumed = self._expected - self.interval_ms / 1000
+        duration_ms = max(0.0, resumed - stall["expected"]) * 1000
+        if duration_ms < self.threshold * 1000:
+            duration_ms = self.threshold * 1000
+        self._write(stall, duration_ms)
+
+    def _write(self, stall: dict, duration_ms: float):
+        header = (f"=== {stall['started']:%Y-%m-%d %H:%M:%S}  stall {duration_ms:.0f} ms  "
+                  f"window: {stall['window']}  operation: {stall['operation']}")
+        try:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(f"{header}\n{stall['stack']}\n")
+        except Exception as e:
+            print(f"Could not write stall log: {e}")
@@ -0,0 +1,131 @@
+import customtkinter as ctk
+
+
+class WidgetPool:
+    """
+    Keeps widgets around for reuse instead of destroying and recreating them.
+    CustomTkinter widgets are slow to build, reconfiguring an existing one is cheap.
+    """
+    def __init__(self, factory):
+        self.factory = factory    # Called with no arguments to build a new widget
+        self.active = []
+        self._free = []
+
+    def acquire(self, **config):
+        """Returns a free widget (or a new one) configured with config. The caller places it."""
+        widget = self._free.pop() if self._free else self.factory()
+        if config:
+            widget.configure(**config)
+        self.active.append(widget)
+        return widget
+
+    def release_all(self):
+        """Hides every active widget and keeps it for the next acquire()."""
+        for widget in self.active:
+            manager = widget.winfo_manager()
+            if manager == "pack":
+                widget.pack_forget()
+            elif manager == "grid":
+                widget.grid_forget()
+            elif manager == "place":
+                widget.place_forget()
+        # Reversed so the next round hands them out in the same order
+        self._free.extend(reversed(self.active))
+        self.active = []
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Scrollable list of clickable rows that only builds as many rows as fit on screen.
+    Scrolling reconfigures those rows with the next items, so the widget count stays
+    the same whether the list holds ten items or ten thousand.
+
+    formatter(item) -> str is only called for the rows being shown.
+    command(item) is called when a row is clicked.
+    """
+    def __init__(self, master, visible_rows=10, row_height=28, formatter=str, command=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.visible_rows = visible_rows
+        self.formatter = formatter
+        self.command = command
+        self.items = []
+        self.offset = 0
+        self.selected = None
+        self._texts = {}    # index -> formatted text, so scrolling back doesn't re-format
+
+        self.grid_columnconfigure(0, weight=1)
+        self.rows = []
+        for i in range(visible_rows):
+            btn = ctk.CTkButton(self, text="", height=row_height, anchor="w", fg_color="transparent",
+                                border_width=1, text_color=("gray10", "gray90"),
+                                command=lambda i=i: self._on_click(i))
+            btn.bind("<MouseWheel>", self._on_mousewheel, add="+")
+            btn.bind("<Button-4>", lambda e: self.scroll(-1), add="+")
+            btn.bind("<Button-5>", lambda e: self.scroll(1), add="+")
+            self.rows.append(btn)
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, rowspan=visible_rows, sticky="ns")
+
+        self.lbl_empty = ctk.CTkLabel(self, text="")
+
+    def set_items(self, items, empty_text="No items."):
+        self.items = list(items)
+        self._texts = {}
+        self.offset = 0
+        self.selected = None
+        self.lbl_empty.configure(text=empty_text)
+        if self.items:
+            self.lbl_empty.grid_forget()
+        else:
+            self.lbl_empty.grid(row=0, column=0, pady=10)
+        self._refresh()
+
+    def scroll(self, delta):
+        self.scroll_to(self.offset + delta)
+
+    def scroll_to(self, offset):
+        max_offset = max(0, len(self.items) - self.visible_rows)
+        self.offset = max(0, min(int(offset), max_offset))
+        self._refresh()
+
+    def _text(self, index):
+        if index not in self._texts:
+            self._texts[index] = self.formatter(self.items[index])
+        return self._texts[index]
+
+    def _refresh(self):
+        for i, btn in enumerate(self.rows):
+            index = self.offset + i
+            if index < len(self.items):
+                is_selected = self.selected is not None and self.items[index] == self.selected
+                btn.configure(text=self._text(index),
+                              fg_color=("gray75", "gray25") if is_selected else "transparent")
+                if not btn.winfo_manager():
+                    btn.grid(row=i, column=0, sticky="ew", padx=(0, 5), pady=2)
+            elif btn.winfo_manager():
+                btn.grid_forget()
+
+        if len(self.items) > self.visible_rows:
+            start = self.offset / len(self.items)
+            self.scrollbar.set(start, start + self.visible_rows / len(self.items))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _on_click(self, row):
+        index = self.offset + row
+        if index >= len(self.items):
+            return
+        self.selected = self.items[index]
+        self._refresh()
+        if self.command:
+            self.command(self.selected)
+
+    def _on_scrollbar(self, *args):
+        if args and args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * len(self.items)))
+        elif args and args[0] == "scroll":
+            self.scroll(int(args[1]))
+
+    def _on_mousewheel(self, event):
+        self.scroll(-1 if event.delta > 0 else 1)
@@ -0,0 +1,66 @@
+from internal.utils import profiling
+
+
+class ReusableWindow:
+    """
+    Mixin for Toplevels that the main menu keeps alive between visits.
+    close() hides the window when it is cached and destroys it otherwise,
+    refresh() reloads whatever data may have changed while it was hidden.
+    """
+    keep_alive = False
+
+    def refresh(self):
+        pass
+
+    def reshow(self):
+        self.refresh()
+        self.deiconify()
+        self.lift()
+        self.focus_force()
+
+    def close(self):
+        profiling.window_event("close", self)
+        if self.keep_alive:
+            self.grab_release()
+            self.withdraw()
+        else:
+            self.destroy()
+
+
+class WindowCache:
+    """
+    Keeps one instance of each main-menu window so reopening it only refreshes its data.
+    Windows are built by the factory the first time (or in the background with prebuild)
+    and shown again with reshow() afterwards.
+    """
+    def __init__(self):
+        self._windows = {}
+
+    def _alive(self, key):
+        window = self._windows.get(key)
+        try:
+            return window if window is not None and window.winfo_exists() else None
+        except Exception:
+            return None
+
+    def show(self, key, factory):
+        """Shows the cached window for key, building it with factory() if there is none."""
+        window = self._alive(key)
+        if window is not None:
+            window.reshow()
+        else:
+            window = factory()
+            window.keep_alive = True
+            self._windows[key] = window
+        profiling.window_event("open", window)
+        return window
+
+    def prebuild(self, key, factory):
+        """Builds the window now and keeps it hidden until show() is called."""
+        if self._alive(key) is not None:
+            return
+        window = factory()
+        window.keep_alive = True
+        window.grab_release()
+        window.withdraw()
+        self._windows[key] = window
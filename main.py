@@ -1,27 +1,46 @@
 import threading
+from internal.utils import profiling
 from internal.maintain.prepare import prepare_attendance_files
-from internal.maintain.maintain import maintain_student_data_files
+from internal.maintain.maintain import maintain_student_data_files, perform_daily_backup
+from internal.dashboard import dashboard_func  # Keeps the dashboard's session summary current from the first write
 from root import AttendanceApp
 
 # this ensures that the appliaction is run as a file and connot be  imported as a module form another package 
 if __name__ == "__main__":
+    # Started with --profile (or ATTENDANCE_PROFILE=1): everything below runs under cProfile and
+    # the bundle lands in Documents/ATTENDANCE_MTU/profiles when the app closes
+    session = profiling.start_session() if profiling.profiling_requested() else None
+    run = session.wrap if session else (lambda func: func)
+
+    # Back up db before the threads below start changing it
+    perform_daily_backup()
+
     #runs a background thread to mainitain the student data files (you can always check the function)
-    maintain_thread = threading.Thread(target=maintain_student_data_files)
+    maintain_thread = threading.Thread(target=run(maintain_student_data_files))
     maintain_thread.daemon = True  # Allows the main app to exit even if the thread is running
     maintain_thread.start()
     
     #concurently like golang sharp
     #Runs file prepartion in the background which helps in making sure that the the GUI doens not lag simple 
     #Wait why am i now using aync in flet when this one exists maybe it is not compatible with FLET --- I hate this library just a Fultter Abstraction
-    prepare_thread = threading.Thread(target=prepare_attendance_files)
+    prepare_thread = threading.Thread(target=run(prepare_attendance_files))
     prepare_thread.daemon = True
     prepare_thread.start()
 
     #instatiate the application would have been nbettter if done this in gui.root what am i even saying you can import vairables form anther apcakage this sii snot golang
     #ok assisng app to the function is inusty standard on cusotom tkinter but i am goin go break that right now bro
-    myapp = AttendanceApp()
+    if session:
+        with session.action("startup"):
+            myapp = AttendanceApp()
+        session.snapshot("startup")
+        session.install_tk_hook()
+    else:
+        myapp = AttendanceApp()
     #Started below
-    myapp.mainloop()
+    try:
+        myapp.mainloop()
+    finally:
+        profiling.stop_session()
     #Who changes app to myappp !!!
     #ohhh
 
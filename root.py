@@ -1,4 +1,11 @@
+import os
 import customtkinter as ctk
+from internal.windowcache import WindowCache
+from internal.utils import events
+from internal.utils.watchdog import StallWatchdog
+from internal.settings.settings_func import load_settings
+from internal.search.search_func import student_directory
+from internal.search.search_gui import StudentSearchBox
 
 # --- Global CustomTkinter Settings ---
 # These settings apply to the entire application and can be easily changed.
@@ -22,7 +29,7 @@ class AttendanceApp(ctk.CTk):
         super().__init__()
         # --- 1. Main Window Configuration ---
         self.title("Attendance Tracker - Main Menu")
-        self.geometry("500x550")
+        self.geometry("500x850")
         self.minsize(400, 450)
 
         # Configure the main window's grid layout to center the content.
@@ -34,41 +41,124 @@ class AttendanceApp(ctk.CTk):
         self.title_label = ctk.CTkLabel(self, text=" MTU Attendance Tracker Beta v0.0.1", font=ctk.CTkFont(size=24, weight="bold"))
         self.title_label.grid(row=1, column=0, padx=20, pady=20)
 
-        # --- 3. Menu Buttons ---
+        # --- 3. Student Search ---
+        # Typeahead over every student; the index is built in the background below.
+        self.search_box = StudentSearchBox(self, on_view=self.open_student_row, on_history=self.open_student_history)
+        self.search_box.grid(row=2, column=0, padx=40, pady=(0, 10), sticky="ew")
+        student_directory.build_in_background()
+
+        # --- 4. Menu Buttons ---
         # Each button corresponds to a major feature of the application.
         # Clicking a button will close the main menu and open the respective window.
 
         self.register_button = ctk.CTkButton(self, text="Register New Students", command=self.open_register_window)
-        self.register_button.grid(row=2, column=0, padx=40, pady=10, sticky="ew")
+        self.register_button.grid(row=3, column=0, padx=40, pady=10, sticky="ew")
 
         self.edit_students_button = ctk.CTkButton(self, text="Edit Students Data", command=self.open_edit_students_window)
-        self.edit_students_button.grid(row=3, column=0, padx=40, pady=10, sticky="ew")
+        self.edit_students_button.grid(row=4, column=0, padx=40, pady=10, sticky="ew")
 
 
         self.add_attendance_button = ctk.CTkButton(self, text="Add Attendance", command=self.open_add_attendance_window)
-        self.add_attendance_button.grid(row=4, column=0, padx=40, pady=10, sticky="ew")
+        self.add_attendance_button.grid(row=5, column=0, padx=40, pady=10, sticky="ew")
 
         self.edit_attendace_button = ctk.CTkButton(self, text="Edit Attendace", command=self.open_edit_attendance_window)
-        self.edit_attendace_button.grid(row=5, column=0, padx=40, pady=10, sticky="ew")
+        self.edit_attendace_button.grid(row=6, column=0, padx=40, pady=10, sticky="ew")
+
+        self.correct_mark_button = ctk.CTkButton(self, text="Correct a Mark", command=self.open_correct_mark_window)
+        self.correct_mark_button.grid(row=7, column=0, padx=40, pady=10, sticky="ew")
 
 
         self.view_attendance_button = ctk.CTkButton(self, text="View Attendance", command=self.open_viewer_window)
-        self.view_attendance_button.grid(row=6, column=0, padx=40, pady=10, sticky="ew")
+        self.view_attendance_button.grid(row=8, column=0, padx=40, pady=10, sticky="ew")
 
         self.print_attendees_button = ctk.CTkButton(self, text="Print Attendees", command=self.open_attendees_viewer_window)
-        self.print_attendees_button.grid(row=7, column=0, padx=40, pady=10, sticky="ew")
+        self.print_attendees_button.grid(row=9, column=0, padx=40, pady=10, sticky="ew")
 
         self.print_absentees_button = ctk.CTkButton(self, text="Print Absentees", command=self.open_absentees_viewer_window)
-        self.print_absentees_button.grid(row=8, column=0, padx=40, pady=10, sticky="ew")
+        self.print_absentees_button.grid(row=10, column=0, padx=40, pady=10, sticky="ew")
 
         self.frequency_button = ctk.CTkButton(self, text="Frequency Analysis", command=self.open_frequency_window)
-        self.frequency_button.grid(row=9, column=0, padx=40, pady=10, sticky="ew")
+        self.frequency_button.grid(row=11, column=0, padx=40, pady=10, sticky="ew")
+
+        self.streaks_button = ctk.CTkButton(self, text="Absence Streaks", command=self.open_streaks_window)
+        self.streaks_button.grid(row=12, column=0, padx=40, pady=10, sticky="ew")
+
+        self.ranking_button = ctk.CTkButton(self, text="Attendance Ranking", command=self.open_ranking_window)
+        self.ranking_button.grid(row=13, column=0, padx=40, pady=10, sticky="ew")
 
-        self.settings_button = ctk.CTkButton(self, text="Settings", command=self.placeholder_command)
-        self.settings_button.grid(row=10, column=0, padx=40, pady=10, sticky="ew")
+        self.history_button = ctk.CTkButton(self, text="Student History", command=self.open_history_window)
+        self.history_button.grid(row=14, column=0, padx=40, pady=10, sticky="ew")
+
+        self.dashboard_button = ctk.CTkButton(self, text="Dashboard", command=self.open_dashboard_window)
+        self.dashboard_button.grid(row=15, column=0, padx=40, pady=10, sticky="ew")
+
+        self.settings_button = ctk.CTkButton(self, text="Settings", command=self.open_settings_window)
+        self.settings_button.grid(row=16, column=0, padx=40, pady=10, sticky="ew")
 
         self.restore_button = ctk.CTkButton(self, text="Restore Database Backup", command=self.open_revert_window, fg_color="#7743F2", hover_color="#B71C1C")
-        self.restore_button.grid(row=11, column=0, padx=40, pady=10, sticky="ew")
+        self.restore_button.grid(row=17, column=0, padx=40, pady=10, sticky="ew")
+
+        # --- 5. Window Cache ---
+        # Windows opened from the menu, and the viewers and reports opened from its file
+        # pickers, are hidden instead of destroyed when closed, so going back to them only
+        # refreshes their data. The most used pickers are built in the background once the
+        # menu is up; they start parsing files only when shown.
+        self.windows = WindowCache()
+        self._prebuild_queue = [
+            ("add_attendance", self._make_add_attendance_window),
+            ("attendees", self._make_attendees_window),
+            ("absentees", self._make_absentees_window),
+        ]
+        self.after(500, self._prebuild_next)
+
+        # --- 6. Change Notifications ---
+        # Writers may run on background threads; open windows get their updates from here.
+        self.after(100, self._pump_events)
+
+        # --- 7. Freeze Watchdog ---
+        # Off by default; switched on from Settings or with ATTENDANCE_WATCHDOG=1
+        self.watchdog = None
+        settings = load_settings()
+        enabled = settings["watchdog_enabled"] or os.environ.get("ATTENDANCE_WATCHDOG") == "1"
+        self.configure_watchdog(enabled, settings["watchdog_threshold_ms"])
+
+    def configure_watchdog(self, enabled, threshold_ms=150):
+        """Starts, restarts (new threshold) or stops the UI freeze watchdog."""
+        if self.watchdog is not None:
+            self.watchdog.stop()
+            self.watchdog = None
+        if enabled:
+            self.watchdog = StallWatchdog(self, threshold_ms=threshold_ms)
+            self.watchdog.start()
+
+    def _pump_events(self):
+        """Delivers queued change notifications to open windows on the Tk thread."""
+        events.pump()
+        self.after(100, self._pump_events)
+
+    def _prebuild_next(self):
+        """Builds one queued window per idle slot so the menu stays responsive."""
+        if not self._prebuild_queue:
+            return
+        key, factory = self._prebuild_queue.pop(0)
+        try:
+            self.windows.prebuild(key, factory)
+        except Exception as e:
+            print(f"Could not prebuild {key} window: {e}")
+        self.after(200, self._prebuild_next)
+
+    def _make_add_attendance_window(self):
+        # We import here to avoid a circular import at the module level.
+        from internal.attendance.create.create_gui import AddAttendanceWindow
+        return AddAttendanceWindow(self)
+
+    def _make_attendees_window(self):
+        from internal.records.attendees.attendees import ChooseAttendeesFileWindow
+        return ChooseAttendeesFileWindow(self)
+
+    def _make_absentees_window(self):
+        from internal.records.absentees.absentees import ChooseAbsenteeFileWindow
+        return ChooseAbsenteeFileWindow(self)
 
 
     def open_register_window(self): 
@@ -85,21 +175,26 @@ class AttendanceApp(ctk.CTk):
         Closes the main menu and opens the add attendance window.
         """
         self.withdraw()
-        # We import here to avoid a circular import at the module level.
-        from internal.attendance.create.create_gui import AddAttendanceWindow
-        AddAttendanceWindow(self)
+        self.windows.show("add_attendance", self._make_add_attendance_window)
 
     def open_edit_attendance_window(self):
         """
         Opens the window which is used in editing the Attendance in DB/Attendance
         """
         from internal.attendance.edit.edit_gui import ChooseEditorFileWindow
-        ChooseEditorFileWindow(self)
+        self.windows.show("editor", lambda: ChooseEditorFileWindow(self))
+    
+    def open_correct_mark_window(self):
+        """
+        Closes the main menu and opens the dialog for fixing a single mark.
+        """
+        self.withdraw()
+        from internal.attendance.edit.correct_gui import CorrectMarkWindow
+        self.windows.show("correct_mark", lambda: CorrectMarkWindow(self))
     
     def open_attendees_viewer_window(self):
         self.withdraw()
-        from internal.records.attendees.attendees import ChooseAttendeesFileWindow
-        ChooseAttendeesFileWindow(self)
+        self.windows.show("attendees", self._make_attendees_window)
 
 
     def open_viewer_window(self):
@@ -109,7 +204,7 @@ class AttendanceApp(ctk.CTk):
         #self.withdraw()
         # We import here to avoid a circular import at the module level.
         from internal.attendance.view.viewer_gui import ChooseViewerFileWindow
-        ChooseViewerFileWindow(self)  #
+        self.windows.show("viewer", lambda: ChooseViewerFileWindow(self))
         
     def open_edit_students_window(self):
         """
@@ -125,8 +220,7 @@ class AttendanceApp(ctk.CTk):
         Closes the main menu and opens the window to choose an attendance file for absentee printing.
         """
         self.withdraw()
-        from internal.records.absentees.absentees import ChooseAbsenteeFileWindow
-        ChooseAbsenteeFileWindow(self)
+        self.windows.show("absentees", self._make_absentees_window)
 
     def open_frequency_window(self):
         """
@@ -134,7 +228,61 @@ class AttendanceApp(ctk.CTk):
         """
         self.withdraw()
         from internal.frequency.freq_gui import ChooseFrequencyFileWindow
-        ChooseFrequencyFileWindow(self)
+        self.windows.show("frequency", lambda: ChooseFrequencyFileWindow(self))
+
+    def open_streaks_window(self):
+        """
+        Closes the main menu and opens the absence streak report.
+        """
+        self.withdraw()
+        from internal.streaks.streaks_gui import ChooseStreakFileWindow
+        self.windows.show("streaks", lambda: ChooseStreakFileWindow(self))
+
+    def open_ranking_window(self):
+        """
+        Closes the main menu and opens the top attendees / low attendance ranking.
+        """
+        self.withdraw()
+        from internal.ranking.ranking_gui import RankingWindow
+        self.windows.show("ranking", lambda: RankingWindow(self))
+
+    def open_history_window(self):
+        """
+        Closes the main menu and opens the student history cards.
+        """
+        self.withdraw()
+        from internal.history.history_gui import HistoryCardWindow
+        return self.windows.show("history", lambda: HistoryCardWindow(self))
+
+    def open_student_row(self, student):
+        """
+        Closes the main menu and opens the viewer at a student found with the search box: their row
+        in the level's attendance file, or in the student list if they are not in an attendance file yet.
+        """
+        self.withdraw()
+        from internal.attendance.excel import ExcelWindow
+        from internal.history.history_func import matric_index
+        locations = matric_index.locate(student['Matric NO'])
+        # The same level first, a student can appear in more than one
+        locations.sort(key=lambda loc: os.path.splitext(os.path.basename(loc[0]))[0] != student['Level'])
+        file_path, line_no = locations[0] if locations else (student['file'], student['line'])
+        viewer = self.windows.show(f"view:{os.path.abspath(file_path)}", lambda: ExcelWindow(self, file_path, editable=False))
+        if not viewer.show_line(line_no):
+            viewer.table.status_label.configure(text=f"{student['Matric NO']} not found in this file")
+
+    def open_student_history(self, student):
+        """
+        Closes the main menu and opens the history card of a student found with the search box.
+        """
+        self.open_history_window().show_matric(student['Matric NO'])
+
+    def open_dashboard_window(self):
+        """
+        Closes the main menu and opens the turnout dashboard.
+        """
+        self.withdraw()
+        from internal.dashboard.dashboard_gui import DashboardWindow
+        self.windows.show("dashboard", lambda: DashboardWindow(self))
 
     def open_revert_window(self):
         """
@@ -142,7 +290,15 @@ class AttendanceApp(ctk.CTk):
         """
         self.withdraw()
         from internal.revertdb import RevertDBWindow
-        RevertDBWindow(self)
+        self.windows.show("revert", lambda: RevertDBWindow(self))
+
+    def open_settings_window(self):
+        """
+        Closes the main menu and opens the settings window.
+        """
+        self.withdraw()
+        from internal.settings.settings_gui import SettingsWindow
+        self.windows.show("settings", lambda: SettingsWindow(self))
 
     def placeholder_command(self):
         """
@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+import numpy as np
+
+from benchmarks.generate import generate_db
+from internal.attendance.create.create_func import prepare_attendance_files, update_attendance_sheet
+from internal.attendance.edit.edit_func import save_cell_changes
+from internal.frequency import freq_func
+from internal.frequency.aggregates import aggregate_store, month_bounds
+from internal.frequency.freq_func import ABSENT_MARKS, PRESENT_MARKS, calculate_frequency
+from internal.records.records_func import load_attendance_matrix
+from internal.utils.file_cache import file_cache
+
+RANGES = [
+    (date.min, date.max),
+    (date(2026, 2, 1), date(2026, 3, 31)),     # Whole months only
+    (date(2026, 1, 20), date(2026, 3, 10)),    # Partial months at both ends
+    (date(2026, 2, 3), date(2026, 2, 17)),     # Inside one month
+]
+
+
+class TestMonthBounds(unittest.TestCase):
+    def test_whole_months_inside_the_range(self):
+        first, last = month_bounds(date(2026, 1, 20), date(2026, 3, 31))
+        self.assertEqual((str(first), str(last)), ("2026-02", "2026-03"))
+        first, last = month_bounds(date(2026, 2, 1), date(2026, 2, 27))
+        self.assertGreater(first, last)
+
+
+class TestAggregates(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        generate_db(self.test_dir, ("100level",), students_per_level=100, sessions=30)  # 2 not on the sheet yet
+        self.cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        self.path = os.path.join("db", "attendance", "100level.csv")
+        file_cache.invalidate()
+        aggregate_store.invalidate()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.test_dir)
+
+    def assert_matches_raw_counts(self):
+        matrix = load_attendance_matrix(self.path)
+        for start, end in RANGES:
+            for marks in (PRESENT_MARKS, ABSENT_MARKS):
+                expected = matrix.count(marks, matrix.session_mask(start, end))
+                got = [r['Count'] for r in calculate_frequency(self.path, start, end, marks)]
+                np.testing.assert_array_equal(got, expected, err_msg=f"{start}..{end}")
+
+    def level(self):
+        return aggregate_store.get(self.path, lambda p: self.fail("the totals were rebuilt"))
+
+    def test_matches_counting_the_marks(self):
+        self.assert_matches_raw_counts()
+
+    def test_whole_months_do_not_read_the_marks(self):
+        calculate_frequency(self.path, date.min, date.max, PRESENT_MARKS)
+        with patch.object(freq_func, "get_attendance_matrix", side_effect=AssertionError("marks were read")):
+            calculate_frequency(self.path, date(2026, 2, 1), date(2026, 3, 31), PRESENT_MARKS)
+
+    def test_new_session_updates_the_totals(self):
+        calculate_frequency(self.path, date.min, date.max, PRESENT_MARKS)
+        level = self.level()
+        update_attendance_sheet("100level.csv", "PMCH", "15/02/26", "", ["2100000", "2100003"])
+        self.assertIs(self.level(), level)
+        self.assert_matches_raw_counts()
+
+    def test_point_edit_moves_one_count(self):
+        calculate_frequency(self.path, date.min, date.max, PRESENT_MARKS)
+        level = self.level()
+        before = calculate_frequency(self.path, date.min, date.max, PRESENT_MARKS)[0]['Count']
+        # First student, first session (line 5, field 3)
+        mark = load_attendance_matrix(self.path).mark_text(0, 0)
+        save_cell_changes(self.path, {(5, 3): "✗" if mark == "✓" else "✓"})
+        self.assertIs(self.level(), level)
+        after = calculate_frequency(self.path, date.min, date.max, PRESENT_MARKS)[0]['Count']
+        self.assertEqual(after - before, -1 if mark == "✓" else 1)
+        self.assert_matches_raw_counts()
+
+    def test_new_students_start_at_zero(self):
+        calculate_frequency(self.path, date.min, date.max, PRESENT_MARKS)
+        level = self.level()
+        students = len(level.matrics)
+        prepare_attendance_files()
+        self.assertIs(self.level(), level)
+        self.assertGreater(len(level.matrics), students)
+        self.assert_matches_raw_counts()
+
+
+if __name__ == '__main__':
+    unittest.main()
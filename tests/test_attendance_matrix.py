@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+import numpy as np
+
+from benchmarks.generate import generate_db
+from internal.records.records_func import extract_records, get_session_info, load_attendance_file, \
+    load_attendance_matrix
+from internal.utils.attendance_matrix import ABSENT, EXCUSED, PRESENT, UNKNOWN, AttendanceMatrix, PackedStrings, \
+    codes_for
+
+
+class TestAttendanceMatrix(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "level.csv")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("Surname,Firstname,Matric NO\n"
+                    "\n"
+                    "DATE,,,01/03/26,02/03/2026,03/03/26\n"
+                    "ACTIVITY,,,PMCH,SUNDAY SERVICE,PMCH\n"
+                    "\n"
+                    "Doe,John,001,✓,✗,P\n"
+                    "Smith,Jane,002,x,,E\n"
+                    "Late,Joiner,003\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_codes(self):
+        matrix = load_attendance_matrix(self.path)
+        self.assertEqual(list(matrix.matrics), ["001", "002", "003"])
+        np.testing.assert_array_equal(matrix.marks, [[PRESENT, ABSENT, PRESENT],
+                                                     [ABSENT, UNKNOWN, EXCUSED],
+                                                     [UNKNOWN, UNKNOWN, UNKNOWN]])
+        self.assertEqual(matrix.marks.dtype, np.int8)
+        self.assertEqual(list(codes_for(['✓', 'P', 'note'])), [PRESENT])
+
+    def test_queries(self):
+        matrix = load_attendance_matrix(self.path)
+        np.testing.assert_array_equal(matrix.count(['✓']), [2, 0, 0])
+        # Both date formats are read
+        march = matrix.session_mask(date(2026, 3, 1), date(2026, 3, 2))
+        self.assertEqual(list(march), [True, True, False])
+        self.assertEqual(list(matrix.session_mask(date(2026, 3, 1), date(2026, 3, 31), "pmch")), [True, False, True])
+        self.assertEqual(list(matrix.students_with(5, ['✓'])), [0])
+        self.assertEqual(extract_records(self.path, 3, ['x'], matrix=matrix),
+                         [{'Surname': 'Smith', 'Firstname': 'Jane', 'Matric NO': '002'}])
+
+    def test_save_round_trips(self):
+        matrix = load_attendance_matrix(self.path)
+        copy_path = os.path.join(self.test_dir, "copy.csv")
+        matrix.save(copy_path)
+        copy = load_attendance_matrix(copy_path)
+        np.testing.assert_array_equal(copy.marks, matrix.marks)
+        # 'P' and 'x' are written back as they were, not as ✓ and ✗
+        self.assertEqual(copy.mark_text(0, 2), "P")
+        self.assertEqual(copy.mark_text(1, 0), "x")
+        self.assertEqual(list(copy.to_frame().columns)[3:], ["01/03/26 PMCH", "02/03/2026 SUNDAY SERVICE", "03/03/26 PMCH"])
+
+    def test_wide_files_are_not_truncated(self):
+        db_dir = generate_db(self.test_dir, ("100level",), students_per_level=20, sessions=80)
+        path = os.path.join(db_dir, "attendance", "100level.csv")
+        matrix = load_attendance_matrix(path)
+        self.assertEqual(matrix.marks.shape, (len(matrix), 80))
+
+    def test_smaller_than_the_frame(self):
+        db_dir = generate_db(self.test_dir, ("100level",), students_per_level=200, sessions=40)
+        path = os.path.join(db_dir, "attendance", "100level.csv")
+        df = load_attendance_file(path)
+        matrix = AttendanceMatrix.from_frame(df, get_session_info(path))
+        self.assertLess(matrix.nbytes * 20, df.memory_usage(deep=True).sum())
+
+    def test_packed_strings(self):
+        names = PackedStrings(["Okeke", "", "Adébáyọ̀", 25030103001])
+        self.assertEqual(len(names), 4)
+        self.assertEqual(list(names), ["Okeke", "", "Adébáyọ̀", "25030103001"])
+        self.assertEqual((names[2], names[-1], names[np.int64(0)]), ("Adébáyọ̀", "25030103001", "Okeke"))
+        self.assertEqual(names[1:3], ["", "Adébáyọ̀"])
+        with self.assertRaises(IndexError):
+            names[4]
+        self.assertEqual(list(PackedStrings([])), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
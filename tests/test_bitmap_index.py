@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+import numpy as np
+
+from internal.records.records_func import get_bitmap_index, load_attendance_matrix
+from internal.utils.bitmap_index import Bitmap, SessionBitmapIndex
+from internal.utils.file_cache import file_cache
+
+MARCH = (date(2026, 3, 1), date(2026, 3, 31))
+
+
+class TestBitmap(unittest.TestCase):
+    def test_set_algebra(self):
+        a, b = Bitmap(0b0110, 4), Bitmap(0b0011, 4)
+        self.assertEqual((a & b).bits, 0b0010)
+        self.assertEqual((a | b).bits, 0b0111)
+        self.assertEqual((a - b).bits, 0b0100)
+        self.assertEqual((~a).bits, 0b1001)
+        self.assertEqual(len(a), 2)
+        self.assertEqual(list((a | b).rows()), [0, 1, 2])
+
+    def test_rows_past_a_byte(self):
+        self.assertEqual(list(Bitmap((1 << 12) | 1, 13).rows()), [0, 12])
+        self.assertEqual(list(Bitmap(0, 13).rows()), [])
+
+
+class TestSessionBitmapIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "level.csv")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("Surname,Firstname,Matric NO\n"
+                    "\n"
+                    "DATE,,,01/03/26,04/03/26,08/03/26,11/03/2026,12/03/26,12/03/26\n"
+                    "ACTIVITY,,,SUNDAY SERVICE,BIBLE STUDY,SUNDAY SERVICE,BIBLE STUDY,PMCH,MIDWEEK SERVICE\n"
+                    "\n"
+                    "Doe,John,001,✓,✗,✓,✗,✗,✗\n"
+                    "Smith,Jane,002,✓,✓,✗,✗,✗,✓\n"
+                    "Obi,Ada,003,✗,✗,✗,x,✓,✗\n"
+                    "Late,Joiner,004,,,L,✗,✗,✗\n")
+        self.index = SessionBitmapIndex(load_attendance_matrix(self.path))
+        file_cache.invalidate()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def matrics(self, bitmap):
+        return [r['Matric NO'] for r in self.index.roster(bitmap)]
+
+    def test_attended_service_but_missed_every_bible_study(self):
+        found = self.index.present(*MARCH, "SUNDAY SERVICE") & self.index.absent(*MARCH, "BIBLE STUDY", every=True)
+        # Late counts as present; the late joiner's blank Bible Study is not an absence
+        self.assertEqual(self.matrics(found), ["001"])
+
+    def test_absent_from_every_session_on_a_day(self):
+        day = date(2026, 3, 12)
+        self.assertEqual(self.matrics(self.index.absent(day, day, every=True)), ["001", "004"])
+        self.assertEqual(self.matrics(~self.index.absent(day, day)), [])
+
+    def test_no_matching_session_is_empty(self):
+        self.assertEqual(len(self.index.present(*MARCH, "NO SUCH ACTIVITY", every=True)), 0)
+        self.assertEqual(len(self.index.absent(date(2025, 1, 1), date(2025, 1, 31))), 0)
+
+    def test_matches_the_matrix(self):
+        matrix = self.index.matrix
+        for j in range(matrix.marks.shape[1]):
+            np.testing.assert_array_equal(self.index.absent_at(j).rows(), np.flatnonzero(matrix.marks[:, j] == 2))
+
+    def test_cached_per_file(self):
+        index = get_bitmap_index(self.path)
+        self.assertIs(get_bitmap_index(self.path), index)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("New,Student,005,✓,✓,✓,✓,✓,✓\n")
+        self.assertEqual(get_bitmap_index(self.path).size, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
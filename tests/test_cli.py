@@ -0,0 +1,106 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import cli
+from benchmarks.generate import generate_db
+from internal.utils.file_cache import file_cache
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestCLI(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        generate_db(self.test_dir, ("100level", "200level"), students_per_level=6, sessions=4)
+        self.cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        file_cache.invalidate()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.test_dir)
+
+    def run_cli(self, *argv):
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            code = cli.main(list(argv))
+        return code, out.getvalue(), err.getvalue()
+
+    def test_import_then_attendees_and_absentees(self):
+        code, out, err = self.run_cli("import", "100level", "--activity", "PMCH", "--date", "20/03/26",
+                                      "--matric", "2100000", "2100001")
+        self.assertEqual(code, 0, err)
+        self.assertIn("Success", err)   # The app's own messages stay off stdout
+        self.assertEqual(json.loads(out)["activity"], "PMCH")
+
+        code, out, _ = self.run_cli("attendees", "100level", "--from", "20/03/26", "--to", "20/03/2026")
+        self.assertEqual([r["Matric NO"] for r in json.loads(out)], ["2100000", "2100001"])
+
+        code, out, _ = self.run_cli("absentees", "--activity", "pmch", "--from", "20/03/26", "--format", "csv")
+        lines = out.splitlines()
+        self.assertEqual(lines[0], "Level,Date,Activity,Surname,Firstname,Matric NO")
+        self.assertEqual(len(lines) - 1, 4)
+
+    def test_frequency_for_all_levels_to_file(self):
+        code, _, err = self.run_cli("frequency", "--all", "--format", "csv", "--output", "freq.csv")
+        self.assertEqual(code, 0, err)
+        with open("freq.csv", encoding="utf-8") as f:
+            rows = f.read().splitlines()
+        self.assertEqual(rows[0], "Level,Surname,Firstname,Matric NO,NO Attended")
+        self.assertEqual({r.split(",")[0] for r in rows[1:]}, {"100level", "200level"})
+
+    def test_query_combines_conditions(self):
+        _, out, _ = self.run_cli("query", "100level", "--present", "*")
+        anyone = {r["Matric NO"] for r in json.loads(out)}
+        _, out, _ = self.run_cli("query", "100level", "--present", "*", "--absent-all", "*")
+        self.assertEqual(json.loads(out), [])
+        _, out, _ = self.run_cli("attendees", "100level")
+        self.assertEqual(anyone, {r["Matric NO"] for r in json.loads(out)})
+        self.assertEqual(self.run_cli("query", "100level")[0], 2)
+
+    def test_history_card(self):
+        self.run_cli("import", "200level", "--activity", "PMCH", "--date", "20/03/26", "--matric", "2200001")
+        code, out, err = self.run_cli("card", "2200000", "2200001", "9999999", "--from", "20/03/26")
+        self.assertEqual(code, 0, err)
+        self.assertIn("No student with matric 9999999", err)
+        cards = json.loads(out)
+        self.assertEqual([(c["Matric NO"], c["Absent"], c["Absent Dates"]) for c in cards],
+                         [("2200000", 1, "20/03/26 (PMCH)"), ("2200001", 0, "")])
+        self.assertEqual(cards[1]["History"], [{"Date": "20/03/26", "Activity": "PMCH", "Mark": "✓"}])
+
+        code, _, err = self.run_cli("card", "9999999")
+        self.assertEqual(code, 2)
+
+    def test_unknown_level_is_an_error(self):
+        code, out, err = self.run_cli("frequency", "900level")
+        self.assertEqual((code, out), (2, ""))
+        self.assertIn("900level", err)
+
+    def test_restore_needs_confirmation(self):
+        backup_root = Path(self.test_dir) / "backups"
+        shutil.copytree("db", backup_root / "01-03-2026")
+        shutil.rmtree(os.path.join("db", "attendance"))
+
+        with patch("cli.get_backup_root", return_value=backup_root):
+            self.assertEqual(self.run_cli("restore", "01-03-2026")[0], 2)
+            self.assertFalse(os.path.exists(os.path.join("db", "attendance")))
+            code, out, err = self.run_cli("restore", "01-03-2026", "--yes")
+        self.assertEqual(code, 0, err)
+        self.assertTrue(os.path.exists(os.path.join("db", "attendance", "100level.csv")))
+
+    def test_never_imports_tk(self):
+        code = "import sys, cli; sys.exit(any(m.split('.')[0] in ('tkinter', 'customtkinter') for m in sys.modules))"
+        self.assertEqual(subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT).returncode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+from benchmarks.generate import generate_db
+from internal.attendance.create.create_func import update_attendance_sheet
+from internal.attendance.edit.edit_func import save_cell_changes
+from internal.dashboard.dashboard_func import (SUMMARY_FILE, SessionSummaryStore, summarize_matrix, summary_store,
+                                               turnout_series)
+from internal.records.records_func import load_attendance_matrix
+from internal.utils.file_cache import file_cache
+
+
+class TestSessionSummary(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        generate_db(self.test_dir, ("100level", "200level"), students_per_level=30, sessions=12)
+        self.cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        self.path = os.path.join("db", "attendance", "100level.csv")
+        file_cache.invalidate()
+        summary_store.invalidate()
+
+    def tearDown(self):
+        # A waiting save writes to db/ under the current directory
+        summary_store.flush()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.test_dir)
+
+    def recount(self):
+        return summarize_matrix(load_attendance_matrix(self.path))
+
+    def no_rebuild(self, file_path):
+        self.fail("the summary was recounted")
+
+    def test_counts(self):
+        sessions = summary_store.get(self.path)
+        self.assertEqual(len(sessions), 12)
+        for s in sessions:
+            self.assertEqual(s['present'] + s['absent'], s['total'])
+            self.assertLessEqual(s['total'], 30)
+
+    def test_saved_summary_is_reused(self):
+        expected = summary_store.all_levels()
+        self.assertTrue(SUMMARY_FILE.exists())
+        fresh = SessionSummaryStore()
+        self.assertEqual(fresh.get(self.path, self.no_rebuild), expected["100level"])
+
+    def test_kept_current_by_writes(self):
+        summary_store.get(self.path)
+        update_attendance_sheet("100level.csv", "PMCH", "20/03/26", "", ["2100000", "2100001"])
+        sessions = summary_store.get(self.path, self.no_rebuild)
+        self.assertEqual(sessions[-1]['present'], 2)
+        self.assertEqual(sessions, self.recount())
+
+        save_cell_changes(self.path, {(5, sessions[-1]['field']): "✗"})
+        self.assertEqual(summary_store.get(self.path, self.no_rebuild), self.recount())
+
+    def test_writes_are_saved_together(self):
+        summary_store.get(self.path)
+        saved = SUMMARY_FILE.read_text(encoding="utf-8")
+        update_attendance_sheet("100level.csv", "PMCH", "20/03/26", "", ["2100000"])
+        update_attendance_sheet("100level.csv", "PMCH", "21/03/26", "", ["2100001"])
+        self.assertEqual(SUMMARY_FILE.read_text(encoding="utf-8"), saved)
+
+        summary_store.flush()
+        self.assertEqual(SessionSummaryStore().get(self.path, self.no_rebuild), self.recount())
+
+    def test_changed_outside_the_app_is_recounted(self):
+        summary_store.get(self.path)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("New,Student,2199999," + ",".join(["✓"] * 12) + "\n")
+        self.assertEqual(summary_store.get(self.path), self.recount())
+
+    def test_turnout_series_adds_levels_together(self):
+        summaries = {"100level": [{'date': "01/03/26", 'activity': "pmch", 'present': 3, 'absent': 1, 'total': 4}],
+                     "200level": [{'date': "01/03/2026", 'activity': "PMCH", 'present': 1, 'absent': 1, 'total': 2},
+                                  {'date': "02/03/26", 'activity': "PMCH", 'present': 2, 'absent': 0, 'total': 2}]}
+        self.assertEqual(turnout_series(summaries),
+                         {"PMCH": [(date(2026, 3, 1), 4, 6), (date(2026, 3, 2), 2, 2)]})
+        self.assertEqual(turnout_series(summaries, level="100level"), {"PMCH": [(date(2026, 3, 1), 3, 4)]})
+
+
+if __name__ == '__main__':
+    unittest.main()
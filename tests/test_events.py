@@ -0,0 +1,128 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from internal.utils import events
+from internal.utils.csv_handler import read_csv_robust
+from internal.utils.csv_index import CSVLineIndex
+from internal.attendance.create.create_func import update_attendance_sheet
+from internal.attendance.edit.edit_func import update_mark
+from internal.attendance.excel import field_offset, field_value, mark_cells, roster_rows, session_column
+
+
+class TestEvents(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        os.makedirs(os.path.join("db", "attendance"))
+        self.path = os.path.join("db", "attendance", "100level.csv")
+        with open(self.path, "w", newline="", encoding="utf-8-sig") as f:
+            csv.writer(f).writerows([
+                ["Surname", "Firstname", "Matric NO", "", ""],
+                ["", "", "", "", ""],
+                ["DATE", "", "", "01/01/26", "02/01/26"],
+                ["ACTIVITY", "", "", "MORNING SERVICE", "BIBLE STUDY"],
+                ["", "", "", "", ""],
+                ["Doe", "John", "M001", "✓", "✗"],
+                ["Smith", "Jane", "M002", "✗", "✓"],
+            ])
+        self.received = []
+        self.handlers = {
+            events.SESSION_ADDED: self.received.append,
+            events.MARK_CHANGED: self.received.append,
+        }
+        events.subscribe_all(self.handlers, ui=False)
+
+    def tearDown(self):
+        events.unsubscribe_all(self.handlers)
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.test_dir)
+
+    def test_session_added_delta(self):
+        update_attendance_sheet("100level.csv", "PMCH", "03/01/26", "", ["M002"])
+        self.assertEqual(len(self.received), 1)
+        payload = self.received[0]
+        self.assertEqual(payload["event"], events.SESSION_ADDED)
+        self.assertEqual(payload["file"], os.path.abspath(self.path))
+        self.assertEqual(payload["field"], 5)
+        self.assertEqual(payload["rows"], [("Doe", "John", "M001", "✗"), ("Smith", "Jane", "M002", "✓")])
+
+    def test_mark_changed_delta(self):
+        update_mark("100", "M001", "02/01/26", "BIBLE STUDY", "✓")
+        cells = self.received[0]["cells"]
+        self.assertEqual(len(cells), 1)
+        self.assertEqual((cells[0]["matric"], cells[0]["field"], cells[0]["old"], cells[0]["new"]), ("M001", 4, "✗", "✓"))
+
+    def test_ui_subscribers_wait_for_pump(self):
+        seen = []
+        events.subscribe(events.FILE_REWRITTEN, seen.append, ui=True)
+        try:
+            events.publish(events.FILE_REWRITTEN, self.path)
+            self.assertEqual(seen, [])
+            events.pump()
+            self.assertEqual(len(seen), 1)
+        finally:
+            events.unsubscribe(events.FILE_REWRITTEN, seen.append)
+
+
+class TestSheetDeltas(unittest.TestCase):
+    """Deltas applied to a sheet whose header is shorter than its rows, as the viewer loads it."""
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        os.makedirs(os.path.join("db", "attendance"))
+        self.path = os.path.join("db", "attendance", "100level.csv")
+        with open(self.path, "w", newline="", encoding="utf-8-sig") as f:
+            csv.writer(f).writerows([
+                ["Surname", "Firstname", "Matric NO"],
+                [],
+                ["DATE", "", "", "01/01/26", "02/01/26"],
+                ["ACTIVITY", "", "", "MORNING SERVICE", "BIBLE STUDY"],
+                [],
+                ["Doe", "John", "M001", "✓", "✗"],
+                ["Smith", "Jane", "M002", "✗", "✓"],
+            ])
+        self.df = read_csv_robust(self.path)
+        self.received = []
+        self.handlers = {
+            events.SESSION_ADDED: self.received.append,
+            events.MARK_CHANGED: self.received.append,
+        }
+        events.subscribe_all(self.handlers, ui=False)
+
+    def tearDown(self):
+        events.unsubscribe_all(self.handlers)
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.test_dir)
+
+    def test_leading_fields_are_in_the_index(self):
+        self.assertEqual(field_offset(self.df), 2)
+        self.assertEqual([field_value(self.df, r, 2) for r in range(len(self.df))], ["", "", "M001", "M002"])
+
+    def test_session_added_delta(self):
+        update_attendance_sheet("100level.csv", "PMCH", "03/01/26", "", ["M002"])
+        col, values = session_column(self.df, self.received[0])
+        self.assertEqual(col, 3)
+        self.assertEqual(values, ["03/01/26", "PMCH", "✗", "✓"])
+
+    def test_mark_changed_delta(self):
+        update_mark("100", "M001", "02/01/26", "BIBLE STUDY", "✓")
+        row_of_line = {line: r for r, line in enumerate(CSVLineIndex(self.path).nonblank_lines()[1:])}
+        cells = mark_cells(self.df, row_of_line, self.received[0]["cells"])
+        self.assertEqual(cells, {(2, 2): "✓"})
+        self.assertEqual(self.df.iat[2, 2], "✗")
+
+    def test_new_students_keep_the_index(self):
+        df = pd.concat([self.df, roster_rows(self.df, [["Okeke", "Ada", "M003"]])])
+        self.assertEqual(field_offset(df), 2)
+        self.assertEqual([field_value(df, 4, field) for field in range(3)], ["Okeke", "Ada", "M003"])
+
+
+if __name__ == '__main__':
+    unittest.main()
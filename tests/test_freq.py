@@ -1,8 +1,12 @@
+import os
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch
 from datetime import date
 import pandas as pd
-from internal.frequency.freq_func import calculate_frequency
+from benchmarks.generate import generate_db
+from internal.frequency.freq_func import PRESENT_MARKS, calculate_frequency, calculate_frequency_all, save_frequency_workbook
 
 class TestFrequencyCalculation(unittest.TestCase):
 
@@ -12,8 +16,8 @@ class TestFrequencyCalculation(unittest.TestCase):
         self.end_date = date(2023, 1, 31)
         self.target_marks = ['P', 'Present', '✓', 'p']
 
-    @patch('internal.frequency.freq_func.load_attendance_file')
-    @patch('internal.frequency.freq_func.get_session_info')
+    @patch('internal.records.records_func.load_attendance_file')
+    @patch('internal.records.records_func.get_session_info')
     def test_basic_functionality(self, mock_get_session, mock_load_df):
         """Test basic counting logic with valid inputs."""
         mock_get_session.return_value = {
@@ -46,8 +50,8 @@ class TestFrequencyCalculation(unittest.TestCase):
         jane = next(r for r in results if r['Surname'] == 'Smith')
         self.assertEqual(jane['Count'], 1)
 
-    @patch('internal.frequency.freq_func.load_attendance_file')
-    @patch('internal.frequency.freq_func.get_session_info')
+    @patch('internal.records.records_func.load_attendance_file')
+    @patch('internal.records.records_func.get_session_info')
     def test_date_range_filtering(self, mock_get_session, mock_load_df):
         """Test that sessions outside the date range are ignored."""
         mock_get_session.return_value = {
@@ -71,8 +75,8 @@ class TestFrequencyCalculation(unittest.TestCase):
         # Only col 4 should be counted (date 15/01/23 is inside Jan 2023)
         self.assertEqual(results[0]['Count'], 1)
 
-    @patch('internal.frequency.freq_func.load_attendance_file')
-    @patch('internal.frequency.freq_func.get_session_info')
+    @patch('internal.records.records_func.load_attendance_file')
+    @patch('internal.records.records_func.get_session_info')
     def test_no_sessions_found(self, mock_get_session, mock_load_df):
         """Test when get_session_info returns empty dict."""
         mock_get_session.return_value = {} # Empty sessions
@@ -81,16 +85,16 @@ class TestFrequencyCalculation(unittest.TestCase):
         results = calculate_frequency(self.dummy_file, self.start_date, self.end_date, self.target_marks)
         self.assertEqual(results, [])
 
-    @patch('internal.frequency.freq_func.load_attendance_file')
-    @patch('internal.frequency.freq_func.get_session_info')
+    @patch('internal.records.records_func.load_attendance_file')
+    @patch('internal.records.records_func.get_session_info')
     def test_load_file_failure(self, mock_get_session, mock_load_df):
         """Test when load_attendance_file returns None."""
         mock_load_df.return_value = None
         results = calculate_frequency(self.dummy_file, self.start_date, self.end_date, self.target_marks)
         self.assertEqual(results, [])
 
-    @patch('internal.frequency.freq_func.load_attendance_file')
-    @patch('internal.frequency.freq_func.get_session_info')
+    @patch('internal.records.records_func.load_attendance_file')
+    @patch('internal.records.records_func.get_session_info')
     def test_metadata_row_filtering(self, mock_get_session, mock_load_df):
         """Test that header/metadata rows are filtered out."""
         mock_get_session.return_value = {'15/01/23': [{'activity': 'In', 'col_index': 3}]}
@@ -111,8 +115,8 @@ class TestFrequencyCalculation(unittest.TestCase):
         self.assertEqual(results[0]['Surname'], 'Doe')
         self.assertEqual(results[0]['Count'], 1)
 
-    @patch('internal.frequency.freq_func.load_attendance_file')
-    @patch('internal.frequency.freq_func.get_session_info')
+    @patch('internal.records.records_func.load_attendance_file')
+    @patch('internal.records.records_func.get_session_info')
     def test_missing_columns_in_df(self, mock_get_session, mock_load_df):
         """Test when a session column is in session_info but missing in DataFrame."""
         mock_get_session.return_value = {'15/01/23': [{'activity': 'In', 'col_index': 10}]}
@@ -131,8 +135,8 @@ class TestFrequencyCalculation(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0]['Count'], 0)
 
-    @patch('internal.frequency.freq_func.load_attendance_file')
-    @patch('internal.frequency.freq_func.get_session_info')
+    @patch('internal.records.records_func.load_attendance_file')
+    @patch('internal.records.records_func.get_session_info')
     def test_multiple_sessions_same_day(self, mock_get_session, mock_load_df):
         """Test counting multiple sessions on the same date."""
         mock_get_session.return_value = {
@@ -155,8 +159,8 @@ class TestFrequencyCalculation(unittest.TestCase):
         
         self.assertEqual(results[0]['Count'], 2)
 
-    @patch('internal.frequency.freq_func.load_attendance_file')
-    @patch('internal.frequency.freq_func.get_session_info')
+    @patch('internal.records.records_func.load_attendance_file')
+    @patch('internal.records.records_func.get_session_info')
     def test_invalid_date_format_in_session(self, mock_get_session, mock_load_df):
         """Test that sessions with invalid date formats are ignored."""
         mock_get_session.return_value = {
@@ -178,5 +182,33 @@ class TestFrequencyCalculation(unittest.TestCase):
         # 'invalid-date' should be skipped, '01/01/23' counted
         self.assertEqual(results[0]['Count'], 1)
 
+class TestAllLevels(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        db_dir = generate_db(self.test_dir, ("100level", "200level", "300level"), students_per_level=20, sessions=10)
+        self.paths = [os.path.join(db_dir, "attendance", f"{level}.csv") for level in ("100level", "200level", "300level")]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_same_as_one_level_at_a_time(self):
+        rows = calculate_frequency_all(self.paths, date.min, date.max, PRESENT_MARKS)
+        expected = [dict(Level=os.path.basename(p)[:-4], **row)
+                    for p in self.paths for row in calculate_frequency(p, date.min, date.max, PRESENT_MARKS)]
+        self.assertEqual(rows, expected)
+        self.assertEqual(list(rows[0]), ['Level', 'Surname', 'Firstname', 'Matric NO', 'Count'])
+
+    def test_one_workbook_with_a_sheet_per_level(self):
+        save_path = os.path.join(self.test_dir, "all.xlsx")
+        save_frequency_workbook(calculate_frequency_all(self.paths, date.min, date.max, PRESENT_MARKS),
+                                save_path, "NO Attended")
+        sheets = pd.read_excel(save_path, sheet_name=None)
+        self.assertEqual(list(sheets), ["All levels", "100level", "200level", "300level"])
+        self.assertIn("NO Attended", sheets["100level"].columns)
+        self.assertNotIn("Level", sheets["100level"].columns)
+        self.assertEqual(len(sheets["All levels"]), sum(len(sheets[level]) for level in list(sheets)[1:]))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generate import generate_db
+from internal.history.history_func import (MatricIndex, format_card, history_card, history_cards, matric_key,
+                                           save_history_cards)
+from internal.records.records_func import load_attendance_matrix
+from internal.utils.attendance_matrix import ABSENT, EXCUSED, LATE, PRESENT
+from internal.utils.csv_index import patch_cells
+
+LEVELS = ("100level", "200level")
+
+
+class TestMatricIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.dir = os.path.join(self.test_dir, "attendance")
+        os.makedirs(self.dir)
+        self.path = os.path.join(self.dir, "100level.csv")
+        with open(self.path, "w", encoding="utf-8-sig") as f:
+            f.write("Surname,Firstname,Matric NO\n"
+                    "\n"
+                    "DATE,,,08/03/26,01/03/26,04/03/26,11/03/2026\n"
+                    "ACTIVITY,,,SUNDAY SERVICE,SUNDAY SERVICE,BIBLE STUDY,BIBLE STUDY\n"
+                    "\n"
+                    "Doe,John,001,✗,✓,L,✗\n"
+                    "\"Smith, Jr\",Jane,002.0,E,✗,,✓\n")
+        self.index = MatricIndex(self.dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_locate(self):
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index.locate(" 002 "), [(os.path.abspath(self.path), 6)])
+        self.assertEqual(self.index.locate("003"), [])
+        self.assertEqual(matric_key("ab 12.0"), "AB12")
+
+    def test_card(self):
+        card, = history_card("001", index=self.index)
+        self.assertEqual((card['Surname'], card['Present'], card['Late'], card['Absent'], card['Percent']),
+                         ("Doe", 1, 1, 2, 50.0))
+        # Oldest first, whatever the column order
+        self.assertEqual(card['Absent Dates'], "08/03/26 (SUNDAY SERVICE), 11/03/2026 (BIBLE STUDY)")
+        self.assertIn("Total Absent: 2", format_card(card))
+
+        card, = history_card("002", date(2026, 3, 1), date(2026, 3, 8), "sunday service", index=self.index)
+        self.assertEqual((card['Surname'], card['Sessions'], card['Excused'], card['Absent']), ("Smith, Jr", 2, 1, 1))
+
+    def test_follows_file_changes(self):
+        patch_cells(self.path, {(6, 4): "✓"})
+        card, = history_card("002", index=self.index)
+        self.assertEqual(card['Absent'], 0)
+
+
+class TestHistoryCards(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        db_dir = generate_db(self.test_dir, LEVELS, students_per_level=300, sessions=10)
+        self.dir = os.path.join(db_dir, "attendance")
+        self.index = MatricIndex(self.dir)
+        self.matrices = [load_attendance_matrix(os.path.join(self.dir, f"{level}.csv")) for level in LEVELS]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_cards_match_the_matrix(self):
+        matrics = [m for matrix in reversed(self.matrices) for m in matrix.matrics]
+        cards, missing = history_cards(matrics + ["0000000"], index=self.index)
+        self.assertEqual(missing, ["0000000"])
+        self.assertEqual([c['Matric NO'] for c in cards], matrics)
+        expected = [(matrix.marks == code).sum(axis=1) for matrix in reversed(self.matrices)
+                    for code in (PRESENT, LATE, ABSENT, EXCUSED)]
+        got = [[c[k] for c in cards] for k in ('Present', 'Late', 'Absent', 'Excused')]
+        self.assertEqual(got, np.vstack([np.concatenate(expected[i::4]) for i in range(4)]).tolist())
+
+    def test_export(self):
+        cards, _ = history_cards(self.matrices[0].matrics[:3], index=self.index)
+        xlsx = os.path.join(self.test_dir, "cards.xlsx")
+        self.assertTrue(save_history_cards(cards, xlsx))
+        sheets = pd.read_excel(xlsx, sheet_name=None, dtype=str)
+        self.assertEqual(len(sheets["Summary"]), 3)
+        self.assertEqual(len(sheets["History"]), sum(c['Sessions'] for c in cards))
+
+        txt = os.path.join(self.test_dir, "cards.txt")
+        self.assertTrue(save_history_cards(cards, txt))
+        with open(txt, encoding="utf-8") as f:
+            self.assertEqual(f.read().count("Student: "), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+Performance gate: runs the file engines on a fixed synthetic db and fails when one got
+slower or hungrier than benchmarks/baseline.json allows. Headless, nothing here may import
+customtkinter, so it can run before every build.
+
+Peak memory (tracemalloc) is checked on every test run. Timings are opt-in, they depend
+on the machine and what else it is doing. Each engine is timed against the reference
+benchmark (plain csv read and write of the same files) run here, and the baseline records
+that ratio, not seconds.
+
+    ATTENDANCE_PERF=1                also run the timing checks
+    ATTENDANCE_PERF_TOLERANCE=0.5    allowed regression as a fraction of the baseline (default 0.5)
+    ATTENDANCE_PERF_UPDATE=1         measure this machine and rewrite the baseline instead of checking it
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from benchmarks.generate import generate_db
+from benchmarks.run import BENCHMARKS, peak_memory, time_benchmark
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(PROJECT_ROOT, "benchmarks", "baseline.json")
+
+# The fixed dataset. Changing it means regenerating the baseline.
+LEVELS = ("100level", "200level", "300level")
+STUDENTS = 150
+SESSIONS = 30
+SEED = 0
+REPEAT = 3
+# The reference is short, so take the best of more runs
+REFERENCE_REPEAT = 9
+
+# Engine name -> benchmark it runs
+ENGINES = {
+    "marking": "update_attendance_sheet",
+    "frequency": "calculate_frequency",
+    "records": "extract_records",
+    "sorting": "sort_attendance_files",
+    "roster_sync": "prepare_attendance_files",
+}
+
+# Differences this small are timer noise however large they are relative to the baseline
+TIME_SLACK = 0.02
+MEMORY_SLACK_KB = 256
+
+UPDATING = os.environ.get("ATTENDANCE_PERF_UPDATE") == "1"
+ENABLED = UPDATING or os.environ.get("ATTENDANCE_PERF") == "1"
+
+
+def _tolerance() -> float:
+    try:
+        return float(os.environ.get("ATTENDANCE_PERF_TOLERANCE", "0.5"))
+    except ValueError:
+        return 0.5
+
+
+class EngineDataset(unittest.TestCase):
+    """Generates the fixed db once per class and loads the baseline."""
+    @classmethod
+    def setUpClass(cls):
+        cls.template_dir = tempfile.TemporaryDirectory()
+        generate_db(cls.template_dir.name, LEVELS, STUDENTS, SESSIONS, seed=SEED)
+        cls.baseline = {}
+        if os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH, encoding="utf-8") as f:
+                cls.baseline = json.load(f).get("engines", {})
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.template_dir.cleanup()
+
+    def baseline_of(self, engine, key):
+        baseline = self.baseline.get(engine)
+        if baseline is None or key not in baseline:
+            self.skipTest(f"No baseline for {engine}, run with ATTENDANCE_PERF_UPDATE=1 to record one")
+        return baseline
+
+
+@unittest.skipIf(UPDATING, "the baseline is being rewritten by TestPerformance")
+class TestPeakMemory(EngineDataset):
+    def check_engine(self, engine):
+        peak_kb = peak_memory(BENCHMARKS[ENGINES[engine]], self.template_dir.name, LEVELS)
+        baseline = self.baseline_of(engine, "peak_kb")
+        memory_limit = max(baseline["peak_kb"] * (1 + _tolerance()), baseline["peak_kb"] + MEMORY_SLACK_KB)
+        self.assertLessEqual(peak_kb, memory_limit,
+                             f"{engine} peaked at {peak_kb:.0f} KiB, baseline {baseline['peak_kb']} KiB")
+
+    def test_marking(self):
+        self.check_engine("marking")
+
+    def test_frequency(self):
+        self.check_engine("frequency")
+
+    def test_records(self):
+        self.check_engine("records")
+
+    def test_sorting(self):
+        self.check_engine("sorting")
+
+    def test_roster_sync(self):
+        self.check_engine("roster_sync")
+
+
+@unittest.skipUnless(ENABLED, "timing checks are opt-in, set ATTENDANCE_PERF=1")
+class TestPerformance(EngineDataset):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.updating = UPDATING
+        cls.reference = min(time_benchmark(BENCHMARKS["reference"], cls.template_dir.name, LEVELS, REFERENCE_REPEAT))
+        cls.measured = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if cls.updating and cls.measured:
+            with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+                json.dump({"dataset": {"levels": list(LEVELS), "students_per_level": STUDENTS,
+                                       "sessions": SESSIONS, "seed": SEED},
+                           "reference_seconds": round(cls.reference, 4),
+                           "engines": cls.measured}, f, indent=2)
+
+    def check_engine(self, engine):
+        func = BENCHMARKS[ENGINES[engine]]
+        seconds = min(time_benchmark(func, self.template_dir.name, LEVELS, REPEAT))
+        ratio = seconds / self.reference
+        if self.updating:
+            peak_kb = peak_memory(func, self.template_dir.name, LEVELS)
+            self.measured[engine] = {"ratio": round(ratio, 2), "seconds": round(seconds, 4), "peak_kb": round(peak_kb)}
+            return
+
+        baseline = self.baseline_of(engine, "ratio")
+        tolerance = _tolerance()
+        # The baseline's ratio in this machine's seconds
+        expected = baseline["ratio"] * self.reference
+        time_limit = max(expected * (1 + tolerance), expected + TIME_SLACK)
+        self.assertLessEqual(seconds, time_limit,
+                             f"{engine} took {ratio:.1f}x the reference ({seconds * 1000:.1f} ms), "
+                             f"baseline {baseline['ratio']:.1f}x ({expected * 1000:.1f} ms here)")
+
+    def test_marking(self):
+        self.check_engine("marking")
+
+    def test_frequency(self):
+        self.check_engine("frequency")
+
+    def test_records(self):
+        self.check_engine("records")
+
+    def test_sorting(self):
+        self.check_engine("sorting")
+
+    def test_roster_sync(self):
+        self.check_engine("roster_sync")
+
+
+class TestBenchmarkImports(unittest.TestCase):
+    def test_runs_without_customtkinter(self):
+        # A fresh interpreter, other test modules may already have imported it here
+        code = "import sys, benchmarks.run; sys.exit('customtkinter' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT)
+        self.assertEqual(result.returncode, 0, "The benchmarked engines import customtkinter")
+
+
+if __name__ == '__main__':
+    unittest.main()
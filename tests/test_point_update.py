@@ -0,0 +1,140 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+from internal.utils.csv_index import CSVLineIndex, patch_cells
+from internal.attendance.edit.edit_func import (get_attendance_index, moved_cells, save_cell_changes, undo_last_change,
+                                               update_mark)
+
+
+class AttendanceFileTestCase(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        os.makedirs(os.path.join("db", "attendance"))
+        self.path = os.path.join("db", "attendance", "100level.csv")
+        # Same layout (BOM, blank spacer lines, CRLF) as the files written by the app
+        with open(self.path, "w", newline="", encoding="utf-8-sig") as f:
+            csv.writer(f).writerows([
+                ["Surname", "Firstname", "Matric NO"],
+                [],
+                ["DATE", "", "", "01/01/26", "02/01/26"],
+                ["ACTIVITY", "", "", "MORNING SERVICE", "BIBLE STUDY"],
+                [],
+                ["Doe", "John", "M001", "✓", "✗"],
+                ["Smith", "Jane", "M002", "✗", "✓"],
+            ])
+
+    def tearDown(self):
+        os.chdir(self.original_cwd)
+        shutil.rmtree(self.test_dir)
+
+    def read_rows(self):
+        with open(self.path, newline="", encoding="utf-8-sig") as f:
+            return list(csv.reader(f))
+
+
+class TestPatchCells(AttendanceFileTestCase):
+
+    def test_index_lines(self):
+        index = CSVLineIndex(self.path)
+        self.assertEqual(len(index), 7)
+        self.assertEqual(index.nonblank_lines(), [0, 2, 3, 5, 6])
+        self.assertEqual(index.read_row(5), ["Doe", "John", "M001", "✓", "✗"])
+
+    def test_same_length_patch_in_place(self):
+        old = patch_cells(self.path, {(5, 3): "✗"})
+        self.assertEqual(old, {(5, 3): "✓"})
+        rows = self.read_rows()
+        self.assertEqual(rows[5], ["Doe", "John", "M001", "✗", "✗"])
+        self.assertEqual(rows[6], ["Smith", "Jane", "M002", "✗", "✓"])
+
+    def test_length_change_keeps_rest_of_file(self):
+        index = CSVLineIndex(self.path)
+        patch_cells(self.path, {(5, 0): "Doe-Adeyemi", (6, 5): "P"}, index=index)
+        rows = self.read_rows()
+        self.assertEqual(rows[5], ["Doe-Adeyemi", "John", "M001", "✓", "✗"])
+        self.assertEqual(rows[6], ["Smith", "Jane", "M002", "✗", "✓", "P"])
+        # The index was shifted, not rebuilt, and must still point at the right lines
+        self.assertTrue(index.is_fresh())
+        self.assertEqual(index.read_row(6), ["Smith", "Jane", "M002", "✗", "✓", "P"])
+        self.assertEqual(index.offsets, CSVLineIndex(self.path).offsets)
+
+    def test_concurrent_append_is_kept(self):
+        """A column appended after the index was built must survive the point-update."""
+        index = CSVLineIndex(self.path)
+        rows = self.read_rows()
+        for row in rows:
+            row.append("✓" if len(row) >= 3 and row[0] not in ("DATE", "ACTIVITY", "Surname") else "")
+        with open(self.path, "w", newline="", encoding="utf-8-sig") as f:
+            csv.writer(f).writerows(rows)
+
+        patch_cells(self.path, {(6, 3): "✓"}, index=index)
+        self.assertEqual(self.read_rows()[6], ["Smith", "Jane", "M002", "✓", "✓", "✓"])
+
+    def test_undo_last_change(self):
+        save_cell_changes(self.path, {(5, 3): "✗", (6, 4): "✗"})
+        self.assertEqual(self.read_rows()[5][3], "✗")
+
+        self.assertEqual(undo_last_change(self.path), 2)
+        rows = self.read_rows()
+        self.assertEqual(rows[5][3], "✓")
+        self.assertEqual(rows[6][4], "✓")
+        # Nothing left to undo
+        self.assertEqual(undo_last_change(self.path), 0)
+
+
+class TestMovedCells(AttendanceFileTestCase):
+
+    def test_unchanged_file(self):
+        expected = {(5, 2): "M001", (6, 2): "M002.0", (2, 4): "02/01/26", (3, 4): "BIBLE STUDY"}
+        self.assertEqual(moved_cells(self.path, expected), [])
+
+    def test_rows_and_columns_moved(self):
+        index = CSVLineIndex(self.path)
+        rows = self.read_rows()
+        rows[5], rows[6] = rows[6], rows[5]
+        for row in rows[2:4] + rows[5:]:
+            row[3], row[4] = row[4], row[3]
+        with open(self.path, "w", newline="", encoding="utf-8-sig") as f:
+            csv.writer(f).writerows(rows)
+        expected = {(5, 2): "M001", (2, 3): "01/01/26", (3, 3): "MORNING SERVICE", (9, 0): "Doe"}
+        self.assertEqual(sorted(moved_cells(self.path, expected, index=index)), [(2, 3), (3, 3), (5, 2), (9, 0)])
+
+    def test_appended_rows_and_columns_are_fine(self):
+        index = CSVLineIndex(self.path)
+        with open(self.path, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(["Okeke", "Ada", "M003", "", ""])
+        patch_cells(self.path, {(2, 5): "03/01/26", (3, 5): "PMCH"})
+        self.assertEqual(moved_cells(self.path, {(5, 2): "M001", (2, 4): "02/01/26"}, index=index), [])
+
+
+class TestUpdateMark(AttendanceFileTestCase):
+
+    def test_update_mark(self):
+        old = update_mark("100", "M002", "01/01/26", "morning service", "✓")
+        self.assertEqual(old, "✗")
+        self.assertEqual(self.read_rows()[6], ["Smith", "Jane", "M002", "✓", "✓"])
+
+    def test_accepts_long_year_and_file_name(self):
+        update_mark("100level.csv", "M001", "02/01/2026", "BIBLE STUDY", "✓")
+        self.assertEqual(self.read_rows()[5][4], "✓")
+
+    def test_unknown_student_or_session(self):
+        with self.assertRaises(ValueError):
+            update_mark("100", "NOPE", "01/01/26", "MORNING SERVICE", "✓")
+        with self.assertRaises(ValueError):
+            update_mark("100", "M001", "05/01/26", "MORNING SERVICE", "✓")
+
+    def test_index_is_reused_until_file_changes(self):
+        index = get_attendance_index("100")
+        update_mark("100", "M001", "01/01/26", "MORNING SERVICE", "✗")
+        self.assertIs(get_attendance_index("100"), index)
+        self.assertEqual(index.read_mark("M001", "01/01/26", "MORNING SERVICE"), "✗")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import pstats
+import shutil
+import tempfile
+import threading
+import time
+import tkinter
+import unittest
+from unittest import mock
+
+from internal.utils import profiling
+from internal.utils.profiling import ProfileSession
+
+
+def slow_handler():
+    time.sleep(profiling.SLOW_ACTION_MS / 1000 + 0.01)
+
+
+def quick_handler():
+    return sum(range(100))
+
+
+class TestProfileSession(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.session = ProfileSession(os.path.join(self.test_dir, "bundle"))
+
+    def tearDown(self):
+        self.session.finish()
+        shutil.rmtree(self.test_dir)
+
+    def test_slow_actions_get_their_own_profile(self):
+        with self.session.action("open frequency"):
+            slow_handler()
+        with self.session.action("click"):
+            quick_handler()
+
+        self.assertEqual([a[1] for a in self.session.slow_actions], ["open frequency"])
+        prof_file = os.path.join(self.session.bundle_dir, self.session.slow_actions[0][3])
+        functions = {func[2] for func in pstats.Stats(prof_file).stats}
+        self.assertIn("slow_handler", functions)
+        self.assertEqual(self.session.totals["click"][0], 1)
+
+    def test_nested_actions_count_once(self):
+        with self.session.action("outer"):
+            with self.session.action("inner"):
+                quick_handler()
+        self.assertEqual(list(self.session.totals), ["outer"])
+
+    def test_actions_on_two_threads_at_once(self):
+        # Startup work runs under wrap() on its own threads while the Tk thread has an action open
+        both_inside = threading.Barrier(2, timeout=5)
+        errors = []
+
+        def work():
+            both_inside.wait()
+            slow_handler()
+
+        def run(name):
+            try:
+                self.session.wrap(work, name)()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(name,)) for name in ("prepare", "maintain")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual({name: total[0] for name, total in self.session.totals.items()}, {"prepare": 1, "maintain": 1})
+        self.assertEqual(sorted(a[1] for a in self.session.slow_actions), ["maintain", "prepare"])
+
+    def test_action_is_timed_when_another_profiler_is_active(self):
+        class BusyProfile:
+            def enable(self):
+                raise ValueError("Another profiling tool is already active")
+
+        with mock.patch.object(profiling.cProfile, "Profile", BusyProfile):
+            with self.session.action("open viewer"):
+                slow_handler()
+        self.assertEqual(self.session.totals["open viewer"][0], 1)
+        self.assertEqual(self.session.slow_actions[0][3], "(not profiled)")
+
+    def test_tk_callbacks_are_profiled(self):
+        original = tkinter.CallWrapper.__call__
+        self.session.install_tk_hook()
+        tkinter.CallWrapper(quick_handler, None, None)()
+        self.session.finish()
+
+        self.assertIn("quick_handler", self.session.totals)
+        self.assertIs(tkinter.CallWrapper.__call__, original)
+        bundle = self.session.bundle_dir
+        for name in ("session.prof", "session_top.txt", "actions.txt"):
+            self.assertTrue(os.path.exists(os.path.join(bundle, name)), name)
+        self.assertTrue(os.listdir(os.path.join(bundle, "memory")))
+
+    def test_snapshots_compare_with_the_previous_one(self):
+        self.session.snapshot("open Viewer")
+        kept = [bytearray(1024) for _ in range(100)]
+        self.session.snapshot("close Viewer")
+
+        memory_dir = os.path.join(self.session.bundle_dir, "memory")
+        first, second = sorted(os.listdir(memory_dir))
+        with open(os.path.join(memory_dir, second), encoding="utf-8") as f:
+            report = f.read()
+        self.assertTrue(report.startswith("close Viewer"))
+        self.assertIn("Biggest changes since the previous snapshot", report)
+        self.assertEqual(len(kept), 100)
+
+    def test_after_callbacks_are_named_after_the_callback(self):
+        # Shaped like the wrapper tkinter's after() registers
+        def after(func, *args):
+            def callit():
+                func(*args)
+            return callit
+        callit = after(quick_handler)
+        callit.__qualname__ = "Misc.after.<locals>.callit"
+        self.assertEqual(profiling._callback_name(callit), "after: quick_handler")
+
+
+if __name__ == '__main__':
+    unittest.main()
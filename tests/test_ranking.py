@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generate import generate_db
+from internal.frequency.freq_func import calculate_frequency_all
+from internal.ranking.ranking_func import (ATTENDED_MARKS, ELIGIBLE_MARKS, AttendanceRates, attendance_rates,
+                                           below_threshold, ranking_report, save_ranking_report, top_k)
+
+LEVELS = ("100level", "200level")
+
+
+def make_rates(attended, eligible, levels=None):
+    levels = levels or ["100level"] * len(attended)
+    roster = [{'Level': lvl, 'Surname': f"S{i}", 'Firstname': "F", 'Matric NO': str(i)} for i, lvl in enumerate(levels)]
+    return AttendanceRates(roster, attended, eligible)
+
+
+class TestSelection(unittest.TestCase):
+    def test_top_k_by_percent_with_ties(self):
+        rates = make_rates([9, 10, 5, 8, 0], [10, 10, 10, 8, 0])
+        # 100% twice: more sessions attended wins; the student with no eligible sessions is left out
+        self.assertEqual(top_k(rates, 3).tolist(), [1, 3, 0])
+        self.assertEqual(top_k(rates, 10).tolist(), [1, 3, 0, 2])
+        self.assertEqual(top_k(rates, 2, metric="count").tolist(), [1, 0])
+
+    def test_top_k_matches_a_full_sort(self):
+        rng = np.random.default_rng(1)
+        eligible = rng.integers(1, 40, 500)
+        rates = make_rates(list(rng.integers(0, eligible + 1)), list(eligible))
+        expected = np.lexsort((-rates.attended, -rates.percent))[:20]
+        self.assertEqual(rates.percent[top_k(rates, 20)].tolist(), rates.percent[expected].tolist())
+
+    def test_below_threshold(self):
+        rates = make_rates([9, 3, 5, 1], [10, 10, 10, 2], ["100level", "100level", "200level", "200level"])
+        # Worst first; at 50% each, fewer sessions attended is worse
+        self.assertEqual(below_threshold(rates, 60).tolist(), [1, 3, 2])
+        self.assertEqual(below_threshold(rates, 60, level="200level").tolist(), [3, 2])
+        self.assertEqual(below_threshold(rates, 60, min_eligible=5).tolist(), [1, 2])
+
+
+class TestRankingReport(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        db_dir = generate_db(self.test_dir, LEVELS, students_per_level=30, sessions=12)
+        self.paths = [os.path.join(db_dir, "attendance", f"{level}.csv") for level in LEVELS]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_late_joiners_are_ranked_on_their_own_sessions(self):
+        rates = attendance_rates(self.paths[:1])
+        self.assertTrue((rates.eligible <= 12).all())
+        self.assertTrue((rates.eligible < 12).any())
+
+    def test_same_counts_as_the_frequency_engine(self):
+        start, end = date(2026, 1, 1), date(2026, 12, 31)
+        rates = attendance_rates(self.paths, start, end)
+        for counts, marks in ((rates.attended, ATTENDED_MARKS), (rates.eligible, ELIGIBLE_MARKS)):
+            rows = calculate_frequency_all(self.paths, start, end, marks)
+            self.assertEqual([(r['Level'], r['Matric NO'], r['Count']) for r in rows],
+                             [(s['Level'], s['Matric NO'], int(c)) for s, c in zip(rates.roster, counts)])
+
+    def test_per_level_and_across_levels(self):
+        across = ranking_report(self.paths, top=5)
+        self.assertEqual([r['Rank'] for r in across], [1, 2, 3, 4, 5])
+        per_level = ranking_report(self.paths, date.min, date.max, top=5, per_level=True)
+        self.assertEqual([r['Level'] for r in per_level], ["100level"] * 5 + ["200level"] * 5)
+        self.assertGreaterEqual(per_level[0]['Percent'], per_level[4]['Percent'])
+        self.assertEqual(across[0]['Percent'], max(per_level[0]['Percent'], per_level[5]['Percent']))
+
+        warnings = ranking_report(self.paths, below=60)
+        self.assertTrue(all(r['Percent'] < 60 for r in warnings))
+
+    def test_export(self):
+        save_path = os.path.join(self.test_dir, "ranking.xlsx")
+        self.assertTrue(save_ranking_report(ranking_report(self.paths, top=3, per_level=True), save_path, per_level=True))
+        self.assertEqual(list(pd.read_excel(save_path, sheet_name=None)), ["Ranking", "100level", "200level"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+import pandas as pd
+
+from internal.utils.search_index import PrefixIndex, cells_containing, lowered_cells, tokenize
+
+
+class TestTokenize(unittest.TestCase):
+
+    def test_lowercases_and_splits(self):
+        self.assertEqual(tokenize("  Dada  Victoria "), ["dada", "victoria"])
+
+    def test_excel_numbers_are_cleaned(self):
+        """Matric numbers read as floats should match what the operator types."""
+        self.assertEqual(tokenize(25030103001.0), ["25030103001"])
+        self.assertEqual(tokenize("25030103001.0"), ["25030103001"])
+
+    def test_nan_and_none(self):
+        self.assertEqual(tokenize(float("nan")), [])
+        self.assertEqual(tokenize(None), [])
+
+
+class TestPrefixIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = PrefixIndex()
+        rows = [
+            ("Dada", "Victoria", "22020201016"),
+            ("JOSEPH", "FUNMILAYO", "25030103001"),
+            ("Ayorinde", "David", "25030103002"),
+        ]
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                self.index.add((r, c), value)
+
+    def test_prefix_lookup(self):
+        self.assertEqual(self.index.search("da"), {(0, 0), (2, 1)})
+        self.assertEqual(self.index.search("2503"), {(1, 2), (2, 2)})
+        self.assertEqual(self.index.search("250301030"), {(1, 2), (2, 2)})
+        self.assertEqual(self.index.search("zzz"), set())
+
+    def test_case_insensitive(self):
+        self.assertEqual(self.index.search("JoSe"), {(1, 0)})
+
+    def test_multi_word_same_row(self):
+        """Every word must match somewhere in the same row."""
+        found = self.index.search_all(["da", "vic"], group=lambda cell: cell[0])
+        self.assertEqual(found, {(0, 0)})
+
+    def test_update_after_edit(self):
+        self.index.update((0, 0), "Okafor")
+        self.assertEqual(self.index.search("dada"), set())
+        self.assertEqual(self.index.search("oka"), {(0, 0)})
+        self.assertTrue(self.index.key_matches((0, 0), "ok"))
+
+    def test_remove(self):
+        self.index.remove((1, 2))
+        self.assertEqual(self.index.search("2503"), {(2, 2)})
+
+
+class TestCellScan(unittest.TestCase):
+
+    def test_substrings_in_reading_order(self):
+        frame = pd.DataFrame([["Dada", "Victoria", "✓"], ["JOSEPH", None, "✗"], ["Ayorinde", "David", "✓"]])
+        lowered = lowered_cells(frame)
+        self.assertEqual(cells_containing(lowered, "DA"), [(0, 0), (2, 1)])
+        self.assertEqual(cells_containing(lowered, "or"), [(0, 1), (2, 0)])
+        self.assertEqual(cells_containing(lowered, "✓"), [(0, 2), (2, 2)])
+        self.assertEqual(cells_containing(lowered, "nan"), [])
+
+    def test_rows_and_empty(self):
+        self.assertEqual(cells_containing(lowered_cells([["a", "b"], ["ab"]]), "b"), [(0, 1), (1, 0)])
+        self.assertEqual(cells_containing(lowered_cells([]), "a"), [])
+        self.assertEqual(cells_containing(lowered_cells(pd.DataFrame(columns=["x"])), "a"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+from internal.records.records_func import get_attendance_frame, get_session_index, sessions_in_range
+from internal.utils.file_cache import file_cache, prefetch
+
+
+class TestSessionIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "100level.csv")
+        self.write_sessions([("01/01/26", "MORNING SERVICE"), ("01/01/2026", "BIBLE STUDY"), ("15/02/26", "PMCH")])
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write_sessions(self, sessions):
+        with open(self.path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows([
+                ["Surname", "Firstname", "Matric NO"],
+                ["DATE", "", ""] + [d for d, _ in sessions],
+                ["ACTIVITY", "", ""] + [a for _, a in sessions],
+                ["Doe", "John", "M001"] + ["✓"] * len(sessions),
+            ])
+
+    def test_both_date_formats_share_a_day(self):
+        index = get_session_index(self.path)
+        self.assertEqual(sorted(index), [date(2026, 1, 1), date(2026, 2, 15)])
+        self.assertEqual([s['activity'] for s in index[date(2026, 1, 1)]], ["MORNING SERVICE", "BIBLE STUDY"])
+        self.assertEqual(index[date(2026, 1, 1)][1]['col_index'], 4)
+
+    def test_index_is_cached_until_file_changes(self):
+        index = get_session_index(self.path)
+        self.assertIs(get_session_index(self.path), index)
+
+        self.write_sessions([("03/03/26", "MTU PRAYS"), ("04/03/26", "MANNA WATER")])
+        self.assertEqual(sorted(get_session_index(self.path)), [date(2026, 3, 3), date(2026, 3, 4)])
+
+    def test_prefetch_warms_the_cache(self):
+        file_cache.invalidate(self.path)
+        prefetch(self.path, (get_session_index, get_attendance_frame)).join(timeout=10)
+        self.assertIsNotNone(file_cache.peek(self.path, "session_index"))
+        frame = file_cache.peek(self.path, "attendance_frame")
+        self.assertIs(get_attendance_frame(self.path), frame)
+
+    def test_sessions_in_range(self):
+        index = get_session_index(self.path)
+        found = [(d, s['activity']) for d, s in sessions_in_range(index, date(2026, 1, 2), date(2026, 3, 1))]
+        self.assertEqual(found, [(date(2026, 2, 15), "PMCH")])
+
+
+if __name__ == '__main__':
+    unittest.main()
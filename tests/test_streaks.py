@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from internal.records.records_func import load_attendance_matrix
+from internal.streaks.streaks_func import (absence_runs, absence_streaks, chronological_sessions, miss_patterns,
+                                           save_streak_report, streak_report)
+from internal.utils.attendance_matrix import ABSENT, EXCUSED, PRESENT, UNKNOWN
+
+
+def reference_longest(row):
+    """Longest streak the slow way: walk the marks, skipping blanks and excused."""
+    best = run = 0
+    for code in row:
+        if code == ABSENT:
+            run += 1
+            best = max(best, run)
+        elif code not in (UNKNOWN, EXCUSED):
+            run = 0
+    return best
+
+
+class TestAbsenceRuns(unittest.TestCase):
+    def test_runs(self):
+        marks = np.array([[ABSENT, ABSENT, PRESENT, ABSENT, UNKNOWN, ABSENT, EXCUSED]], dtype=np.int8)
+        run, _ = absence_runs(marks)
+        self.assertEqual(run.tolist(), [[1, 2, 0, 1, 0, 2, 0]])
+
+    def test_matches_a_plain_loop(self):
+        rng = np.random.default_rng(0)
+        marks = rng.choice([UNKNOWN, PRESENT, ABSENT, EXCUSED], size=(200, 40), p=[0.1, 0.5, 0.35, 0.05]).astype(np.int8)
+        run, _ = absence_runs(marks)
+        self.assertEqual(run.max(axis=1).tolist(), [reference_longest(row) for row in marks])
+
+
+class TestStreakReport(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "level.csv")
+        # Columns are out of date order on purpose
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("Surname,Firstname,Matric NO\n"
+                    "\n"
+                    "DATE,,,01/03/26,08/03/26,04/03/26,11/03/26,15/03/26,18/03/2026\n"
+                    "ACTIVITY,,,SUNDAY SERVICE,SUNDAY SERVICE,BIBLE STUDY,BIBLE STUDY,SUNDAY SERVICE,BIBLE STUDY\n"
+                    "\n"
+                    "Doe,John,001,✗,✓,✗,✗,✗,✗\n"
+                    "Smith,Jane,002,✗,✗,✓,✓,✗,✓\n"
+                    "Late,Joiner,003,,✗,,E,✗,\n"
+                    "Good,Student,004,✓,✓,✓,✓,✓,✓\n")
+        self.matrix = load_attendance_matrix(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_sessions_in_date_order(self):
+        positions = chronological_sessions(self.matrix)
+        self.assertEqual([str(self.matrix.session_date_strs[j]) for j in positions],
+                         ["01/03/26", "04/03/26", "08/03/26", "11/03/26", "15/03/26", "18/03/2026"])
+
+    def test_longest_and_current(self):
+        streaks = absence_streaks(self.matrix, chronological_sessions(self.matrix))
+        self.assertEqual(streaks['longest'].tolist(), [3, 1, 2, 0])
+        self.assertEqual(streaks['current'].tolist(), [3, 0, 2, 0])
+
+    def test_report(self):
+        rows = streak_report(self.matrix, min_streak=2)
+        self.assertEqual([r['Matric NO'] for r in rows], ["001", "003"])
+        self.assertEqual((rows[0]['From'], rows[0]['To']), ("11/03/26 BIBLE STUDY", "18/03/2026 BIBLE STUDY"))
+        self.assertEqual(rows[1]['Always Misses'], "Sunday, SUNDAY SERVICE")
+        self.assertEqual(streak_report(self.matrix, min_streak=2, current_only=True, activity="bible study"),
+                         [dict(rows[0], **{'Longest Streak': 3, 'From': "04/03/26 BIBLE STUDY"})])
+
+    def test_miss_patterns(self):
+        labels, missed, marked = miss_patterns(self.matrix, chronological_sessions(self.matrix), by="weekday")
+        sunday = labels.index("Sunday")
+        self.assertEqual(missed[:, sunday].tolist(), [2, 3, 2, 0])
+        self.assertEqual(marked[:, sunday].tolist(), [3, 3, 2, 3])
+
+    def test_export(self):
+        save_path = os.path.join(self.test_dir, "streaks.xlsx")
+        self.assertTrue(save_streak_report(streak_report(self.matrix, date.min, date.max, min_streak=1), save_path))
+        self.assertEqual(len(pd.read_excel(save_path)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
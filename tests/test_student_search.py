@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from internal.search.search_func import StudentDirectory
+from internal.utils.csv_index import CSVLineIndex
+
+
+class TestStudentDirectory(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.test_dir, "100level.csv"), "w", encoding="utf-8-sig") as f:
+            f.write("Surname,Firstname,Matric NO\n"
+                    "Okeke,Michael,25030103001\n"
+                    "\n"
+                    "ADEBAYO,Ibukun,25030103002.0\n"
+                    "Adeniran,Jeremiah,G2520382\n")
+        with open(os.path.join(self.test_dir, "200level.csv"), "w", encoding="utf-8") as f:
+            f.write("Surname,Firstname,Matric NO\n"
+                    "Ade,Michael,24010101001\n"
+                    "\"Smith, Jr\",Adeola,24010101002\n")
+        self.directory = StudentDirectory(self.test_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def names(self, query, limit=8):
+        return [s['Surname'] for s in self.directory.search(query, limit)]
+
+    def test_not_ready_until_built(self):
+        self.assertFalse(self.directory.ready.is_set())
+        self.assertEqual(self.directory.search("ade"), [])
+        self.directory.build()
+        self.assertTrue(self.directory.ready.is_set())
+        self.assertEqual(len(self.directory), 5)
+
+    def test_prefixes_across_levels_sorted_by_name(self):
+        self.directory.build()
+        self.assertEqual(self.names("ade"), ["Ade", "ADEBAYO", "Adeniran", "Smith, Jr"])
+        self.assertEqual(self.names("ade", limit=2), ["Ade", "ADEBAYO"])
+        self.assertEqual(self.names("2503"), ["ADEBAYO", "Okeke"])
+        self.assertEqual(self.names("michael 24"), ["Ade"])
+        self.assertEqual(self.names("g25"), ["Adeniran"])
+        self.assertEqual(self.names("zz"), [])
+        self.assertEqual(self.names("  "), [])
+
+    def test_results_point_at_their_line(self):
+        self.directory.build()
+        student, = self.directory.search("25030103002")
+        self.assertEqual((student['Level'], student['Matric NO']), ("100level", "25030103002"))
+        fields = CSVLineIndex(student['file']).read_row(student['line'])
+        self.assertEqual(fields[0], "ADEBAYO")
+
+    def test_rebuilds_after_the_lists_change(self):
+        self.directory.build()
+        self.assertFalse(self.directory.is_stale())
+        with open(os.path.join(self.test_dir, "200level.csv"), "a", encoding="utf-8") as f:
+            f.write("Zubair,Musa,24010101003\n")
+        self.assertTrue(self.directory.is_stale())
+        self.assertEqual(self.names("zub"), [])
+        self.directory.refresh_in_background({}).join()
+        self.assertEqual(self.names("zub"), ["Zubair"])
+
+    def test_unchanged_lists_are_not_rebuilt(self):
+        self.assertIsNone(self.directory.refresh_in_background())
+        self.directory.build()
+        state = self.directory._state
+        self.directory.build()
+        self.assertIs(self.directory._state, state)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from internal.utils import tracing
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.was_enabled = tracing.is_enabled()
+        tracing.clear()
+
+    def tearDown(self):
+        if not self.was_enabled:
+            tracing.disable()
+        tracing.clear()
+        shutil.rmtree(self.test_dir)
+
+    def test_disabled_records_nothing(self):
+        tracing.disable()
+        with tracing.span("parse", file="a.csv", bytes=lambda: self.fail("size looked up while tracing is off")) as s:
+            s.set(rows=10)
+        self.assertEqual(tracing.events(), [])
+
+    def test_nested_spans_with_details(self):
+        tracing.enable()
+
+        @tracing.traced()
+        def mark_students():
+            return "done"
+
+        with tracing.span("update_attendance_sheet", file="100level.csv") as s:
+            self.assertEqual(mark_students(), "done")
+            s.set(rows=42)
+
+        inner, outer = tracing.events()
+        self.assertEqual((outer["name"], inner["name"]), ("update_attendance_sheet", "mark_students"))
+        self.assertEqual(outer["args"], {"file": "100level.csv", "rows": 42})
+        self.assertLessEqual(outer["ts"], inner["ts"])
+        self.assertGreaterEqual(outer["ts"] + outer["dur"], inner["ts"] + inner["dur"])
+
+    def test_failed_span_keeps_the_error(self):
+        tracing.enable()
+        with self.assertRaises(ValueError):
+            with tracing.span("sort_file"):
+                raise ValueError("bad date")
+        self.assertEqual(tracing.events()[0]["args"]["error"], "ValueError: bad date")
+
+    def test_dump_writes_chrome_trace(self):
+        tracing.enable()
+        with tracing.span("read_csv_robust", bytes=lambda: tracing.file_size(__file__)):
+            pass
+        path = tracing.dump(os.path.join(self.test_dir, "trace.json"))
+
+        with open(path, encoding="utf-8") as f:
+            trace = json.load(f)
+        spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        self.assertEqual([e["name"] for e in spans], ["read_csv_robust"])
+        self.assertEqual(spans[0]["args"]["bytes"], os.path.getsize(__file__))
+        self.assertTrue(any(e["ph"] == "M" for e in trace["traceEvents"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
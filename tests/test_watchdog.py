@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from internal.utils.watchdog import StallWatchdog
+
+
+class FakeApp:
+    """Just enough of Tk's after() to drive the heartbeat from the test's (main) thread."""
+    def __init__(self):
+        self.jobs = []
+
+    def after(self, ms, func):
+        job = (time.perf_counter() + ms / 1000, func)
+        self.jobs.append(job)
+        return job
+
+    def after_cancel(self, job):
+        if job in self.jobs:
+            self.jobs.remove(job)
+
+    def focus_get(self):
+        return None
+
+    def title(self):
+        return "Main Menu"
+
+    def run_for(self, seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            now = time.perf_counter()
+            for job in [j for j in self.jobs if j[0] <= now]:
+                self.jobs.remove(job)
+                job[1]()
+            time.sleep(0.005)
+
+
+def slow_handler():
+    time.sleep(0.4)
+
+
+class TestStallWatchdog(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.log_path = Path(self.test_dir) / "ui_stalls.log"
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_stall_is_logged_with_operation(self):
+        app = FakeApp()
+        watchdog = StallWatchdog(app, threshold_ms=150, interval_ms=20, log_path=self.log_path)
+        watchdog.start()
+        try:
+            app.run_for(0.1)
+            slow_handler()
+            app.run_for(0.2)
+        finally:
+            watchdog.stop()
+
+        log = self.log_path.read_text(encoding="utf-8")
+        self.assertIn("window: Main Menu", log)
+        self.assertIn("operation: slow_handler", log)
+        self.assertEqual(log.count("=== "), 1)
+
+    def test_no_log_without_stalls(self):
+        app = FakeApp()
+        watchdog = StallWatchdog(app, threshold_ms=150, interval_ms=20, log_path=self.log_path)
+        watchdog.start()
+        try:
+            app.run_for(0.3)
+        finally:
+            watchdog.stop()
+        self.assertFalse(os.path.exists(self.log_path))
+
+
+if __name__ == '__main__':
+    unittest.main()